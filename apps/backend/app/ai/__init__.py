@@ -1,2 +1,2 @@
 # backend/app/ai/__init__.py
-from . import classifier, duplicate_detector, cleanup
\ No newline at end of file
+# Submodules are imported where used, so importing the package stays cheap
@@ -1,8 +1,8 @@
-import os
-from openai import OpenAI
+from app.ai.clients import get_openai_client
+from app.utils.profiling import profile_span
+from app.utils.log import get_logger
 
-# Load API key
-OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
+log = get_logger(__name__)
 
 MODEL_NAME = "gpt-4o-mini"
 
@@ -24,25 +24,24 @@ IMPORTANT:
 
 async def classify_question_domain(question: str) -> str:
     try:
-        client = OpenAI(api_key=OPENAI_API_KEY)
-
         prompt = f"""
 {CLASSIFICATION_SYSTEM_PROMPT}
 
 Farmer Question: "{question}"
 """
 
-        response = client.chat.completions.create(
-            model=MODEL_NAME,
-            messages=[{"role": "user", "content": prompt}]
-        )
+        with profile_span("openai"):
+            response = await get_openai_client().chat.completions.create(
+                model=MODEL_NAME,
+                messages=[{"role": "user", "content": prompt}]
+            )
 
         domain = response.choices[0].message.content.strip().lower()
-        print("question with domain : ",question, domain)
+        log.debug("Question classified", domain=domain, question_chars=len(question))
 
         allowed_domains = ["crop", "soil", "pest", "fertilizer", "irrigation", "weather", "other"]
         if domain not in allowed_domains:
-            print(f"Invalid domain '{domain}' received from OpenAI, falling back to 'other'")
+            log.warning("Invalid domain from OpenAI, falling back to 'other'", domain=domain)
             domain = "other"
 
         return domain
@@ -50,8 +49,8 @@ Farmer Question: "{question}"
     except Exception as e:
         error_message = str(e).lower()
         if "rate" in error_message or "limit" in error_message:
-            print(f"OpenAI API rate limit exceeded for question classification. Falling back to 'other' domain. Question: '{question}'")
+            log.warning("OpenAI rate limit hit during classification, falling back to 'other'", rate_limit=1)
             return "other"
         else:
-            print("OpenAI classification error:", e)
+            log.error("OpenAI classification failed", error=str(e))
             return "other"
@@ -1,8 +1,9 @@
 # backend/app/ai/cleanup.py
-import os
-from openai import AsyncOpenAI
+from app.ai.clients import get_openai_client
+from app.utils.profiling import profile_span
+from app.utils.log import get_logger
 
-client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY", ""))
+log = get_logger(__name__)
 
 async def clean_question_text(text: str) -> str:
     """
@@ -18,12 +19,13 @@ async def clean_question_text(text: str) -> str:
             "Improved question:"
         )
 
-        response = await client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=200,
-            temperature=0.3
-        )
+        with profile_span("openai"):
+            response = await get_openai_client().chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=200,
+                temperature=0.3
+            )
 
         cleaned_text = response.choices[0].message.content.strip()
         # If response empty or failed, fall back to basic cleanup
@@ -32,7 +34,7 @@ async def clean_question_text(text: str) -> str:
         return cleaned_text
 
     except Exception as e:
-        print(f"Error using LLM for question cleanup: {e}")
+        log.warning("LLM question cleanup failed, using basic cleanup", error=str(e))
         # Fall back to basic cleanup if LLM fails
         return _basic_cleanup(text)
 
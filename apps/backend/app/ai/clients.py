@@ -0,0 +1,56 @@
+# app/ai/clients.py
+"""
+Shared OpenAI client.
+
+The SDK import and client construction happen on first use of get_openai_client(), not
+at import, so starting the app does not pay for them. The app lifespan warms the client in
+the background once the server is up (warm_ai_clients) and closes it on shutdown.
+Everything calling OpenAI shares the one AsyncOpenAI client and its connection pool.
+"""
+
+import asyncio
+import os
+import threading
+from typing import Any, Optional
+
+from app.utils.log import get_logger
+
+log = get_logger(__name__)
+
+_client: Optional[Any] = None
+_lock = threading.Lock()
+
+
+def get_openai_client():
+    """
+    The shared AsyncOpenAI client, created on first call.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                from openai import AsyncOpenAI
+                _client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY", ""))
+    return _client
+
+
+def ai_clients_ready() -> bool:
+    return _client is not None
+
+
+async def warm_ai_clients() -> None:
+    """
+    Import the SDK and create the client in a worker thread, off the event loop.
+    Failures are logged; the client is then created on first use instead.
+    """
+    try:
+        await asyncio.to_thread(get_openai_client)
+    except Exception as e:
+        log.error("OpenAI client warm-up failed", error=str(e))
+
+
+async def close_ai_clients() -> None:
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.close()
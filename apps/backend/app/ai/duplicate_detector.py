@@ -1,46 +1,35 @@
 # app/ai/duplicate_detector.py
-from app.utils.db import questions_collection
-from app.utils.vector import cosine_similarity
-from bson import ObjectId
+from app.services.embedding_service import load_domain_embeddings
+from app.utils.vector import cosine_similarities
+from app.utils.log import get_logger
 from typing import Optional, List
 
+log = get_logger(__name__)
+
 
 async def find_semantic_duplicate(question_id: str, domain: str, embedding: Optional[List[float]] = None, threshold: float = 0.70):
     """
     Find semantic duplicates by comparing embeddings within the same domain.
-    Falls back to text matching if no embedding or domain.
+    Candidates come from the question_embeddings collection only.
     Returns the ObjectId string of a duplicate question if found, None otherwise.
     """
     try:
 
         # Use local vector search if embedding and domain are available
         if embedding and len(embedding) > 0 and domain:
-            # Find all questions with the same domain, excluding current, not marked as duplicate, with embeddings
-            query = {
-                "domain": domain,
-                "_id": {"$ne": ObjectId(question_id)},
-                "status": {"$nin": ["duplicate", None]},
-                "embedding": {"$exists": True, "$ne": None}
-            }
-
-            cursor = questions_collection.find(query, {"_id": 1, "embedding": 1})
-            candidates = await cursor.to_list(length=None)
+            # All non-duplicate questions in the same domain, excluding current
+            candidate_ids, matrix = await load_domain_embeddings(domain, exclude_id=question_id)
+            if not candidate_ids:
+                return None
 
             # Calculate similarities and find the best match
-            best_match = None
-            best_similarity = 0.0
-
-            for candidate in candidates:
-                sim = cosine_similarity(embedding, candidate["embedding"])
-                if sim > best_similarity and sim >= threshold:
-                    best_similarity = sim
-                    best_match = candidate
-
-            if best_match:
-                return str(best_match["_id"])
+            sims = cosine_similarities(embedding, matrix)
+            best = int(sims.argmax())
+            if sims[best] >= threshold:
+                return str(candidate_ids[best])
 
     except Exception as e:
-        print(f"Error in duplicate detection: {e}")
+        log.error("Duplicate detection failed", question_id=question_id, error=str(e))
         # Continue with fallback
 
     return None
@@ -18,11 +18,54 @@ class Settings:
     MONGODB_URL: str = os.getenv("MONGODB_URL", "")
     DATABASE_NAME: str = os.getenv("DATABASE_NAME", "agri_vote")
 
+    # MongoDB client pool and timeouts
+    MONGO_MAX_POOL_SIZE: int = int(os.getenv("MONGO_MAX_POOL_SIZE", "100"))
+    MONGO_MIN_POOL_SIZE: int = int(os.getenv("MONGO_MIN_POOL_SIZE", "5"))
+    MONGO_MAX_IDLE_TIME_MS: int = int(os.getenv("MONGO_MAX_IDLE_TIME_MS", "300000"))
+    MONGO_CONNECT_TIMEOUT_MS: int = int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "5000"))
+    MONGO_SERVER_SELECTION_TIMEOUT_MS: int = int(os.getenv("MONGO_SERVER_SELECTION_TIMEOUT_MS", "5000"))
+    # 0 leaves socketTimeoutMS unset: a socket timeout would also cut off the long
+    # background aggregations (vote ledger rebuild, orphan sweep)
+    MONGO_SOCKET_TIMEOUT_MS: int = int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "0"))
+    MONGO_WAIT_QUEUE_TIMEOUT_MS: int = int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "2000"))
+    # Comma-separated wire compressors; zstd and snappy need their optional packages
+    MONGO_COMPRESSORS: str = os.getenv("MONGO_COMPRESSORS", "zlib")
+    # Read preferences for the named read routes in app/utils/db.py
+    MONGO_READ_ANALYTICS: str = os.getenv("MONGO_READ_ANALYTICS", "secondaryPreferred")
+    MONGO_READ_LISTING: str = os.getenv("MONGO_READ_LISTING", "secondaryPreferred")
+
     # Security Configuration
     SECRET_KEY: str = os.getenv("SECRET_KEY", "supersecretkey")
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = int(os.getenv("ACCESS_TOKEN_EXPIRE_MINUTES", "1440"))
 
+    # Verified token and user lookups are cached per worker for at most this long
+    AUTH_CACHE_TTL_SECONDS: int = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+    AUTH_CACHE_SIZE: int = int(os.getenv("AUTH_CACHE_SIZE", "10000"))
+
+    # Password hashing: bcrypt cost, hashing threads and the most hashes queued before rejecting
+    BCRYPT_ROUNDS: int = int(os.getenv("BCRYPT_ROUNDS", "12"))
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", str(min(4, os.cpu_count() or 1))))
+    PASSWORD_HASH_MAX_PENDING: int = int(os.getenv("PASSWORD_HASH_MAX_PENDING", "64"))
+
+    # Delta sync: overlap between consecutive syncs, and how long removals are remembered
+    SYNC_OVERLAP_SECONDS: int = int(os.getenv("SYNC_OVERLAP_SECONDS", "5"))
+    SYNC_TOMBSTONE_TTL_DAYS: int = int(os.getenv("SYNC_TOMBSTONE_TTL_DAYS", "30"))
+
+    # Responses of at least this many bytes are gzip/brotli compressed when the client accepts it (0 disables)
+    COMPRESSION_MIN_SIZE: int = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+    COMPRESSION_GZIP_LEVEL: int = int(os.getenv("COMPRESSION_GZIP_LEVEL", "6"))
+    COMPRESSION_BROTLI_QUALITY: int = int(os.getenv("COMPRESSION_BROTLI_QUALITY", "5"))
+
+    # Request profiling: share of requests profiled, stack sampling interval, and the
+    # X-Profile header value that profiles a request on demand (empty disables the header)
+    PROFILE_SAMPLE_RATE: float = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+    PROFILE_INTERVAL_MS: int = int(os.getenv("PROFILE_INTERVAL_MS", "5"))
+    PROFILE_ADMIN_TOKEN: str = os.getenv("PROFILE_ADMIN_TOKEN", "")
+    # Requests at least this slow are logged to slow_requests, or to SLOW_REQUEST_LOG_FILE if set (0 disables)
+    SLOW_REQUEST_MS: int = int(os.getenv("SLOW_REQUEST_MS", "1000"))
+    SLOW_REQUEST_LOG_FILE: str = os.getenv("SLOW_REQUEST_LOG_FILE", "")
+
     # CORS Configuration
     CORS_ORIGINS = [origin.strip() for origin in os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")]
 
@@ -34,7 +77,28 @@ class Settings:
     API_HOST: str = os.getenv("API_HOST", "0.0.0.0")
     API_PORT: int = int(os.getenv("API_PORT", "8000"))
 
+    # Realtime push ("memory" for single worker, "mongo" for cross-worker fan-out)
+    REALTIME_TRANSPORT: str = os.getenv("REALTIME_TRANSPORT", "memory")
+    REALTIME_QUEUE_SIZE: int = int(os.getenv("REALTIME_QUEUE_SIZE", "100"))
+
+    # Moderator dashboard: response cache lifetime and rollup repair period (0 disables repair)
+    ANALYTICS_CACHE_TTL_SECONDS: int = int(os.getenv("ANALYTICS_CACHE_TTL_SECONDS", "30"))
+    ROLLUP_REPAIR_INTERVAL_SECONDS: int = int(os.getenv("ROLLUP_REPAIR_INTERVAL_SECONDS", "3600"))
+
+    # Cascade deletes and orphan sweeps: batch size, pause between batches, sweep period (0 disables)
+    GC_BATCH_SIZE: int = int(os.getenv("GC_BATCH_SIZE", "500"))
+    GC_BATCH_PAUSE_MS: int = int(os.getenv("GC_BATCH_PAUSE_MS", "50"))
+    GC_SWEEP_INTERVAL_SECONDS: int = int(os.getenv("GC_SWEEP_INTERVAL_SECONDS", "86400"))
+
+    # Archival of old completed/duplicate questions (0 interval disables the job)
+    ARCHIVE_AFTER_DAYS: int = int(os.getenv("ARCHIVE_AFTER_DAYS", "90"))
+    ARCHIVE_BATCH_SIZE: int = int(os.getenv("ARCHIVE_BATCH_SIZE", "100"))
+    ARCHIVE_INTERVAL_SECONDS: int = int(os.getenv("ARCHIVE_INTERVAL_SECONDS", "86400"))
+
     # Logging (optional)
     LOG_LEVEL: str = os.getenv("LOG_LEVEL", "DEBUG" if DEBUG else "INFO")
+    # "json" lines or human-readable "text"; records beyond LOG_QUEUE_SIZE waiting to be written are dropped
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "text" if DEBUG else "json")
+    LOG_QUEUE_SIZE: int = int(os.getenv("LOG_QUEUE_SIZE", "10000"))
 
 settings = Settings()
@@ -4,6 +4,7 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 from bson import ObjectId
+from app.utils.serialization import ObjectIdString
 
 
 # ---------------------------------------------------
@@ -80,9 +81,9 @@ class AnswerInDB(AnswerBase):
 # Answer Out Model (API Response)
 # ---------------------------------------------------
 class AnswerOut(AnswerBase):
-    id: str
-    question_id: str
-    expert_id: str
+    id: ObjectIdString
+    question_id: ObjectIdString
+    expert_id: ObjectIdString
     created_at: datetime
 
     class Config:
@@ -91,6 +92,23 @@ class AnswerOut(AnswerBase):
         }
 
 
+# ---------------------------------------------------
+# Lean Answer Shape (answer lists for review)
+# ---------------------------------------------------
+class AnswerSummaryOut(BaseModel):
+    id: ObjectIdString
+    question_id: ObjectIdString
+    expert_id: ObjectIdString
+    answer_text: str
+    images: Optional[List[str]] = None
+    status: Optional[str] = None
+    ai_draft: Optional[str] = None
+    upvotes: int = 0
+    downvotes: int = 0
+    peer_votes: int = 0
+    created_at: Optional[datetime] = None
+
+
 # ---------------------------------------------------
 # Answer Update Model
 # ---------------------------------------------------
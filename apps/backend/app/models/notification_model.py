@@ -1,7 +1,7 @@
 # models/notification_model.py
 
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 from bson import ObjectId
 
@@ -72,3 +72,10 @@ class NotificationDB(NotificationBase):
 # ---------------------------------------------------
 class NotificationResponse(NotificationDB):
     pass
+
+
+# ---------------------------------------------------
+# Mark-as-read Request (omit ids to mark everything read)
+# ---------------------------------------------------
+class NotificationMarkRead(BaseModel):
+    notification_ids: Optional[List[str]] = None
@@ -4,6 +4,7 @@ from pydantic import BaseModel, Field
 from typing import Optional
 from datetime import datetime
 from bson import ObjectId
+from app.utils.serialization import ObjectIdString
 
 
 # ---------------------------------------------------
@@ -29,9 +30,11 @@ class PeerReview(BaseModel):
     id: Optional[PyObjectId] = Field(default=None, alias="_id")
     answer_id: PyObjectId = Field(..., description="Reference to the answer being reviewed")
     reviewer_expert_id: PyObjectId = Field(..., description="Reference to the expert writing review")
+    question_id: Optional[PyObjectId] = Field(None, description="Reference to the question of the reviewed answer")
     best_answer_vote: bool = Field(..., description="Whether this review votes for this answer as best")
     comment_text: str = Field(..., description="Review comment text")
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: Optional[datetime] = None
 
     class Config:
         allow_population_by_field_name = True
@@ -55,9 +58,9 @@ class PeerReviewCreate(BaseModel):
 # Peer Review Out Model (API Response)
 # ---------------------------------------------------
 class PeerReviewOut(BaseModel):
-    id: str
-    answer_id: str
-    reviewer_expert_id: str
+    id: ObjectIdString
+    answer_id: ObjectIdString
+    reviewer_expert_id: ObjectIdString
     best_answer_vote: bool
     comment_text: str
     created_at: datetime
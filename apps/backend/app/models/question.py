@@ -3,6 +3,7 @@ from pydantic import BaseModel, Field, validator, ConfigDict
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 from enum import Enum
+from app.utils.serialization import ObjectIdString
 
 
 # ---------------------------------------------------
@@ -62,7 +63,6 @@ class QuestionInDB(BaseModel):
     id: Optional[str] = Field(None, alias="_id")
     raw_text: str
     cleaned_text: Optional[str] = None
-    embedding: Optional[List[float]] = None
     domain: Optional[str] = None
     status: QuestionStatus = QuestionStatus.NEW
     assigned_experts: List[str] = Field(default_factory=list)
@@ -84,14 +84,14 @@ class QuestionInDB(BaseModel):
 # Question Output Model (API Response)
 # ---------------------------------------------------
 class QuestionOut(BaseModel):
-    id: str
+    id: ObjectIdString
     raw_text: str
     cleaned_text: Optional[str]
     domain: Optional[str]
     status: QuestionStatus
-    assigned_experts: List[str]
-    is_duplicate_of: Optional[str]
-    created_by: str
+    assigned_experts: List[ObjectIdString]
+    is_duplicate_of: Optional[ObjectIdString]
+    created_by: ObjectIdString
     created_at: datetime
     ai_metadata: AIMetadata
     ai_pipeline: AIPipelineStatus
@@ -102,6 +102,41 @@ class QuestionOut(BaseModel):
         }
 
 
+# ---------------------------------------------------
+# Lean Response Shapes (no embedding / AI metadata)
+# ---------------------------------------------------
+class AssignedQuestionOut(BaseModel):
+    """Question card on the expert dashboard."""
+    id: ObjectIdString
+    user_id: Optional[ObjectIdString] = None
+    original_text: Optional[str] = None
+    cleaned_text: Optional[str] = None
+    domain: Optional[str] = None
+    status: Optional[str] = None
+    assigned_experts: List[ObjectIdString] = Field(default_factory=list)
+    duplicate_of: Optional[ObjectIdString] = None
+    is_duplicate_of: Optional[ObjectIdString] = None
+    moderator_requested: Optional[bool] = None
+    created_at: Optional[datetime] = None
+
+
+class ReviewQuestionOut(BaseModel):
+    """Row in the moderator review list."""
+    id: ObjectIdString
+    raw_text: Optional[str] = None
+    domain: Optional[str] = None
+    status: Optional[str] = None
+    created_by: Optional[ObjectIdString] = None
+    created_at: Optional[datetime] = None
+    ai_metadata: Dict[str, Any] = Field(default_factory=dict)
+
+
+# Fields that are never sent to clients (embedding only on documents not yet migrated
+# to question_embeddings)
+QUESTION_HEAVY_FIELDS = ("embedding",)
+QUESTION_DETAIL_PROJECTION = {field: 0 for field in QUESTION_HEAVY_FIELDS}
+
+
 # ---------------------------------------------------
 # Question Update Models
 # ---------------------------------------------------
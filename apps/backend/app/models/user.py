@@ -20,4 +20,7 @@ class UserInDB(UserBase):
     hashed_password: str
 
 class UserOut(UserBase):
-    id: str
\ No newline at end of file
+    id: str
+
+# Fields never returned from user lookups
+USER_PRIVATE_PROJECTION = {"hashed_password": 0, "specialisation_embedding": 0}
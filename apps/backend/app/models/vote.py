@@ -32,6 +32,7 @@ class Vote(BaseModel):
     vote_type: str = Field(..., description="Type: 'upvote' or 'downvote'")
     question_id: Optional[PyObjectId] = Field(None, description="Reference to the question for quick lookup")
     created_at: datetime = Field(default_factory=datetime.utcnow)
+    updated_at: Optional[datetime] = Field(None, description="When the vote type last changed")
 
     class Config:
         allow_population_by_field_name = True
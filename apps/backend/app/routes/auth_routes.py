@@ -1,28 +1,30 @@
 # app/routes/auth_routes.py
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, BackgroundTasks, HTTPException, status, Depends
 from app.models.user import UserCreate, UserOut
 from app.utils.db import users_collection
-import bcrypt
+from app.utils.password import hash_password_async, verify_password_async, needs_rehash, PasswordHasherBusy
 from app.utils.jwt import create_access_token
 from bson import ObjectId
 from app.utils.response import success
+from app.utils.log import get_logger
 
 router = APIRouter(prefix="/api/auth", tags=["auth"])
 
 def user_doc_to_out(user_doc: dict) -> UserOut:
     return UserOut(id=str(user_doc["_id"]), name=user_doc["name"], email=user_doc["email"], role=user_doc["role"])
 
-@router.post("/signup", response_model=dict)
+@router.post("/signup")
 async def signup(user: UserCreate):
     # check existing
     existing = await users_collection.find_one({"email": user.email})
     if existing:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Email already registered")
 
-    # Hash password using direct bcrypt (same as our Python script)
-    password_bytes = user.password.encode('utf-8')
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password_bytes, salt).decode('utf-8')
+    # Hash password with bcrypt off the event loop (same format as our Python script)
+    try:
+        hashed = await hash_password_async(user.password)
+    except PasswordHasherBusy:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Server busy, please retry", headers={"Retry-After": "1"})
 
     doc = {
         "name": user.name,
@@ -38,21 +40,40 @@ async def signup(user: UserCreate):
 
 from fastapi.security import OAuth2PasswordRequestForm
 
-@router.post("/login", response_model=dict)
-async def login(form_data: OAuth2PasswordRequestForm = Depends()):
+log = get_logger(__name__)
+
+async def rehash_password(user_id, password: str):
+    """
+    Re-hash a password at the current BCRYPT_ROUNDS after a successful login.
+    """
+    try:
+        hashed = await hash_password_async(password)
+        await users_collection.update_one({"_id": user_id}, {"$set": {"hashed_password": hashed}})
+    except Exception as e:
+        log.error("Password rehash failed", user_id=str(user_id), error=str(e))
+
+@router.post("/login")
+async def login(background_tasks: BackgroundTasks, form_data: OAuth2PasswordRequestForm = Depends()):
     # OAuth2PasswordRequestForm expects "username" + "password" form fields.
     email = form_data.username
     password = form_data.password
-    user = await users_collection.find_one({"email": email})
+    user = await users_collection.find_one({"email": email}, {"hashed_password": 1, "role": 1})
     if not user:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
 
-    # Verify password using direct bcrypt
-    password_bytes = password.encode('utf-8')
-    hashed_bytes = user.get("hashed_password", "").encode('utf-8')
-    if not bcrypt.checkpw(password_bytes, hashed_bytes):
+    # Verify password with bcrypt off the event loop
+    hashed = user.get("hashed_password", "")
+    try:
+        valid = await verify_password_async(password, hashed)
+    except PasswordHasherBusy:
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Server busy, please retry", headers={"Retry-After": "1"})
+    if not valid:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid email or password")
 
+    # Upgrade hashes made with a different cost, after responding
+    if needs_rehash(hashed):
+        background_tasks.add_task(rehash_password, user["_id"], password)
+
     token_payload = {"user_id": str(user["_id"]), "role": user["role"]}
     token = create_access_token(token_payload)
     return success({"access_token": token, "token_type": "bearer"}, message="Login successful")
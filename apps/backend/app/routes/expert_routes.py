@@ -1,33 +1,43 @@
-from fastapi import APIRouter, HTTPException, Depends, Header
+from fastapi import APIRouter, BackgroundTasks, HTTPException, Depends, Header, Query, Request
+from fastapi.responses import StreamingResponse
 from typing import Optional, List, Dict
 from app.services.expert_service import (
     get_expert_by_email, get_assigned_questions, submit_answer,
     get_answers_for_question, vote_on_answer, modify_answer, request_moderator,
-    get_notifications, get_ai_suggestions
+    get_ai_suggestions, get_expert_dashboard, ASSIGNED_QUESTION_SOURCES, ANSWER_SUMMARY_SOURCES, PEER_REVIEW_SOURCES
 )
+from app.services.notification_service import get_notifications, get_unread_count, mark_read, replay_notifications
+from app.services.sync_service import get_expert_sync
 from app.utils.response import success
-from app.utils.jwt import decode_token
+from app.utils.negotiation import NegotiatedRoute
+from app.utils.jwt import bearer_token, get_principal
 from app.models.answer import AnswerCreate
 from app.models.peer_review import PeerReviewCreate
-from app.utils.db import questions_collection, peer_reviews_collection
+from app.models.notification_model import NotificationMarkRead
+from app.utils.db import questions_collection, answers_collection, peer_reviews_collection
+from app.utils.etag import version_etag, etag_matches, not_modified, with_etag
+from app.utils.projection import parse_fields
+from app.utils.log import get_logger
+from app.services.realtime_service import sse_stream, question_channel, user_channel
 from bson import ObjectId
 
-router = APIRouter(prefix="/api/expert", tags=["expert"])
+log = get_logger(__name__)
+
+router = APIRouter(prefix="/api/expert", tags=["expert"], route_class=NegotiatedRoute)
 
 async def get_current_expert(authorization: str = Header(...)):
     """
     Dependency to get current expert from JWT.
     """
-    parts = authorization.split()
-    if len(parts) != 2 or parts[0].lower() != "bearer":
+    token = bearer_token(authorization)
+    if not token:
         raise HTTPException(status_code=401, detail="Invalid authorization header")
 
-    token = parts[1]
-    payload = await decode_token(token)
-    if not payload or payload.get("role") != "expert":
+    principal = await get_principal(token)
+    if not principal or principal["role"] != "expert":
         raise HTTPException(status_code=401, detail="Invalid token or not an expert")
 
-    return payload["user_id"]
+    return principal["user_id"]
 
 @router.get("/by-email/{email}")
 async def get_expert_by_email_route(email: str):
@@ -41,12 +51,55 @@ async def get_expert_by_email_route(email: str):
     return success({"expert": expert})
 
 @router.get("/assigned-questions")
-async def get_assigned_questions_route(expert_id: str = Depends(get_current_expert)):
+async def get_assigned_questions_route(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    fields: Optional[str] = None,
+    expert_id: str = Depends(get_current_expert)
+):
+    """
+    Get the questions assigned to the current expert, newest first: all of them, or a page
+    with limit, and the returned next_cursor fetches the following page; include_total adds an
+    approximate total and fields=cleaned_text,status,... trims each card to those fields.
+    """
+    try:
+        selected = parse_fields(fields, ASSIGNED_QUESTION_SOURCES)
+        page = await get_assigned_questions(expert_id, limit, cursor, include_total, selected)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return success(page)
+
+@router.get("/dashboard")
+async def get_dashboard_route(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    expert_id: str = Depends(get_current_expert)
+):
+    """
+    Everything the expert dashboard renders for a page of assigned questions in one call:
+    the question cards with answer counts, the expert's own answer, review counts and best
+    answer vote status. Pass limit for a page and next_cursor for the page after it.
+    """
+    try:
+        page = await get_expert_dashboard(expert_id, limit, cursor, include_total)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return success(page)
+
+@router.get("/sync")
+async def sync_route(since: Optional[str] = None, expert_id: str = Depends(get_current_expert)):
     """
-    Get all questions assigned to the current expert.
+    Delta sync of the expert workspace: assigned questions, their answers and reviews, and
+    notifications changed since the token, plus tombstones for removed questions.
+    Omit since (or send an expired token) for a full snapshot, flagged with full=true.
+    Pass the returned next_token on the following call.
     """
-    questions = await get_assigned_questions(expert_id)
-    return success({"questions": questions})
+    try:
+        return success(await get_expert_sync(expert_id, since))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.post("/answer/submit/{question_id}")
 async def submit_answer_route(
@@ -58,40 +111,56 @@ async def submit_answer_route(
     Submit an answer for a specific question.
     """
     try:
-        # Debug logging
-        print(f"Attempting to submit answer for question {question_id} by expert {expert_id}")
-        print(f"Answer data: {answer_data.dict()}")
+        log.debug(
+            "Submitting answer", question_id=question_id, expert_id=expert_id,
+            answer_chars=len(answer_data.answer_text)
+        )
 
         result = await submit_answer(expert_id, question_id, answer_data)
         if not result:
-            print(f"Failed to submit answer - checking assignment...")
             # Check if expert is assigned
             from app.utils.db import questions_collection
             from bson import ObjectId
-            q = await questions_collection.find_one({"_id": ObjectId(question_id), "assigned_experts": expert_id})
+            q = await questions_collection.find_one({"_id": ObjectId(question_id), "assigned_experts": expert_id}, {"_id": 1})
             if not q:
-                print(f"Expert {expert_id} not assigned to question {question_id}")
                 raise HTTPException(status_code=400, detail="Expert not assigned to this question")
             else:
-                print(f"Expert is assigned but submission still failed")
+                log.warning("Answer submission failed for an assigned expert", question_id=question_id, expert_id=expert_id)
                 raise HTTPException(status_code=400, detail="Failed to submit answer - database error")
 
-        print(f"Answer submitted successfully with ID: {result.get('id')}")
         return success(result, message="Answer submitted successfully")
     except Exception as e:
-        print(f"Error in submit_answer_route: {e}")
+        log.warning("Answer submission rejected", question_id=question_id, expert_id=expert_id, error=str(e))
         raise HTTPException(status_code=400, detail=f"Failed to submit answer: {str(e)}")
 
 @router.get("/question/{question_id}/answers")
 async def get_answers_for_question_route(
     question_id: str,
+    include_draft: bool = True,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     expert_id: str = Depends(get_current_expert)
 ):
     """
-    Get all answers for a specific question (for review by assigned experts).
+    Get the answers for a specific question (for review by assigned experts), oldest first.
+    Pass include_draft=false to skip the AI drafts, fields=answer_text,upvotes,... to receive only
+    those fields, and limit and next_cursor to page through them.
+    Honours If-None-Match with a 304 while no answer of the question has changed.
     """
-    answers = await get_answers_for_question(question_id)
-    return success({"answers": answers})
+    try:
+        selected = parse_fields(fields, ANSWER_SUMMARY_SOURCES)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    etag = await version_etag(questions_collection, question_id, "answers_version", include_draft, limit, cursor, selected)
+    if etag and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    try:
+        page = await get_answers_for_question(question_id, include_draft, limit, cursor, selected)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return with_etag(success(page), etag)
 
 @router.post("/answer/{answer_id}/vote")
 async def vote_on_answer_route(
@@ -141,12 +210,61 @@ async def request_moderator_route(
     return success({}, message="Moderator requested successfully")
 
 @router.get("/notifications")
-async def get_notifications_route(expert_id: str = Depends(get_current_expert)):
+async def get_notifications_route(
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    expert_id: str = Depends(get_current_expert)
+):
+    """
+    Get a page of notifications for the current expert, newest first.
+    Pass the returned next_cursor to fetch the following page.
+    """
+    try:
+        page = await get_notifications(expert_id, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return success(page)
+
+@router.get("/notifications/stream")
+async def notifications_stream_route(
+    request: Request,
+    since: Optional[str] = None,
+    last_event_id: Optional[str] = Header(None),
+    expert_id: str = Depends(get_current_expert)
+):
     """
-    Get notifications for the current expert.
+    Server-Sent Events stream of new notifications for the current expert.
+    On reconnect, notifications after the Last-Event-ID header (or ?since=) are replayed first.
     """
-    notifications = await get_notifications(expert_id)
-    return success({"notifications": notifications})
+    resume_from = last_event_id or since
+
+    async def replay():
+        return await replay_notifications(expert_id, resume_from)
+
+    return StreamingResponse(
+        sse_stream(user_channel(expert_id), request, replay=replay),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/notifications/unread-count")
+async def get_unread_count_route(expert_id: str = Depends(get_current_expert)):
+    """
+    Get the unread notification count for the badge.
+    """
+    unread = await get_unread_count(expert_id)
+    return success({"unread": unread})
+
+@router.post("/notifications/mark-read")
+async def mark_notifications_read_route(
+    body: NotificationMarkRead,
+    expert_id: str = Depends(get_current_expert)
+):
+    """
+    Mark the given notifications (or all, if none are given) as read.
+    """
+    marked = await mark_read(expert_id, body.notification_ids)
+    return success({"marked": marked}, message="Notifications marked as read")
 
 @router.post("/answer/{answer_id}/ai-suggestions")
 async def get_ai_suggestions_route(
@@ -157,23 +275,28 @@ async def get_ai_suggestions_route(
     Get AI suggestions for improving an answer.
     """
     # Get the answer text
-    from app.utils.db import answers_collection
-    answer = await answers_collection.find_one({"_id": ObjectId(answer_id), "expert_id": ObjectId(expert_id)})
+    answer = await answers_collection.find_one(
+        {"_id": ObjectId(answer_id), "expert_id": ObjectId(expert_id)}, {"question_id": 1, "answer_text": 1}
+    )
     if not answer:
         raise HTTPException(status_code=404, detail="Answer not found")
 
     # Get question text
-    question = await questions_collection.find_one({"_id": answer["question_id"]})
+    question = await questions_collection.find_one(
+        {"_id": answer["question_id"]}, {"cleaned_text": 1, "raw_text": 1, "original_text": 1}
+    )
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
 
-    suggestions = await get_ai_suggestions(answer["answer_text"], question["cleaned_text"] or question["raw_text"])
+    question_text = question.get("cleaned_text") or question.get("raw_text") or question.get("original_text")
+    suggestions = await get_ai_suggestions(answer["answer_text"], question_text)
     return success({"suggestions": suggestions})
 
 @router.post("/answer/{answer_id}/peer-review")
 async def submit_peer_review_route(
     answer_id: str,
     review_data: PeerReviewCreate,
+    background_tasks: BackgroundTasks,
     expert_id: str = Depends(get_current_expert)
 ):
     """
@@ -184,22 +307,38 @@ async def submit_peer_review_route(
     if not result:
         raise HTTPException(status_code=400, detail="Failed to submit peer review or not authorized")
 
-    # Update expert scores after voting
-    await update_expert_score_for_question(ObjectId(answer_id))
+    # Update expert scores after voting, off the request path
+    background_tasks.add_task(update_expert_score_for_question, ObjectId(answer_id))
 
     return success(result, message="Peer review submitted successfully")
 
 @router.get("/answer/{answer_id}/peer-reviews")
 async def get_peer_reviews_route(
     answer_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    if_none_match: Optional[str] = Header(None),
     expert_id: str = Depends(get_current_expert)
 ):
     """
-    Get all peer reviews for a specific answer.
+    Get the peer reviews for a specific answer, newest first; pass limit and next_cursor to page.
+    Pass fields=best_answer_vote,comment_text,... to receive only those fields.
+    Honours If-None-Match with a 304 while no review of the answer has changed.
     """
     from app.services.expert_service import get_peer_reviews_for_answer
-    reviews = await get_peer_reviews_for_answer(answer_id)
-    return success({"reviews": reviews})
+    try:
+        selected = parse_fields(fields, PEER_REVIEW_SOURCES)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    etag = await version_etag(answers_collection, answer_id, "reviews_version", limit, cursor, selected)
+    if etag and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+    try:
+        page = await get_peer_reviews_for_answer(answer_id, limit, cursor, selected)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return with_etag(success(page), etag)
 
 @router.get("/question/{question_id}/best-answer-vote")
 async def get_expert_best_answer_vote_route(
@@ -213,6 +352,40 @@ async def get_expert_best_answer_vote_route(
     vote_info = await get_expert_vote_for_question(question_id, expert_id)
     return success({"vote": vote_info})
 
+@router.get("/question/{question_id}/events")
+async def question_events_route(
+    question_id: str,
+    request: Request,
+    expert_id: str = Depends(get_current_expert)
+):
+    """
+    Server-Sent Events stream of new answers, edits, votes and peer reviews on a question.
+    Replaces polling /answers and /peer-reviews while a review is in progress.
+    """
+    assigned = await questions_collection.find_one(
+        {"_id": ObjectId(question_id), "assigned_experts": expert_id}, {"_id": 1}
+    )
+    if not assigned:
+        raise HTTPException(status_code=403, detail="Expert not assigned to this question")
+
+    return StreamingResponse(
+        sse_stream(question_channel(question_id), request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/best-answer-votes")
+async def get_expert_best_answer_votes_route(
+    question_ids: Optional[List[str]] = Query(None),
+    expert_id: str = Depends(get_current_expert)
+):
+    """
+    Best answer vote status for several questions (default: all assigned questions) in one call.
+    """
+    from app.services.expert_service import get_expert_votes_for_questions
+    votes = await get_expert_votes_for_questions(expert_id, question_ids)
+    return success({"votes": votes})
+
 async def update_expert_score_for_question(answer_id: ObjectId):
     """
     Update expert scores based on best answer votes for this question.
@@ -4,22 +4,33 @@ from typing import Optional
 from app.models.question import QuestionCreate, QuestionOut
 from app.services.question_service import create_question, get_question_by_id
 from app.utils.response import success
-from app.utils.jwt import decode_token
+from app.utils.negotiation import NegotiatedRoute
+from app.utils.jwt import bearer_token, get_principal
+from app.utils.etag import version_etag, etag_matches, not_modified, with_etag
+from app.utils.db import questions_collection
+from app.utils.projection import parse_fields, sparse_projection, pick
 
-router = APIRouter(prefix="/api/farmer", tags=["farmer"])
+router = APIRouter(prefix="/api/farmer", tags=["farmer"], route_class=NegotiatedRoute)
+
+# Document fields behind each field of the question detail response, for ?fields=
+QUESTION_DETAIL_SOURCES = {
+    "original_text": ("original_text", "raw_text"),
+    "cleaned_text": ("cleaned_text",),
+    "domain": ("domain",),
+    "status": ("status",),
+    "assigned_experts": ("assigned_experts",),
+    "is_duplicate_of": ("duplicate_of",),
+    "created_by": ("user_id", "created_by"),
+    "created_at": ("created_at",),
+    "ai_metadata": ("ai_metadata",),
+    "ai_pipeline": ("ai_pipeline",)
+}
 
 async def get_optional_user(authorization: Optional[str] = Header(None)):
-    if not authorization:
-        return None
-    parts = authorization.split()
-    if len(parts) == 2 and parts[0].lower() == "bearer":
-        token = parts[1]
-        payload = await decode_token(token)
-        if payload:
-            return payload.get("user_id")
-    return None
-
-@router.post("/questions", response_model=dict)
+    principal = await get_principal(bearer_token(authorization))
+    return principal["user_id"] if principal else None
+
+@router.post("/questions")
 async def submit_question(q: QuestionCreate, background_tasks: BackgroundTasks, user_id: Optional[str] = Depends(get_optional_user)):
     """
     Submit a farmer question and trigger background AI pipeline
@@ -36,12 +47,22 @@ async def submit_question(q: QuestionCreate, background_tasks: BackgroundTasks,
     return success({"question_id": created_id}, message="Question submitted and processing started")
 
 
-@router.get("/questions/{question_id}", response_model=dict)
-async def get_question(question_id: str):
+@router.get("/questions/{question_id}")
+async def get_question(question_id: str, fields: Optional[str] = None, if_none_match: Optional[str] = Header(None)):
     """
-    Get question details by ID
+    Get question details by ID. Pass fields=status,cleaned_text,... to receive only those fields.
+    Honours If-None-Match with a 304 when the question is unchanged.
     """
-    question: QuestionOut = await get_question_by_id(question_id)
+    try:
+        selected = parse_fields(fields, QUESTION_DETAIL_SOURCES)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    etag = await version_etag(questions_collection, question_id, "version", selected)
+    if etag and etag_matches(if_none_match, etag):
+        return not_modified(etag)
+
+    question: QuestionOut = await get_question_by_id(question_id, sparse_projection(QUESTION_DETAIL_SOURCES, selected))
     if not question:
         raise HTTPException(status_code=404, detail="Question not found")
 
@@ -59,4 +80,4 @@ async def get_question(question_id: str):
         "ai_metadata": question.ai_metadata.dict() if question.ai_metadata else {},
         "ai_pipeline": question.ai_pipeline.dict() if question.ai_pipeline else {}
     }
-    return success({"question": out})
+    return with_etag(success({"question": pick(out, selected)}), etag)
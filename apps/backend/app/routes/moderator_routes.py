@@ -1,37 +1,51 @@
 # app/routes/moderator_routes.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException
 from typing import Optional, List
-from app.models.question import QuestionUpdate, QuestionOut, VectorSearchResult
+from app.models.question import QuestionUpdate, QuestionOut, VectorSearchResult, ReviewQuestionOut
+from app.utils.projection import projection_for
 from app.services.question_service import get_question_by_id, update_question
+from app.services.notification_service import notify_users
+from app.services.gc_service import cascade_delete_question
+from app.services.archive_service import archive_questions, restore_question
+from app.services.sync_service import record_question_tombstones
+from app.services.analytics_service import (
+    get_question_analytics, get_total_questions, record_question_rollup, dashboard_cache, ROLLUP_FIELDS
+)
 from app.utils.response import success
-from app.utils.jwt import decode_token
-from app.utils.db import questions_collection
+from app.utils.pagination import fetch_page, approximate_count
+from app.utils.jwt import bearer_token, get_principal
+from app.utils.db import questions_collection, get_collection, pool_metrics
 from bson import ObjectId
 from datetime import datetime, timedelta
 
 
 router = APIRouter(prefix="/api/moderator", tags=["moderator"])
 
+REVIEW_QUESTION_PROJECTION = projection_for(ReviewQuestionOut)
 
-async def verify_moderator(authorization: str):
-    """Verify user has moderator/admin privileges."""
+
+async def verify_moderator(
+    authorization: Optional[str] = None,
+    authorization_header: Optional[str] = Header(None, alias="Authorization")
+):
+    """Verify user has moderator/admin privileges. Accepts the Authorization header or ?authorization=."""
+    authorization = authorization or authorization_header
     if not authorization:
         raise HTTPException(status_code=401, detail="Authorization required")
 
-    parts = authorization.split()
-    if len(parts) != 2 or parts[0].lower() != "bearer":
+    token = bearer_token(authorization)
+    if not token:
         raise HTTPException(status_code=401, detail="Invalid authorization format")
 
-    token = parts[1]
-    payload = await decode_token(token)
-    if not payload:
+    principal = await get_principal(token)
+    if not principal:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    user_role = payload.get("role", "farmer")
+    user_role = principal["role"] or "farmer"
     if user_role not in ["moderator", "admin"]:
         raise HTTPException(status_code=403, detail="Insufficient permissions")
 
-    return payload
+    return principal["claims"]
 
 
 @router.get("/questions/{question_id}")
@@ -51,10 +65,24 @@ async def update_question_status(
     authorization: str = Depends(verify_moderator)
 ):
     """Update question status (for moderation actions)."""
-    updated = await update_question(question_id, update_data.dict(exclude_unset=True))
+    updates = update_data.dict(exclude_unset=True)
+    updated = await update_question(question_id, updates)
     if not updated:
         raise HTTPException(status_code=404, detail="Question not found or no changes made")
 
+    question = await questions_collection.find_one(
+        {"_id": ObjectId(question_id)}, {"assigned_experts": 1, "user_id": 1, "created_by": 1}
+    )
+    if question:
+        status = getattr(updates.get("status"), "value", updates.get("status"))
+        notification_type = "final_answer_published" if status == "completed" else "question_moderated"
+        await notify_users(
+            question.get("assigned_experts", []) + [question.get("user_id") or question.get("created_by")],
+            notification_type, "Question moderated",
+            f"A moderator updated the question{f' to {status}' if status else ''}",
+            question_id=question_id
+        )
+
     return success({"message": "Question updated successfully"})
 
 
@@ -62,30 +90,42 @@ async def update_question_status(
 async def get_questions_for_review(
     status: Optional[str] = None,
     limit: int = 20,
-    skip: int = 0,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     authorization: str = Depends(verify_moderator)
 ):
-    """Get questions for moderation review."""
+    """
+    Get a page of questions for moderation review, newest first.
+    Pass the returned next_cursor to fetch the following page; include_total adds an
+    approximate total from a cached count.
+    """
     query = {}
     if status:
         query["status"] = status
 
-    questions = await questions_collection.find(query).sort("created_at", -1).skip(skip).limit(limit).to_list(length=None)
+    listing_questions = get_collection("questions", "listing")
+    try:
+        questions, cursor_out = await fetch_page(listing_questions, query, REVIEW_QUESTION_PROJECTION, limit, cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
     # Convert to response format
     result = []
     for doc in questions:
-        result.append({
-            "id": str(doc["_id"]),
-            "raw_text": doc.get("raw_text"),
-            "domain": doc.get("domain"),
-            "status": doc.get("status"),
-            "created_by": doc.get("created_by"),
-            "created_at": doc.get("created_at"),
-            "ai_metadata": doc.get("ai_metadata", {})
-        })
-
-    return success({"questions": result, "total": len(result)})
+        result.append(ReviewQuestionOut(
+            id=str(doc["_id"]),
+            raw_text=doc.get("raw_text"),
+            domain=doc.get("domain"),
+            status=doc.get("status"),
+            created_by=doc.get("created_by"),
+            created_at=doc.get("created_at"),
+            ai_metadata=doc.get("ai_metadata") or {}
+        ).dict())
+
+    page = {"questions": result, "next_cursor": cursor_out}
+    if include_total:
+        page["total"] = await approximate_count(listing_questions, query)
+    return success(page)
 
 
 @router.post("/vector-search/test")
@@ -128,9 +168,13 @@ async def test_vector_search(
 async def vector_search_health_check():
     """Check vector search system health."""
     try:
+        cached = dashboard_cache.get("vector_health")
+        if cached is not None:
+            return success(cached)
+
         # Count questions with embeddings
-        with_embeddings = await questions_collection.count_documents({"embedding": {"$exists": True}})
-        total_questions = await questions_collection.count_documents({})
+        with_embeddings = await get_collection("question_embeddings", "analytics").estimated_document_count()
+        total_questions = await get_total_questions()
 
         # Check for vector search indexes (simple check)
         indexes = []
@@ -140,13 +184,15 @@ async def vector_search_health_check():
         except:
             pass
 
-        return success({
+        health = {
             "vector_search_status": "healthy" if with_embeddings > 0 else "no_data",
             "questions_with_embeddings": with_embeddings,
             "total_questions": total_questions,
             "embedding_coverage": with_embeddings / total_questions if total_questions > 0 else 0,
             "vector_indexes": indexes
-        })
+        }
+        dashboard_cache.set("vector_health", health)
+        return success(health)
 
     except Exception as e:
         return success({
@@ -155,49 +201,67 @@ async def vector_search_health_check():
         })
 
 
+@router.get("/system/realtime")
+async def realtime_metrics(authorization: str = Depends(verify_moderator)):
+    """Realtime push channel metrics: connections and fan-out latency for this worker."""
+    from app.services.realtime_service import broker
+    return success(broker.metrics())
+
+
+@router.get("/system/db-pool")
+async def db_pool_metrics(authorization: str = Depends(verify_moderator)):
+    """MongoDB connection pool metrics for this worker, for sizing MONGO_MAX_POOL_SIZE."""
+    return success(pool_metrics.metrics())
+
+
+@router.get("/system/gc")
+async def gc_report(run: bool = False, authorization: str = Depends(verify_moderator)):
+    """Report of the last orphan sweep; run=true sweeps now and reports that run."""
+    from app.services import gc_service
+    if run:
+        return success(await gc_service.sweep_orphans())
+    return success(gc_service.last_sweep)
+
+
+@router.post("/system/archive")
+async def run_archive(older_than_days: Optional[int] = None, authorization: str = Depends(verify_moderator)):
+    """Archive terminal questions now (defaults to ARCHIVE_AFTER_DAYS) and report what moved."""
+    return success(await archive_questions(older_than_days))
+
+
+@router.post("/questions/{question_id}/restore")
+async def restore_archived_question(question_id: str, authorization: str = Depends(verify_moderator)):
+    """Move an archived question and its answers and reviews back into the live collections."""
+    if not await restore_question(question_id):
+        raise HTTPException(status_code=404, detail="Archived question not found")
+    return success({"message": "Question restored"})
+
+
 @router.get("/analytics/questions")
 async def question_analytics(authorization: str = Depends(verify_moderator)):
-    """Get question analytics for moderation dashboard."""
+    """Get question analytics for moderation dashboard, served from the question rollups."""
     try:
-        # Get status breakdown
-        pipeline = [
-            {"$group": {"_id": "$status", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}}
-        ]
-        status_stats = await questions_collection.aggregate(pipeline).to_list(length=None)
-
-        # Domain breakdown
-        domain_pipeline = [
-            {"$match": {"domain": {"$ne": None}}},
-            {"$group": {"_id": "$domain", "count": {"$sum": 1}}},
-            {"$sort": {"count": -1}}
-        ]
-        domain_stats = await questions_collection.aggregate(domain_pipeline).to_list(length=None)
-
-        # Recent activity (last 7 days)
-        week_ago = datetime.utcnow() - timedelta(days=7)
-        recent_count = await questions_collection.count_documents({"created_at": {"$gte": week_ago}})
-
-        # Duplicate statistics
-        duplicate_count = await questions_collection.count_documents({"status": "duplicate"})
-
-        return success({
-            "status_breakdown": {stat["_id"]: stat["count"] for stat in status_stats},
-            "domain_breakdown": {stat["_id"]: stat["count"] for stat in domain_stats},
-            "recent_questions": recent_count,
-            "duplicate_count": duplicate_count,
-            "total_questions": sum(stat["count"] for stat in status_stats)
-        })
-
+        return success(await get_question_analytics())
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Analytics error: {str(e)}")
 
 
 @router.delete("/questions/{question_id}")
-async def delete_question(question_id: str, authorization: str = Depends(verify_moderator)):
-    """Delete a question (admin only)."""
-    result = await questions_collection.delete_one({"_id": ObjectId(question_id)})
-    if result.deleted_count == 0:
+async def delete_question(
+    question_id: str,
+    background_tasks: BackgroundTasks,
+    authorization: str = Depends(verify_moderator)
+):
+    """Delete a question (admin only). Its answers, votes, reviews and notifications are removed in the background."""
+    # An archived question is brought back first so its family is cascaded like any other
+    await restore_question(question_id)
+    deleted = await questions_collection.find_one_and_delete(
+        {"_id": ObjectId(question_id)}, projection={**ROLLUP_FIELDS, "assigned_experts": 1}
+    )
+    if not deleted:
         raise HTTPException(status_code=404, detail="Question not found")
+    await record_question_rollup(deleted, None)
+    await record_question_tombstones([deleted], "deleted")
+    background_tasks.add_task(cascade_delete_question, question_id)
 
     return success({"message": "Question deleted successfully"})
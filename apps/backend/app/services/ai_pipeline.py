@@ -9,21 +9,30 @@ from app.utils.vector import cosine_similarity
 from bson import ObjectId
 from datetime import datetime
 from app.ai import classifier, duplicate_detector, cleanup
+from app.services.notification_service import notify_users
+from app.services.question_service import set_question_fields
+from app.services.embedding_service import store_question_embedding, EMBEDDING_MODEL
+from app.ai.clients import get_openai_client
+from app.utils.profiling import profile_span
+from app.utils.log import get_logger
 import asyncio
 from typing import List
-from openai import OpenAI
-import os
+
+log = get_logger(__name__)
 
 
 async def allocate_experts_domain_vector(question_domain: str, question_embedding: List[float]) -> List[str]:
     """Allocate top 5 experts based on domain match and vector similarity with question embedding."""
     try:
         # Find all experts in the matching domain
-        experts_cursor = users_collection.find({"role": "expert", "domain": question_domain})
+        experts_cursor = users_collection.find(
+            {"role": "expert", "domain": question_domain},
+            {"name": 1, "specialisation": 1, "specialisation_embedding": 1, "score": 1, "accuracy": 1}
+        )
         experts = await experts_cursor.to_list(length=None)
 
         if not experts:
-            print(f"No experts found for domain: {question_domain}")
+            log.warning("No experts found for domain", domain=question_domain)
             return []
 
         # Calculate similarity scores
@@ -44,29 +53,31 @@ async def allocate_experts_domain_vector(question_domain: str, question_embeddin
         expert_similarities.sort(key=lambda x: x["similarity"], reverse=True)
         top_experts = expert_similarities[:5]
 
-        # Log allocation details
-        print(f"Allocated {len(top_experts)} experts for domain '{question_domain}':")
-        for i, expert in enumerate(top_experts, 1):
-            print(f"  {i}. {expert['name']} - {expert['specialisation']} (similarity: {expert['similarity']:.4f})")
+        log.debug(
+            "Experts allocated",
+            domain=question_domain,
+            experts=[(expert["_id"], round(expert["similarity"], 4)) for expert in top_experts],
+            rate_limit=10
+        )
 
         return [expert["_id"] for expert in top_experts]
 
     except Exception as e:
-        print(f"Error allocating experts: {e}")
+        log.error("Expert allocation failed", domain=question_domain, error=str(e))
         return []
 
 
 async def generate_embedding(text: str) -> List[float]:
     """Generate text embedding using OpenAI for duplicate detection."""
     try:
-        client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
-        result = client.embeddings.create(
-            input=text,
-            model="text-embedding-3-small"
-        )
+        with profile_span("openai"):
+            result = await get_openai_client().embeddings.create(
+                input=text,
+                model="text-embedding-3-small"
+            )
         return result.data[0].embedding
     except Exception as e:
-        print(f"Error generating embedding: {e}")
+        log.error("Embedding generation failed", error=str(e))
         # Return empty list to indicate failure
         return []
 
@@ -76,52 +87,46 @@ async def process_question_pipeline(question_id: str):
     Background pipeline: embedding -> classification -> duplicate check -> cleanup -> expert allocation
     Update the question document as we progress.
     """
-    qobj = await questions_collection.find_one({"_id": ObjectId(question_id)})
+    qobj = await questions_collection.find_one({"_id": ObjectId(question_id)}, {"original_text": 1})
     if not qobj:
         return
 
     # Mark processing
-    await questions_collection.update_one(
-        {"_id": ObjectId(question_id)},
-        {"$set": {"status": "processing", "ai_pipeline.status": "running"}}
-    )
+    await set_question_fields(question_id, {"status": "processing", "ai_pipeline.status": "running"})
 
     text = qobj.get("original_text", "")
 
-    # 1) Generate embedding
+    # 1) Generate embedding (stored with the domain once classification is done)
+    embedding: List[float] = []
     try:
         embedding = await generate_embedding(text)
         if embedding:  # Only update if we got a valid embedding
-            await questions_collection.update_one(
-                {"_id": ObjectId(question_id)},
-                {"$set": {
-                    "embedding": embedding,
-                    "ai_metadata": {
-                        "embedding_generated": True,
-                        "embedding_model": "text-embedding-3-small",
-                        "generated_at": datetime.utcnow()
-                    }
-                }}
-            )
-            print(embedding)
+            await set_question_fields(question_id, {
+                "ai_metadata": {
+                    "embedding_generated": True,
+                    "embedding_model": EMBEDDING_MODEL,
+                    "generated_at": datetime.utcnow()
+                }
+            })
+            log.debug("Embedding generated", question_id=question_id, dims=len(embedding))
     except Exception as e:
-        print(f"Embedding generation failed for question {question_id}: {e}")
+        log.error("Embedding step failed", question_id=question_id, error=str(e))
         # Continue without embedding
 
     # 2) Classification
     try:
         domain = await classifier.classify_question_domain(text)
-        await questions_collection.update_one(
-            {"_id": ObjectId(question_id)},
-            {"$set": {"domain": domain}}
-        )
+        await set_question_fields(question_id, {"domain": domain})
     except Exception as e:
-        print(f"Classification failed for question {question_id}: {e}")
+        log.error("Classification step failed", question_id=question_id, error=str(e))
         domain = "other"
-        await questions_collection.update_one(
-            {"_id": ObjectId(question_id)},
-            {"$set": {"domain": domain}}
-        )
+        await set_question_fields(question_id, {"domain": domain})
+
+    if embedding:
+        try:
+            await store_question_embedding(question_id, domain, embedding)
+        except Exception as e:
+            log.error("Storing embedding failed", question_id=question_id, error=str(e))
 
     # 3) Duplicate detection (now uses vector search if embedding available)
     try:
@@ -129,90 +134,72 @@ async def process_question_pipeline(question_id: str):
         dup = await duplicate_detector.find_semantic_duplicate(question_id, domain, embedding)
 
         if dup:
-            await questions_collection.update_one(
-                {"_id": ObjectId(question_id)},
-                {"$set": {
-                    "status": "duplicate",
-                    "is_duplicate_of": dup,
-                    "ai_pipeline.status": "done",
-                    "ai_metadata.duplicate_found": True
-                }}
-            )
+            await set_question_fields(question_id, {
+                "status": "duplicate",
+                "is_duplicate_of": dup,
+                "ai_pipeline.status": "done",
+                "ai_metadata.duplicate_found": True
+            })
             return
     except Exception as e:
-        print(f"Duplicate detection failed for question {question_id}: {e}")
+        log.error("Duplicate detection step failed", question_id=question_id, error=str(e))
         # Continue with pipeline even if duplicate check fails
 
     # 4) Cleanup
     try:
         cleaned = await cleanup.clean_question_text(text)
-        await questions_collection.update_one(
-            {"_id": ObjectId(question_id)},
-            {"$set": {"cleaned_text": cleaned}}
-        )
+        await set_question_fields(question_id, {"cleaned_text": cleaned})
     except Exception as e:
-        print(f"Text cleanup failed for question {question_id}: {e}")
+        log.error("Text cleanup step failed", question_id=question_id, error=str(e))
         # Continue with original text
 
     # 5) Expert allocation based on domain match and vector similarity
     try:
-        # Get the latest question object with domain and embedding
-        current_qobj = await questions_collection.find_one({"_id": ObjectId(question_id)})
-        question_domain = current_qobj.get("domain", "other")
-        question_embedding = current_qobj.get("embedding", [])
+        question_domain = domain
+        question_embedding = embedding
 
         # Allocate experts based on domain and vector similarity
         if question_embedding and question_domain != "other":
             assigned_experts = await allocate_experts_domain_vector(question_domain, question_embedding)
         else:
             # Fallback: allocate from general pool if no embedding or domain is 'other'
-            print(f"Falling back to general expert allocation for question {question_id}")
-            cursor = users_collection.find({"role": "expert"}).limit(5)
+            log.info("Falling back to general expert allocation", question_id=question_id)
+            cursor = users_collection.find({"role": "expert"}, {"_id": 1}).limit(5)
             assigned_experts = []
             async for e in cursor:
                 assigned_experts.append(str(e["_id"]))
 
         if assigned_experts:
-            await questions_collection.update_one(
-                {"_id": ObjectId(question_id)},
-                {"$set": {
-                    "assigned_experts": assigned_experts,
-                    "status": "assigned",
-                    "expert_allocation_details": {
-                        "method": "domain_vector_similarity" if question_embedding else "fallback_random",
-                        "domain": question_domain,
-                        "num_experts": len(assigned_experts)
-                    }
-                }}
+            await set_question_fields(question_id, {
+                "assigned_experts": assigned_experts,
+                "status": "assigned",
+                "expert_allocation_details": {
+                    "method": "domain_vector_similarity" if question_embedding else "fallback_random",
+                    "domain": question_domain,
+                    "num_experts": len(assigned_experts)
+                }
+            })
+            await notify_users(
+                assigned_experts, "question_assigned", "New question assigned",
+                f"A new {question_domain} question has been assigned to you",
+                question_id=question_id
             )
         else:
-            await questions_collection.update_one(
-                {"_id": ObjectId(question_id)},
-                {"$set": {"status": "assigned"}}
-            )
+            await set_question_fields(question_id, {"status": "assigned"})
     except Exception as e:
-        print(f"Expert allocation failed for question {question_id}: {e}")
-        await questions_collection.update_one(
-            {"_id": ObjectId(question_id)},
-            {"$set": {"status": "processed"}}  # Fallback status
-        )
+        log.error("Expert allocation step failed", question_id=question_id, error=str(e))
+        await set_question_fields(question_id, {"status": "processed"})  # Fallback status
 
     # Mark pipeline complete
-    await questions_collection.update_one(
-        {"_id": ObjectId(question_id)},
-        {"$set": {"ai_pipeline.status": "done"}}
-    )
+    await set_question_fields(question_id, {"ai_pipeline.status": "done"})
 
 
 async def process_domain_classification(question_id: str, question_text: str):
     """Process domain classification for a question."""
     try:
         domain = await classify_question_domain(question_text)
-        await questions_collection.update_one(
-            {"_id": ObjectId(question_id)},
-            {"$set": {"domain": domain}}
-        )
+        await set_question_fields(question_id, {"domain": domain})
         return domain
     except Exception as e:
-        print(f"Domain classification failed for question {question_id}: {e}")
+        log.error("Domain classification failed", question_id=question_id, error=str(e))
         return "other"
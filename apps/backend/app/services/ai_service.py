@@ -1,22 +1,25 @@
 from app.config import settings
 import numpy as np
-from app.utils.db import questions_collection
-from openai import AsyncOpenAI
-import os
+from app.utils.db import question_embeddings_collection
+from app.utils.vector import unpack_vector
+from app.ai.clients import get_openai_client
+from app.utils.profiling import profile_span
+from app.utils.log import get_logger
 from typing import List
 
-client = AsyncOpenAI(api_key=os.getenv("OPENAI_API_KEY", ""))
+log = get_logger(__name__)
 
 # ---- Get Embedding from Open AI ----
 async def get_embedding(text: str):
     try:
-        result = await client.embeddings.create(
-            input=text,
-            model="text-embedding-3-small"
-        )
+        with profile_span("openai"):
+            result = await get_openai_client().embeddings.create(
+                input=text,
+                model="text-embedding-3-small"
+            )
         return result.data[0].embedding
     except Exception as e:
-        print(f"Error generating embedding: {e}")
+        log.error("Embedding generation failed", error=str(e))
         # Return empty list to indicate failure
         return []
 
@@ -31,14 +34,15 @@ async def generate_draft_answer(question_text: str, domain: str = None) -> str:
         if domain:
             prompt = f"Provide a draft answer for the following {domain} agricultural question:\nQuestion: {question_text}"
 
-        response = await client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=500
-        )
+        with profile_span("openai"):
+            response = await get_openai_client().chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=500
+            )
         return response.choices[0].message.content
     except Exception as e:
-        print(f"Error generating draft answer: {e}")
+        log.error("Draft answer generation failed", error=str(e))
         return ""
 
 
@@ -50,16 +54,17 @@ async def generate_quality_suggestions(answer_text: str, question_text: str) ->
     try:
         prompt = f"For the question: '{question_text}'\nEvaluate the answer: '{answer_text}'\nProvide up to 3 suggestions to improve the answer quality:"
 
-        response = await client.chat.completions.create(
-            model="gpt-3.5-turbo",
-            messages=[{"role": "user", "content": prompt}],
-            max_tokens=300
-        )
+        with profile_span("openai"):
+            response = await get_openai_client().chat.completions.create(
+                model="gpt-3.5-turbo",
+                messages=[{"role": "user", "content": prompt}],
+                max_tokens=300
+            )
         suggestions_text = response.choices[0].message.content
         # Parse into list
         return [s.strip() for s in suggestions_text.split('\n') if s.strip()][:3]
     except Exception as e:
-        print(f"Error generating suggestions: {e}")
+        log.error("Suggestion generation failed", error=str(e))
         return []
 
 
@@ -70,16 +75,16 @@ async def find_duplicate_question(new_question: str, threshold: float = 0.88):
     """
     new_emb = await get_embedding(new_question)
 
-    cursor = questions_collection.find(
-        {"embedding": {"$exists": True}},
-        {"embedding": 1}
+    cursor = question_embeddings_collection.find(
+        {"is_duplicate": False},
+        {"vector": 1}
     )
 
     best_score = 0
     best_match = None
 
     async for doc in cursor:
-        existing_emb = np.array(doc["embedding"])
+        existing_emb = unpack_vector(doc["vector"])
         # cosine similarity
         similarity = np.dot(new_emb, existing_emb) / (
             np.linalg.norm(new_emb) * np.linalg.norm(existing_emb)
@@ -0,0 +1,191 @@
+"""
+Analytics Service
+Precomputed question rollups for the moderator dashboard.
+
+Each rollup bucket counts questions per created day x status x domain; a parallel set of
+all-time buckets (day = None) counts per status x domain. Question writes that change
+status or domain go through question_service.set_question_fields(), which moves the
+question between buckets with $inc. repair_question_rollups() recomputes every bucket
+from the live and archived questions to correct drift, and runs periodically from the
+app lifespan.
+"""
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+from pymongo import UpdateOne
+
+from app.config import settings
+from app.utils.cache import TTLCache
+from app.utils.log import get_logger
+from app.utils.db import question_rollups_collection, get_collection
+
+log = get_logger(__name__)
+
+# Question fields that decide a question's rollup buckets
+ROLLUP_FIELDS = {"status": 1, "domain": 1, "created_at": 1}
+
+# Short-lived cache of dashboard responses
+dashboard_cache = TTLCache(ttl=settings.ANALYTICS_CACHE_TTL_SECONDS, maxsize=64)
+
+
+def _day(value: datetime) -> datetime:
+    return datetime(value.year, value.month, value.day)
+
+
+def _bucket_id(day: Optional[datetime], status: Optional[str], domain: Optional[str]) -> str:
+    return f"{day.date().isoformat() if day else 'all'}|{status}|{domain}"
+
+
+def _bucket_keys(question: Dict[str, Any]) -> List[Tuple[Optional[datetime], Optional[str], Optional[str]]]:
+    """
+    The (day, status, domain) buckets a question counts towards: the all-time bucket and,
+    if it has a created_at, its daily bucket.
+    """
+    status = getattr(question.get("status"), "value", question.get("status"))
+    domain = question.get("domain")
+    keys = [(None, status, domain)]
+    if question.get("created_at"):
+        keys.append((_day(question["created_at"]), status, domain))
+    return keys
+
+
+def _bucket_update(key: Tuple[Optional[datetime], Optional[str], Optional[str]], delta: int) -> UpdateOne:
+    day, status, domain = key
+    return UpdateOne(
+        {"_id": _bucket_id(day, status, domain)},
+        {"$inc": {"count": delta}, "$setOnInsert": {"day": day, "status": status, "domain": domain}},
+        upsert=True
+    )
+
+
+async def record_question_rollup(before: Optional[Dict[str, Any]], after: Optional[Dict[str, Any]]) -> None:
+    """
+    Move a question between rollup buckets. before and after hold the question's status,
+    domain and created_at; pass before=None for a new question and after=None for a deleted one.
+    Never raises: a failed update is left for repair_question_rollups().
+    """
+    deltas: Dict[Tuple, int] = defaultdict(int)
+    for key in _bucket_keys(before) if before else []:
+        deltas[key] -= 1
+    for key in _bucket_keys(after) if after else []:
+        deltas[key] += 1
+    ops = [_bucket_update(key, delta) for key, delta in deltas.items() if delta]
+    if not ops:
+        return
+    try:
+        await question_rollups_collection.bulk_write(ops, ordered=False)
+    except Exception as e:
+        log.error("Error updating question rollups", error=str(e))
+
+
+async def repair_question_rollups() -> int:
+    """
+    Recompute every rollup bucket from the live and archived questions and correct the
+    ones that drifted. A bucket that changes between the recount and the correction is skipped and
+    picked up by the next run. Returns the number of buckets corrected.
+    """
+    # Archived questions still count towards the dashboard
+    pipeline = [
+        {"$unionWith": {"coll": "questions_archive", "pipeline": [{"$project": ROLLUP_FIELDS}]}},
+        {"$group": {
+            "_id": {
+                "day": {"$dateTrunc": {"date": "$created_at", "unit": "day"}},
+                "status": "$status",
+                "domain": "$domain"
+            },
+            "count": {"$sum": 1}
+        }}
+    ]
+    actual: Dict[str, int] = defaultdict(int)
+    keys: Dict[str, Tuple] = {}
+    async for group in get_collection("questions", "analytics").aggregate(pipeline):
+        day, status, domain = group["_id"].get("day"), group["_id"].get("status"), group["_id"].get("domain")
+        bucket_keys = [(None, status, domain)] + ([(day, status, domain)] if day else [])
+        for key in bucket_keys:
+            bucket_id = _bucket_id(*key)
+            actual[bucket_id] += group["count"]
+            keys[bucket_id] = key
+
+    stored = {doc["_id"]: doc.get("count", 0) async for doc in question_rollups_collection.find({}, {"count": 1})}
+
+    ops = []
+    for bucket_id in set(actual) | set(stored):
+        count = actual.get(bucket_id, 0)
+        if bucket_id not in stored:
+            ops.append(_bucket_update(keys[bucket_id], count))
+        elif stored[bucket_id] != count:
+            # Only correct buckets unchanged since they were read
+            ops.append(UpdateOne({"_id": bucket_id, "count": stored[bucket_id]}, {"$set": {"count": count}}))
+
+    if not ops:
+        return 0
+    result = await question_rollups_collection.bulk_write(ops, ordered=False)
+    await question_rollups_collection.delete_many({"count": 0})
+    dashboard_cache.clear()
+    return result.modified_count + result.upserted_count
+
+
+async def rollup_repair_loop(interval_seconds: int) -> None:
+    """
+    Run repair_question_rollups() every interval_seconds. Builds the rollups immediately
+    when none exist yet (first start after deploying them).
+    """
+    if not await question_rollups_collection.find_one({}, {"_id": 1}):
+        interval = 0
+    else:
+        interval = interval_seconds
+    while True:
+        await asyncio.sleep(interval)
+        interval = interval_seconds
+        try:
+            corrected = await repair_question_rollups()
+            if corrected:
+                log.info("Question rollups repaired", buckets_corrected=corrected)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error("Question rollup repair failed", error=str(e))
+
+
+async def get_question_analytics(recent_days: int = 7) -> Dict[str, Any]:
+    """
+    Moderator dashboard counts, read from the rollups. recent_questions counts the questions
+    created on the last recent_days days (day granularity, including today).
+    """
+    cached = dashboard_cache.get(("questions", recent_days))
+    if cached is not None:
+        return cached
+
+    rollups = get_collection("question_rollups", "analytics")
+    status_breakdown: Dict[str, int] = defaultdict(int)
+    domain_breakdown: Dict[str, int] = defaultdict(int)
+    async for bucket in rollups.find({"day": None, "count": {"$gt": 0}}, {"status": 1, "domain": 1, "count": 1}):
+        status_breakdown[bucket.get("status")] += bucket["count"]
+        if bucket.get("domain") is not None:
+            domain_breakdown[bucket["domain"]] += bucket["count"]
+
+    since = _day(datetime.utcnow()) - timedelta(days=recent_days - 1)
+    recent = 0
+    async for bucket in rollups.find({"day": {"$gte": since}}, {"count": 1}):
+        recent += bucket.get("count", 0)
+
+    analytics = {
+        "status_breakdown": dict(sorted(status_breakdown.items(), key=lambda item: -item[1])),
+        "domain_breakdown": dict(sorted(domain_breakdown.items(), key=lambda item: -item[1])),
+        "recent_questions": recent,
+        "duplicate_count": status_breakdown.get("duplicate", 0),
+        "total_questions": sum(status_breakdown.values())
+    }
+    dashboard_cache.set(("questions", recent_days), analytics)
+    return analytics
+
+
+async def get_total_questions() -> int:
+    """
+    Total question count from the all-time rollup buckets.
+    """
+    analytics = await get_question_analytics()
+    return analytics["total_questions"]
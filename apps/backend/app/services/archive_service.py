@@ -0,0 +1,202 @@
+"""
+Archive Service
+Moves old questions in terminal states (completed, duplicate) out of the live collections,
+together with their answers, votes, peer reviews and best answer vote ledger, into
+*_archive collections created with zstd block compression. The live collections then hold
+only recent and in-flight questions, so status filters and scans stay bounded.
+
+Question embeddings stay in question_embeddings, so archived questions remain duplicate
+candidates. restore_question() moves a question back on demand; get_question_by_id() does
+so automatically when a question is only found in the archive. A restored question is not
+archived again until ARCHIVE_AFTER_DAYS after its restore.
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import ReplaceOne
+
+from app.config import settings
+from app.utils.db import db, get_collection
+from app.utils.log import get_logger
+from app.services.sync_service import record_question_tombstones
+
+log = get_logger(__name__)
+
+TERMINAL_STATUSES = ["completed", "duplicate"]
+
+# Live collection -> archive collection
+ARCHIVE_COLLECTIONS = {
+    "questions": "questions_archive",
+    "answers": "answers_archive",
+    "votes": "votes_archive",
+    "peer_reviews": "peer_reviews_archive",
+    "question_vote_ledger": "question_vote_ledger_archive",
+}
+
+
+async def ensure_archive_collections() -> None:
+    """
+    Create the archive collections with zstd block compression. Must run before
+    apply_indexes(), which would otherwise create them with the default compressor.
+    """
+    existing = set(await db.list_collection_names())
+    for name in ARCHIVE_COLLECTIONS.values():
+        if name not in existing:
+            try:
+                await db.create_collection(name, storageEngine={"wiredTiger": {"configString": "block_compressor=zstd"}})
+            except Exception:
+                # Another worker created it first
+                pass
+
+
+async def _copy(collection_name: str, docs: List[Dict[str, Any]], archive: bool) -> None:
+    """
+    Upsert docs into the archive (archive=True) or back into the live collection.
+    Upserts keep an interrupted move safe to repeat.
+    """
+    if not docs:
+        return
+    target = ARCHIVE_COLLECTIONS[collection_name] if archive else collection_name
+    await get_collection(target).bulk_write(
+        [ReplaceOne({"_id": doc["_id"]}, doc, upsert=True) for doc in docs], ordered=False
+    )
+
+
+async def _delete(collection_name: str, docs: List[Dict[str, Any]], archive: bool) -> None:
+    if not docs:
+        return
+    source = ARCHIVE_COLLECTIONS[collection_name] if archive else collection_name
+    await get_collection(source).delete_many({"_id": {"$in": [doc["_id"] for doc in docs]}})
+
+
+async def _load_family(question_ids: List[ObjectId], archive: bool) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    Load the answers, votes, peer reviews and ledger entries of some questions.
+    """
+    def source(name: str):
+        return get_collection(ARCHIVE_COLLECTIONS[name] if archive else name)
+
+    answers = await source("answers").find({"question_id": {"$in": question_ids}}).to_list(length=None)
+    answer_ids = [answer["_id"] for answer in answers]
+    votes = await source("votes").find({"answer_id": {"$in": answer_ids}}).to_list(length=None)
+    reviews = await source("peer_reviews").find(
+        {"$or": [{"question_id": {"$in": question_ids}}, {"answer_id": {"$in": answer_ids}}]}
+    ).to_list(length=None)
+    ledger = await source("question_vote_ledger").find({"_id": {"$in": question_ids}}).to_list(length=None)
+    return {"answers": answers, "votes": votes, "peer_reviews": reviews, "question_vote_ledger": ledger}
+
+
+def _family_of(family: Dict[str, List[Dict[str, Any]]], question_ids: set) -> Dict[str, List[Dict[str, Any]]]:
+    """
+    The part of a loaded family that belongs to question_ids.
+    """
+    answers = [a for a in family["answers"] if a["question_id"] in question_ids]
+    answer_ids = {a["_id"] for a in answers}
+    return {
+        "answers": answers,
+        "votes": [v for v in family["votes"] if v["answer_id"] in answer_ids],
+        "peer_reviews": [
+            r for r in family["peer_reviews"]
+            if r.get("question_id") in question_ids or r.get("answer_id") in answer_ids
+        ],
+        "question_vote_ledger": [entry for entry in family["question_vote_ledger"] if entry["_id"] in question_ids],
+    }
+
+
+async def archive_questions(older_than_days: Optional[int] = None) -> Dict[str, int]:
+    """
+    Archive terminal questions created more than older_than_days ago, in batches of
+    ARCHIVE_BATCH_SIZE questions. Everything is copied to the archive before it is removed
+    from the live collections. Returns the number of documents archived per collection.
+    """
+    days = older_than_days if older_than_days is not None else settings.ARCHIVE_AFTER_DAYS
+    cutoff = datetime.utcnow() - timedelta(days=days)
+    query = {
+        "status": {"$in": TERMINAL_STATUSES},
+        "created_at": {"$lt": cutoff},
+        "restored_at": {"$not": {"$gte": cutoff}}
+    }
+    questions_live = get_collection("questions")
+    archived: Dict[str, int] = {name: 0 for name in ARCHIVE_COLLECTIONS}
+
+    while True:
+        questions = await questions_live.find(query).limit(settings.ARCHIVE_BATCH_SIZE).to_list(length=settings.ARCHIVE_BATCH_SIZE)
+        if not questions:
+            return archived
+        question_ids = [q["_id"] for q in questions]
+        family = await _load_family(question_ids, archive=False)
+
+        await _copy("questions", questions, archive=True)
+        for name, docs in family.items():
+            await _copy(name, docs, archive=True)
+
+        # Questions reopened since they were read stay live, and so does their family
+        await questions_live.delete_many({"_id": {"$in": question_ids}, "status": {"$in": TERMINAL_STATUSES}})
+        still_live = {doc["_id"] async for doc in questions_live.find({"_id": {"$in": question_ids}}, {"_id": 1})}
+        moved = set(question_ids) - still_live
+
+        moved_family = _family_of(family, moved)
+        for name in ("votes", "peer_reviews", "question_vote_ledger", "answers"):
+            await _delete(name, moved_family[name], archive=False)
+        if still_live:
+            kept = [q for q in questions if q["_id"] in still_live]
+            await _delete("questions", kept, archive=True)
+            for name, docs in _family_of(family, still_live).items():
+                await _delete(name, docs, archive=True)
+
+        await record_question_tombstones([q for q in questions if q["_id"] in moved], "archived")
+
+        archived["questions"] += len(moved)
+        for name, docs in moved_family.items():
+            archived[name] += len(docs)
+
+        if len(questions) < settings.ARCHIVE_BATCH_SIZE:
+            return archived
+        await asyncio.sleep(settings.GC_BATCH_PAUSE_MS / 1000)
+
+
+async def restore_question(question_id: str) -> bool:
+    """
+    Move an archived question and its answers, votes, reviews and ledger entry back into
+    the live collections. Returns False if the question is not archived.
+    """
+    question_oid = ObjectId(question_id)
+    question = await get_collection(ARCHIVE_COLLECTIONS["questions"]).find_one({"_id": question_oid})
+    if not question:
+        return False
+
+    family = await _load_family([question_oid], archive=True)
+    # Restored documents count as changed, so delta sync sends them to experts again
+    now = datetime.utcnow()
+    for name in ("answers", "peer_reviews"):
+        for doc in family[name]:
+            doc["updated_at"] = now
+    # Children first, so a reader who finds the question also finds its answers
+    for name, docs in family.items():
+        await _copy(name, docs, archive=False)
+    question["restored_at"] = question["updated_at"] = now
+    await _copy("questions", [question], archive=False)
+
+    await _delete("questions", [question], archive=True)
+    for name, docs in family.items():
+        await _delete(name, docs, archive=True)
+    return True
+
+
+async def archive_loop(interval_seconds: int) -> None:
+    """
+    Run archive_questions() every interval_seconds.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            archived = await archive_questions()
+            if archived["questions"]:
+                log.info("Questions archived", **archived)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error("Question archival failed", error=str(e))
@@ -0,0 +1,56 @@
+"""
+Embedding Service
+Question embeddings live in their own collection (question_embeddings, keyed by the
+question's _id) as packed float32 vectors with the question's domain, so question
+documents stay small and list/status queries never page vectors into cache. The domain and
+is_duplicate flag are kept in step with the question by set_question_fields().
+"""
+
+from datetime import datetime
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+from bson import ObjectId
+from app.utils.db import question_embeddings_collection
+from app.utils.vector import pack_vector, unpack_vector
+
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+
+async def store_question_embedding(question_id: str, domain: Optional[str], embedding: Sequence[float]) -> None:
+    await question_embeddings_collection.update_one(
+        {"_id": ObjectId(question_id)},
+        {"$set": {
+            "domain": domain,
+            "vector": pack_vector(embedding),
+            "dims": len(embedding),
+            "model": EMBEDDING_MODEL,
+            "is_duplicate": False,
+            "updated_at": datetime.utcnow()
+        }},
+        upsert=True
+    )
+
+
+async def get_question_embedding(question_id: str) -> Optional[np.ndarray]:
+    doc = await question_embeddings_collection.find_one({"_id": ObjectId(question_id)}, {"vector": 1})
+    return unpack_vector(doc["vector"]) if doc else None
+
+
+async def load_domain_embeddings(domain: str, exclude_id: Optional[str] = None) -> Tuple[List[ObjectId], np.ndarray]:
+    """
+    All non-duplicate embeddings in a domain, as (question ids, matrix with one row per question).
+    """
+    # is_duplicate is always a boolean; an equality match keeps the domain_duplicate index selective
+    query = {"domain": domain, "is_duplicate": False}
+    if exclude_id:
+        query["_id"] = {"$ne": ObjectId(exclude_id)}
+
+    ids: List[ObjectId] = []
+    rows: List[np.ndarray] = []
+    async for doc in question_embeddings_collection.find(query, {"vector": 1}):
+        ids.append(doc["_id"])
+        rows.append(unpack_vector(doc["vector"]))
+
+    if not rows:
+        return ids, np.empty((0, 0), dtype=np.float32)
+    return ids, np.vstack(rows)
@@ -3,15 +3,43 @@ Expert Service
 Handles expert-related operations accessing the users collection.
 """
 
-from app.utils.db import users_collection, questions_collection, answers_collection, votes_collection, notifications_collection, peer_reviews_collection
+from app.utils.db import users_collection, questions_collection, answers_collection, votes_collection, notifications_collection, peer_reviews_collection, vote_ledger_collection
+import asyncio
 from app.services.ai_service import generate_draft_answer, generate_quality_suggestions
+from app.services.realtime_service import broker, question_channel
+from app.services.notification_service import notify_users, notify_moderators
+from app.services.question_service import set_question_fields, touch_question_answers
 from typing import Optional, Dict, Any, List
+from datetime import datetime
 from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne, UpdateMany
+from pymongo.errors import DuplicateKeyError
 from pydantic import ValidationError
 from app.models.answer import AnswerCreate, AnswerInDB, AnswerOut, AnswerUpdate
 from app.models.vote import Vote
 from app.models.peer_review import PeerReview, PeerReviewCreate, PeerReviewOut
-from app.models.question import QuestionInDB, QuestionOut
+from app.models.question import QuestionInDB, QuestionOut, AssignedQuestionOut
+from app.models.answer import AnswerSummaryOut
+from app.models.user import USER_PRIVATE_PROJECTION
+from app.utils.projection import projection_for, field_sources, sparse_projection, pick
+from app.utils.serialization import ObjectIdStr, doc_to_json
+from app.utils.jwt import invalidate_user
+from app.utils.pagination import fetch_page, approximate_count
+from app.utils.log import get_logger
+
+log = get_logger(__name__)
+
+ASSIGNED_QUESTION_PROJECTION = projection_for(AssignedQuestionOut, extra=("raw_text",))
+ANSWER_SUMMARY_PROJECTION = projection_for(AnswerSummaryOut)
+# Document fields behind each response field, for fields= sparse fieldsets
+ASSIGNED_QUESTION_SOURCES = field_sources(AssignedQuestionOut, {"original_text": ("original_text", "raw_text")})
+ANSWER_SUMMARY_SOURCES = field_sources(AnswerSummaryOut)
+PEER_REVIEW_SOURCES = field_sources(PeerReview)
+# Question fields submit_answer needs for the AI draft and notifications
+ANSWERING_QUESTION_PROJECTION = {
+    "raw_text": 1, "original_text": 1, "cleaned_text": 1, "domain": 1,
+    "assigned_experts": 1, "user_id": 1, "created_by": 1
+}
 
 
 async def get_expert_by_email(email: str) -> Optional[Dict[str, Any]]:
@@ -20,29 +48,43 @@ async def get_expert_by_email(email: str) -> Optional[Dict[str, Any]]:
     Returns the expert document if found and role is 'expert', None otherwise.
     """
     try:
-        expert = await users_collection.find_one({"email": email, "role": "expert"})
-        if expert:
-            expert["id"] = str(expert.pop("_id"))  # Convert ObjectId to string
-        return expert
+        expert = await users_collection.find_one({"email": email, "role": "expert"}, USER_PRIVATE_PROJECTION)
+        return doc_to_json(expert) if expert else None
     except Exception as e:
-        print(f"Error fetching expert by email {email}: {e}")
+        log.error("Error fetching expert by email", error=str(e))
         return None
 
 
-async def get_assigned_questions(expert_id: str) -> List[Dict[str, Any]]:
+async def get_assigned_questions(
+    expert_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
-    Get all questions assigned to an expert.
+    Get a page of the questions assigned to an expert, newest first, as lean dashboard cards.
+    fields (parsed against ASSIGNED_QUESTION_SOURCES) limits the card to those fields.
+    Raises ValueError for a malformed cursor.
     """
+    query = {"assigned_experts": expert_id}
+    projection = sparse_projection(ASSIGNED_QUESTION_SOURCES, fields, ASSIGNED_QUESTION_PROJECTION)
     try:
-        cursor = questions_collection.find({"assigned_experts": expert_id})
+        docs, cursor_out = await fetch_page(questions_collection, query, projection, limit, cursor)
         questions = []
-        async for doc in cursor:
-            doc["id"] = str(doc.pop("_id"))  # Convert ObjectId to string
-            questions.append(doc)
-        return questions
+        for doc in map(doc_to_json, docs):
+            raw_text = doc.pop("raw_text", None)
+            doc["original_text"] = doc.get("original_text") or raw_text
+            questions.append(pick(AssignedQuestionOut(**doc).dict(), fields))
+        page = {"questions": questions, "next_cursor": cursor_out}
+        if include_total:
+            page["total"] = await approximate_count(questions_collection, query)
+        return page
+    except ValueError:
+        raise
     except Exception as e:
-        print(f"Error fetching assigned questions for expert {expert_id}: {e}")
-        return []
+        log.error("Error fetching assigned questions", expert_id=expert_id, error=str(e))
+        return {"questions": [], "next_cursor": None}
 
 
 async def submit_answer(expert_id: str, question_id: str, answer_data: AnswerCreate) -> Optional[Dict[str, Any]]:
@@ -51,94 +93,267 @@ async def submit_answer(expert_id: str, question_id: str, answer_data: AnswerCre
     """
     try:
         # Check if expert is assigned
-        q = await questions_collection.find_one({"_id": ObjectId(question_id), "assigned_experts": expert_id})
+        q = await questions_collection.find_one(
+            {"_id": ObjectId(question_id), "assigned_experts": expert_id}, ANSWERING_QUESTION_PROJECTION
+        )
         if not q:
-            print(f"Expert {expert_id} not assigned to question {question_id}")
+            log.info("Answer rejected, expert not assigned", expert_id=expert_id, question_id=question_id)
             return None
 
+        now = datetime.utcnow()
         answer_dict = answer_data.dict()
         answer_dict.update({
             "question_id": ObjectId(question_id),
-            "expert_id": ObjectId(expert_id)
+            "expert_id": ObjectId(expert_id),
+            "created_at": now,
+            "updated_at": now,
+            "version": 1
         })
 
         # Check for AI draft (with error handling)
         try:
-            print(f"Attempting to generate AI draft for question with text: {(q['cleaned_text'] or q['raw_text'])[:100]}...")
-            ai_draft = await generate_draft_answer(q["cleaned_text"] or q["raw_text"], q.get("domain"))
+            question_text = q.get("cleaned_text") or q.get("raw_text") or q.get("original_text") or ""
+            ai_draft = await generate_draft_answer(question_text, q.get("domain"))
             if ai_draft:
                 answer_dict["ai_draft"] = ai_draft
-                print(f"AI draft generated successfully")
+                log.debug("AI draft generated", question_id=question_id, draft_chars=len(ai_draft))
             else:
-                print(f"AI draft generation returned None")
+                log.debug("AI draft generation returned nothing", question_id=question_id)
         except Exception as draft_e:
-            print(f"AI draft generation failed: {draft_e} - continuing without AI draft")
+            log.warning("AI draft generation failed, continuing without a draft", question_id=question_id, error=str(draft_e))
             # Continue without AI draft - don't fail the entire submission
 
-        print(f"Inserting answer with keys: {list(answer_dict.keys())}")
         result = await answers_collection.insert_one(answer_dict)
-        print(f"Answer inserted successfully with ID: {result.inserted_id}")
 
         # Update question status to 'answered' so other experts can review it
-        await questions_collection.update_one(
-            {"_id": ObjectId(question_id)},
-            {"$set": {"status": "answered"}}
+        await asyncio.gather(
+            set_question_fields(question_id, {"status": "answered"}),
+            touch_question_answers([question_id])
+        )
+        log.info("Answer submitted", answer_id=str(result.inserted_id), question_id=question_id, expert_id=expert_id)
+
+        broker.publish(question_channel(question_id), "answer_submitted", {
+            "answer_id": str(result.inserted_id),
+            "expert_id": expert_id
+        })
+
+        # Tell the farmer and the other assigned experts, who can now review it
+        recipients = [e for e in q.get("assigned_experts", []) if e != expert_id]
+        recipients.append(q.get("user_id") or q.get("created_by"))
+        await notify_users(
+            recipients, "answer_submitted", "New answer submitted",
+            f"A new answer was submitted for: {(q.get('cleaned_text') or q.get('raw_text') or '')[:100]}",
+            question_id=question_id, answer_id=str(result.inserted_id)
         )
-        print(f"Question status updated to 'answered'")
 
-        return {"id": str(result.inserted_id)}
+        return {"id": ObjectIdStr(result.inserted_id)}
     except Exception as e:
-        print(f"Error submitting answer: {e}")
+        log.error("Error submitting answer", question_id=question_id, expert_id=expert_id, error=str(e))
         return None
 
 
-async def get_answers_for_question(question_id: str) -> List[Dict[str, Any]]:
+async def get_answers_for_question(
+    question_id: str,
+    include_draft: bool = True,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
-    Get all answers for a question.
+    Get a page of the answers for a question, oldest first. The AI draft is only read
+    when include_draft is set; fields (parsed against ANSWER_SUMMARY_SOURCES) limits
+    each answer to those fields. Raises ValueError for a malformed cursor.
     """
+    if fields is not None and not include_draft:
+        fields = [name for name in fields if name != "ai_draft"]
     try:
-        cursor = answers_collection.find({"question_id": ObjectId(question_id)})
+        projection = dict(sparse_projection(ANSWER_SUMMARY_SOURCES, fields, ANSWER_SUMMARY_PROJECTION))
+        if not include_draft:
+            projection.pop("ai_draft", None)
+        docs, cursor_out = await fetch_page(
+            answers_collection, {"question_id": ObjectId(question_id)}, projection, limit, cursor, descending=False
+        )
         answers = []
-        async for doc in cursor:
-            doc["id"] = str(doc.pop("_id"))  # Convert ObjectId to string
-            doc["question_id"] = str(doc["question_id"])
-            doc["expert_id"] = str(doc["expert_id"])
-            answers.append(doc)
-        return answers
+        for doc in map(doc_to_json, docs):
+            if fields is not None:
+                # Partial documents skip validation against the full summary model
+                answers.append(pick(doc, fields, AnswerSummaryOut))
+                continue
+            answers.append(AnswerSummaryOut(**doc).dict(exclude=None if include_draft else {"ai_draft"}))
+        return {"answers": answers, "next_cursor": cursor_out}
+    except ValueError:
+        raise
     except Exception as e:
-        print(f"Error fetching answers for question {question_id}: {e}")
-        return []
+        log.error("Error fetching answers", question_id=question_id, error=str(e))
+        return {"answers": [], "next_cursor": None}
+
+
+# Answer counter field moved by each vote type
+VOTE_COUNTER_FIELDS = {"upvote": "upvotes", "downvote": "downvotes"}
+
+
+def _vote_counter_deltas(previous_vote: Optional[str], new_vote: str) -> Dict[str, int]:
+    """
+    Compute the $inc deltas for an answer when a vote changes from previous_vote to new_vote.
+    """
+    if previous_vote == new_vote:
+        return {}
+    deltas = {}
+    if previous_vote in VOTE_COUNTER_FIELDS:
+        deltas[VOTE_COUNTER_FIELDS[previous_vote]] = -1
+    if new_vote in VOTE_COUNTER_FIELDS:
+        deltas[VOTE_COUNTER_FIELDS[new_vote]] = 1
+    return deltas
 
 
 async def vote_on_answer(answer_id: str, expert_id: str, vote_type: str) -> bool:
     """
     Vote on an answer (upvote or downvote). Can change vote.
+    The vote is upserted on its unique (answer_id, expert_id) key and the answer's
+    upvotes/downvotes counters are adjusted by the change, so tallies never need a count.
     """
     try:
-        # Remove existing vote if any
-        await votes_collection.delete_one({"answer_id": ObjectId(answer_id), "expert_id": ObjectId(expert_id)})
+        vote_key = {"answer_id": ObjectId(answer_id), "expert_id": ObjectId(expert_id)}
+        now = datetime.utcnow()
+        vote_update = {
+            "$set": {"vote_type": vote_type, "updated_at": now},
+            "$setOnInsert": {"created_at": now}
+        }
 
-        # Insert new vote
-        vote = Vote(answer_id=ObjectId(answer_id), expert_id=ObjectId(expert_id), vote_type=vote_type)
-        await votes_collection.insert_one(vote.dict(by_alias=True))
+        try:
+            previous = await votes_collection.find_one_and_update(
+                vote_key, vote_update,
+                projection={"_id": 0, "vote_type": 1},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
+            )
+        except DuplicateKeyError:
+            # A concurrent first vote by the same expert won the insert; update that document instead
+            previous = await votes_collection.find_one_and_update(
+                vote_key, vote_update,
+                projection={"_id": 0, "vote_type": 1},
+                return_document=ReturnDocument.BEFORE
+            )
+
+        deltas = _vote_counter_deltas(previous.get("vote_type") if previous else None, vote_type)
+        if deltas:
+            answer = await answers_collection.find_one_and_update(
+                {"_id": vote_key["answer_id"]},
+                {"$inc": {**deltas, "version": 1}, "$set": {"updated_at": now}},
+                projection={"question_id": 1, "upvotes": 1, "downvotes": 1},
+                return_document=ReturnDocument.AFTER
+            )
+            if answer:
+                await touch_question_answers([answer["question_id"]])
+                broker.publish(question_channel(str(answer["question_id"])), "answer_voted", {
+                    "answer_id": answer_id,
+                    "upvotes": answer.get("upvotes", 0),
+                    "downvotes": answer.get("downvotes", 0)
+                })
         return True
     except Exception as e:
-        print(f"Error voting on answer {answer_id}: {e}")
+        log.error("Error voting on answer", answer_id=answer_id, error=str(e))
         return False
 
 
+async def reconcile_vote_counters(answer_ids: Optional[List[str]] = None) -> int:
+    """
+    Recompute answer upvotes/downvotes (from votes) and peer_votes (from peer reviews)
+    and repair any drift. Only answers whose counters still hold the values read here
+    are rewritten, so a vote landing mid-run is left for the next run instead of being
+    overwritten. Returns the number of answers corrected.
+    """
+    vote_match: Dict[str, Any] = {}
+    answer_query: Dict[str, Any] = {}
+    if answer_ids is not None:
+        oids = [ObjectId(a) for a in answer_ids]
+        vote_match = {"answer_id": {"$in": oids}}
+        answer_query = {"_id": {"$in": oids}}
+
+    pipeline = [
+        {"$match": vote_match},
+        {"$group": {
+            "_id": "$answer_id",
+            "upvotes": {"$sum": {"$cond": [{"$eq": ["$vote_type", "upvote"]}, 1, 0]}},
+            "downvotes": {"$sum": {"$cond": [{"$eq": ["$vote_type", "downvote"]}, 1, 0]}}
+        }}
+    ]
+    tallies: Dict[ObjectId, Dict[str, int]] = {}
+    async for doc in votes_collection.aggregate(pipeline):
+        tallies[doc["_id"]] = {"upvotes": doc["upvotes"], "downvotes": doc["downvotes"]}
+
+    peer_pipeline = [
+        {"$match": {**vote_match, "best_answer_vote": True}},
+        {"$group": {"_id": "$answer_id", "peer_votes": {"$sum": 1}}}
+    ]
+    async for doc in peer_reviews_collection.aggregate(peer_pipeline):
+        tallies.setdefault(doc["_id"], {})["peer_votes"] = doc["peer_votes"]
+
+    counter_fields = ("upvotes", "downvotes", "peer_votes")
+    now = datetime.utcnow()
+    ops = []
+    question_ids = set()
+    async for answer in answers_collection.find(answer_query, {"question_id": 1, **{field: 1 for field in counter_fields}}):
+        tally = tallies.get(answer["_id"], {})
+        expected = {field: tally.get(field, 0) for field in counter_fields}
+        if all(answer.get(field, 0) == expected[field] for field in counter_fields):
+            continue
+        current = {field: answer.get(field) for field in counter_fields}
+        ops.append(UpdateOne({"_id": answer["_id"], **current}, {"$set": {**expected, "updated_at": now}, "$inc": {"version": 1}}))
+        question_ids.add(answer.get("question_id"))
+
+    if not ops:
+        return 0
+    result = await answers_collection.bulk_write(ops, ordered=False)
+    await touch_question_answers(question_ids)
+    return result.modified_count
+
+
+async def backfill_peer_review_question_ids() -> int:
+    """
+    Stamp question_id onto peer reviews written before reviews carried it.
+    Returns the number of reviews updated.
+    """
+    answer_ids = await peer_reviews_collection.distinct("answer_id", {"question_id": {"$exists": False}})
+    if not answer_ids:
+        return 0
+
+    ops = []
+    async for answer in answers_collection.find({"_id": {"$in": answer_ids}}, {"question_id": 1}):
+        ops.append(UpdateMany(
+            {"answer_id": answer["_id"], "question_id": {"$exists": False}},
+            {"$set": {"question_id": answer["question_id"]}}
+        ))
+    if not ops:
+        return 0
+    result = await peer_reviews_collection.bulk_write(ops, ordered=False)
+    return result.modified_count
+
+
 async def modify_answer(answer_id: str, expert_id: str, answer_text: str) -> bool:
     """
     Modify expert's own answer.
     """
     try:
-        result = await answers_collection.update_one(
-            {"_id": ObjectId(answer_id), "expert_id": ObjectId(expert_id)},
-            {"$set": {"answer_text": answer_text}}
+        owner = {"_id": ObjectId(answer_id), "expert_id": ObjectId(expert_id)}
+        previous = await answers_collection.find_one_and_update(
+            {**owner, "answer_text": {"$ne": answer_text}},
+            {"$set": {"answer_text": answer_text, "updated_at": datetime.utcnow()}, "$inc": {"version": 1}},
+            projection={"question_id": 1},
+            return_document=ReturnDocument.BEFORE
         )
-        return result.modified_count > 0
+        if not previous:
+            # Unchanged text is a successful no-op: no new version, sync entry or event
+            return await answers_collection.find_one(owner, {"_id": 1}) is not None
+        await touch_question_answers([previous["question_id"]])
+
+        broker.publish(question_channel(str(previous["question_id"])), "answer_modified", {
+            "answer_id": answer_id,
+            "answer_text": answer_text
+        })
+        return True
     except Exception as e:
-        print(f"Error modifying answer {answer_id}: {e}")
+        log.error("Error modifying answer", answer_id=answer_id, error=str(e))
         return False
 
 
@@ -148,7 +363,7 @@ async def request_moderator(question_id: str, expert_id: str) -> bool:
     """
     try:
         # Check if expert is assigned and has answered
-        q = await questions_collection.find_one({"_id": ObjectId(question_id), "assigned_experts": expert_id})
+        q = await questions_collection.find_one({"_id": ObjectId(question_id), "assigned_experts": expert_id}, {"_id": 1})
         if not q:
             return False
 
@@ -157,34 +372,17 @@ async def request_moderator(question_id: str, expert_id: str) -> bool:
             return False
 
         # Update question status or flag (placeholder)
-        await questions_collection.update_one({"_id": ObjectId(question_id)}, {"$set": {"moderator_requested": True}})
+        await set_question_fields(question_id, {"moderator_requested": True})
+        await notify_moderators(
+            "moderator_review_needed", "Moderator review requested",
+            "An expert requested moderator review for a question", question_id=question_id
+        )
         return True
     except Exception as e:
-        print(f"Error requesting moderator for question {question_id}: {e}")
+        log.error("Error requesting moderator", question_id=question_id, error=str(e))
         return False
 
 
-async def get_notifications(expert_id: str) -> List[Dict[str, Any]]:
-    """
-    Get notifications for an expert.
-    """
-    try:
-        cursor = notifications_collection.find({"user_id": ObjectId(expert_id)}).sort("created_at", -1)
-        notifications = []
-        async for doc in cursor:
-            doc["id"] = str(doc.pop("_id"))
-            doc["user_id"] = str(doc["user_id"])
-            if doc.get("question_id"):
-                doc["question_id"] = str(doc["question_id"])
-            if doc.get("answer_id"):
-                doc["answer_id"] = str(doc["answer_id"])
-            notifications.append(doc)
-        return notifications
-    except Exception as e:
-        print(f"Error fetching notifications for expert {expert_id}: {e}")
-        return []
-
-
 async def get_ai_suggestions(answer_text: str, question_text: str) -> List[str]:
     """
     Get AI suggestions for improving the answer.
@@ -197,125 +395,358 @@ async def submit_peer_review(expert_id: str, answer_id: str, review_data: PeerRe
     """
     Submit a peer review for an answer including comment and best answer vote.
     Experts can only review answers to questions they are assigned to, and cannot review their own answers.
+
+    An expert has one best answer vote per question. The vote ledger entry votes.<expert> is
+    the guard for that rule: the review is written first, then the ledger entry is swapped
+    with find_one_and_update, and only the answer the entry pointed at before is cleared.
+    Concurrent votes by one expert are ordered by their ledger swaps, so each clears the
+    answer of the one before it and exactly one best vote is left.
+
+    Commands sent, in order: the aggregation validating the reviewer; the review upsert; the
+    ledger swap (or, when withdrawing, the conditional ledger unset, sent with the counters);
+    the clear of the previous best answer's review, only when the vote moves; then the
+    peer_votes bulk write together with touch_question_answers, which is skipped when no vote
+    moved. That is four commands for a comment edit and six for a moved vote. The counter
+    deltas come from the documents the writes changed, so concurrent or repeated submissions
+    never count a vote twice.
     """
     try:
-        # First, get the answer and check if this expert can review it
-        answer = await answers_collection.find_one({"_id": ObjectId(answer_id)})
-        if not answer:
+        answer_oid = ObjectId(answer_id)
+        expert_oid = ObjectId(expert_id)
+
+        pipeline = [
+            {"$match": {"_id": answer_oid}},
+            {"$project": {"question_id": 1, "expert_id": 1}},
+            {"$lookup": {
+                "from": questions_collection.name,
+                "localField": "question_id",
+                "foreignField": "_id",
+                "pipeline": [
+                    {"$match": {"assigned_experts": expert_id}},
+                    {"$project": {"_id": 1}}
+                ],
+                "as": "assigned"
+            }}
+        ]
+        found = await answers_collection.aggregate(pipeline).to_list(length=1)
+        if not found:
             return None
+        answer = found[0]
 
-        # Check if reviewer is the owner of the answer (experts cannot review their own answers)
-        if str(answer["expert_id"]) == expert_id:
-            return None
-
-        # Check if this expert is assigned to the question
-        question = await questions_collection.find_one({"_id": answer["question_id"], "assigned_experts": expert_id})
-        if not question:
+        # Experts cannot review their own answers, and must be assigned to the question
+        if str(answer["expert_id"]) == expert_id or not answer["assigned"]:
             return None
 
-        # If voting for best answer, ensure this expert hasn't voted for another answer in this question
-        if review_data.best_answer_vote:
-            # Remove any existing best answer vote for this question by this expert
-            await peer_reviews_collection.delete_many({
-                "reviewer_expert_id": ObjectId(expert_id),
-                "answer_id": {"$ne": ObjectId(answer_id)},
-                "best_answer_vote": True
-            })
-
-        # Create the peer review
-        review_dict = review_data.dict()
-        review_dict.update({
-            "answer_id": ObjectId(answer_id),
-            "reviewer_expert_id": ObjectId(expert_id)
-        })
+        question_id = answer["question_id"]
+        now = datetime.utcnow()
+        review_key = {"answer_id": answer_oid, "reviewer_expert_id": expert_oid}
+        new_id = ObjectId()
+        review_update = {
+            "$set": {
+                "question_id": question_id,
+                "best_answer_vote": review_data.best_answer_vote,
+                "comment_text": review_data.comment_text,
+                "updated_at": now
+            },
+            "$setOnInsert": {"_id": new_id, "created_at": now},
+            "$inc": {"version": 1}
+        }
 
-        # Remove existing review for this answer by this expert
-        await peer_reviews_collection.delete_many({
-            "answer_id": ObjectId(answer_id),
-            "reviewer_expert_id": ObjectId(expert_id)
-        })
+        try:
+            own_review = await peer_reviews_collection.find_one_and_update(
+                review_key, review_update,
+                projection={"best_answer_vote": 1, "created_at": 1},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
+            )
+        except DuplicateKeyError:
+            # A concurrent first review by the same expert won the insert; update that document instead
+            own_review = await peer_reviews_collection.find_one_and_update(
+                review_key, review_update,
+                projection={"best_answer_vote": 1, "created_at": 1},
+                return_document=ReturnDocument.BEFORE
+            )
+        if own_review:
+            review_id, created_at = own_review["_id"], own_review.get("created_at", now)
+        else:
+            review_id, created_at = new_id, now
 
-        result = await peer_reviews_collection.insert_one(review_dict)
-        review_id = str(result.inserted_id)
+        ledger_key = f"votes.{expert_id}"
+        previous_best = None
+        ledger_write = None
+        if review_data.best_answer_vote:
+            # Runs after the review upsert, so a later swap always finds this review's vote to clear
+            ledger = await vote_ledger_collection.find_one_and_update(
+                {"_id": question_id},
+                {"$set": {ledger_key: {"answer_id": answer_oid, "review_id": review_id}, "updated_at": now}},
+                projection={ledger_key: 1},
+                upsert=True,
+                return_document=ReturnDocument.BEFORE
+            )
+            previous_entry = ((ledger or {}).get("votes") or {}).get(expert_id)
+            if previous_entry and previous_entry["answer_id"] != answer_oid:
+                # The update only matches while the vote is still set, so only one request takes it back
+                cleared = await peer_reviews_collection.find_one_and_update(
+                    {
+                        "question_id": question_id,
+                        "reviewer_expert_id": expert_oid,
+                        "answer_id": previous_entry["answer_id"],
+                        "best_answer_vote": True
+                    },
+                    {"$set": {"best_answer_vote": False, "updated_at": now}, "$inc": {"version": 1}},
+                    projection={"answer_id": 1}
+                )
+                previous_best = cleared["answer_id"] if cleared else None
+        else:
+            ledger_write = vote_ledger_collection.update_one(
+                {"_id": question_id, f"{ledger_key}.answer_id": answer_oid},
+                {"$unset": {ledger_key: ""}, "$set": {"updated_at": now}}
+            )
 
-        # Update peer_votes count in answer
-        vote_count = await peer_reviews_collection.count_documents({
-            "answer_id": ObjectId(answer_id),
-            "best_answer_vote": True
+        # Move peer_votes counters by the change in best answer votes, and bump reviews_version
+        # on every answer whose reviews changed
+        was_best = bool(own_review and own_review.get("best_answer_vote"))
+        votes_moved = review_data.best_answer_vote != was_best
+        answer_update: Dict[str, Any] = {"$inc": {"reviews_version": 1}}
+        if votes_moved:
+            answer_update["$inc"].update({"peer_votes": 1 if review_data.best_answer_vote else -1, "version": 1})
+            answer_update["$set"] = {"updated_at": now}
+        answer_ops = [UpdateOne({"_id": answer_oid}, answer_update)]
+        if previous_best:
+            votes_moved = True
+            answer_ops.append(UpdateOne(
+                {"_id": previous_best},
+                {"$inc": {"peer_votes": -1, "reviews_version": 1, "version": 1}, "$set": {"updated_at": now}}
+            ))
+
+        writes = [answers_collection.bulk_write(answer_ops, ordered=False)]
+        if ledger_write is not None:
+            writes.append(ledger_write)
+        if votes_moved:
+            writes.append(touch_question_answers([question_id]))
+        await asyncio.gather(*writes)
+
+        broker.publish(question_channel(str(question_id)), "peer_review_submitted", {
+            "answer_id": answer_id,
+            "review_id": str(review_id),
+            "reviewer_expert_id": expert_id,
+            "best_answer_vote": review_data.best_answer_vote,
+            "previous_best_answer_id": str(previous_best) if previous_best else None
         })
-        await answers_collection.update_one(
-            {"_id": ObjectId(answer_id)},
-            {"$set": {"peer_votes": vote_count}}
-        )
 
-        # Store peer review comments in answer document
         review_out = PeerReviewOut(
-            id=review_id,
-            answer_id=str(ObjectId(answer_id)),
+            id=str(review_id),
+            answer_id=answer_id,
             reviewer_expert_id=expert_id,
             best_answer_vote=review_data.best_answer_vote,
             comment_text=review_data.comment_text,
-            created_at=review_dict.get("created_at", None)
+            created_at=created_at
         )
 
-        return {"id": review_id, "review": review_out.dict()}
+        return {"id": ObjectIdStr(review_id), "review": review_out.dict()}
 
     except Exception as e:
-        print(f"Error submitting peer review: {e}")
+        log.error("Error submitting peer review", answer_id=answer_id, error=str(e))
         return None
 
 
-async def get_peer_reviews_for_answer(answer_id: str) -> List[Dict[str, Any]]:
+async def get_peer_reviews_for_answer(
+    answer_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
-    Get all peer reviews for a specific answer.
+    Get a page of the peer reviews for a specific answer, newest first. fields (parsed
+    against PEER_REVIEW_SOURCES) limits each review to those fields.
+    Raises ValueError for a malformed cursor.
     """
     try:
-        cursor = peer_reviews_collection.find({"answer_id": ObjectId(answer_id)}).sort("created_at", -1)
-        reviews = []
-        async for doc in cursor:
-            doc["id"] = str(doc.pop("_id"))
-            doc["answer_id"] = str(doc["answer_id"])
-            doc["reviewer_expert_id"] = str(doc["reviewer_expert_id"])
-            reviews.append(doc)
-        return reviews
+        projection = sparse_projection(PEER_REVIEW_SOURCES, fields)
+        docs, cursor_out = await fetch_page(peer_reviews_collection, {"answer_id": ObjectId(answer_id)}, projection, limit, cursor)
+        return {"reviews": [pick(doc_to_json(doc), fields, PeerReview) for doc in docs], "next_cursor": cursor_out}
+    except ValueError:
+        raise
     except Exception as e:
-        print(f"Error fetching peer reviews for answer {answer_id}: {e}")
-        return []
+        log.error("Error fetching peer reviews", answer_id=answer_id, error=str(e))
+        return {"reviews": [], "next_cursor": None}
+
+
+def _ledger_vote_info(entry: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Shape a vote ledger entry as the best-answer-vote response.
+    """
+    if not entry:
+        return {"has_voted": False, "answer_id": None}
+    return {
+        "has_voted": True,
+        "answer_id": ObjectIdStr(entry["answer_id"]),
+        "review_id": ObjectIdStr(entry["review_id"])
+    }
 
 
 async def get_expert_vote_for_question(question_id: str, expert_id: str) -> Optional[Dict[str, Any]]:
     """
     Check if the expert has voted for best answer in this question and which answer they voted for.
+    Served from the per-question vote ledger with a single _id lookup.
     """
     try:
-        # Find all answers for this question
-        answers_cursor = answers_collection.find({"question_id": ObjectId(question_id)})
-        answer_ids = []
-        async for answer in answers_cursor:
-            answer_ids.append(ObjectId(answer["_id"]))
+        ledger = await vote_ledger_collection.find_one(
+            {"_id": ObjectId(question_id)},
+            {"_id": 0, f"votes.{expert_id}": 1}
+        )
+        entry = (ledger or {}).get("votes", {}).get(expert_id)
+        return _ledger_vote_info(entry)
 
-        if not answer_ids:
-            return None
+    except Exception as e:
+        log.error("Error checking expert vote", question_id=question_id, error=str(e))
+        return None
 
-        # Find if this expert has voted for best answer in any of these answers
-        vote = await peer_reviews_collection.find_one({
-            "answer_id": {"$in": answer_ids},
-            "reviewer_expert_id": ObjectId(expert_id),
-            "best_answer_vote": True
-        })
 
-        if vote:
-            return {
-                "has_voted": True,
-                "answer_id": str(vote["answer_id"]),
-                "review_id": str(vote["_id"])
-            }
+async def get_expert_votes_for_questions(expert_id: str, question_ids: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    Best answer vote status for many questions at once, keyed by question id.
+    Defaults to every question assigned to the expert.
+    """
+    try:
+        if question_ids is None:
+            cursor = questions_collection.find({"assigned_experts": expert_id}, {"_id": 1})
+            oids = [doc["_id"] async for doc in cursor]
         else:
-            return {"has_voted": False, "answer_id": None}
+            oids = [ObjectId(q) for q in question_ids]
+
+        votes = {str(oid): _ledger_vote_info(None) for oid in oids}
+        cursor = vote_ledger_collection.find(
+            {"_id": {"$in": oids}, f"votes.{expert_id}": {"$exists": True}},
+            {f"votes.{expert_id}": 1}
+        )
+        async for ledger in cursor:
+            votes[str(ledger["_id"])] = _ledger_vote_info(ledger["votes"][expert_id])
+        return votes
 
     except Exception as e:
-        print(f"Error checking expert vote for question {question_id}: {e}")
-        return None
+        log.error("Error checking expert votes", expert_id=expert_id, error=str(e))
+        return {}
+
+
+async def _answer_stats(question_oids: List[ObjectId], expert_oid: ObjectId) -> Dict[ObjectId, Dict[str, Any]]:
+    """
+    Answer count and the expert's own answer for each question, in one aggregation.
+    """
+    pipeline = [
+        {"$match": {"question_id": {"$in": question_oids}}},
+        {"$group": {
+            "_id": "$question_id",
+            "answer_count": {"$sum": 1},
+            # null sorts below any document, so $max keeps the expert's answer if there is one
+            "own_answer": {"$max": {"$cond": [
+                {"$eq": ["$expert_id", expert_oid]},
+                {
+                    "id": "$_id",
+                    "answer_text": "$answer_text",
+                    "status": "$status",
+                    "upvotes": {"$ifNull": ["$upvotes", 0]},
+                    "downvotes": {"$ifNull": ["$downvotes", 0]},
+                    "peer_votes": {"$ifNull": ["$peer_votes", 0]},
+                    "created_at": "$created_at"
+                },
+                None
+            ]}}
+        }}
+    ]
+    return {doc["_id"]: doc async for doc in answers_collection.aggregate(pipeline)}
+
+
+async def _review_stats(question_oids: List[ObjectId], expert_oid: ObjectId) -> Dict[ObjectId, Dict[str, Any]]:
+    """
+    Review counts per question and per answer, and how many of them are the expert's,
+    in one aggregation.
+    """
+    pipeline = [
+        {"$match": {"question_id": {"$in": question_oids}}},
+        {"$group": {
+            "_id": {"question_id": "$question_id", "answer_id": "$answer_id"},
+            "reviews": {"$sum": 1},
+            "own_reviews": {"$sum": {"$cond": [{"$eq": ["$reviewer_expert_id", expert_oid]}, 1, 0]}}
+        }}
+    ]
+    stats: Dict[ObjectId, Dict[str, Any]] = {}
+    async for doc in peer_reviews_collection.aggregate(pipeline):
+        entry = stats.setdefault(doc["_id"]["question_id"], {"review_count": 0, "own_review_count": 0, "by_answer": {}})
+        entry["review_count"] += doc["reviews"]
+        entry["own_review_count"] += doc["own_reviews"]
+        entry["by_answer"][doc["_id"]["answer_id"]] = doc["reviews"]
+    return stats
+
+
+async def get_expert_dashboard(
+    expert_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False
+) -> Dict[str, Any]:
+    """
+    A page of the expert's assigned question cards, each with its answer count, the expert's
+    own answer (with its review count), review counts and best answer vote status.
+    Costs one query for the page and three batched queries for the whole page, run
+    concurrently, however many questions it holds. Raises ValueError for a malformed cursor.
+    """
+    page = await get_assigned_questions(expert_id, limit, cursor, include_total)
+    question_ids = [card["id"] for card in page["questions"]]
+    if not question_ids:
+        return page
+
+    try:
+        question_oids = [ObjectId(q) for q in question_ids]
+        expert_oid = ObjectId(expert_id)
+        answer_stats, review_stats, votes = await asyncio.gather(
+            _answer_stats(question_oids, expert_oid),
+            _review_stats(question_oids, expert_oid),
+            get_expert_votes_for_questions(expert_id, question_ids)
+        )
+    except Exception as e:
+        log.error("Error building dashboard", expert_id=expert_id, error=str(e))
+        return page
+
+    for card, oid in zip(page["questions"], question_oids):
+        answers = answer_stats.get(oid, {})
+        reviews = review_stats.get(oid, {"review_count": 0, "own_review_count": 0, "by_answer": {}})
+        own_answer = answers.get("own_answer")
+        if own_answer:
+            own_answer = doc_to_json(own_answer)
+            own_answer["review_count"] = reviews["by_answer"].get(ObjectId(own_answer["id"]), 0)
+        card.update({
+            "answer_count": answers.get("answer_count", 0),
+            "own_answer": own_answer,
+            "review_count": reviews["review_count"],
+            "own_review_count": reviews["own_review_count"],
+            "best_answer_vote": votes.get(card["id"], _ledger_vote_info(None))
+        })
+    return page
+
+
+async def rebuild_vote_ledger() -> None:
+    """
+    Rebuild the per-question vote ledger from the best answer votes in peer_reviews.
+    Every rebuilt entry is stamped with the rebuild's start time; entries older than that
+    were not rebuilt (their votes were all withdrawn) and are removed.
+    """
+    started = datetime.utcnow()
+    pipeline = [
+        {"$match": {"best_answer_vote": True, "question_id": {"$exists": True}}},
+        {"$group": {
+            "_id": "$question_id",
+            "votes": {"$push": {
+                "k": {"$toString": "$reviewer_expert_id"},
+                "v": {"answer_id": "$answer_id", "review_id": "$_id"}
+            }}
+        }},
+        {"$project": {"votes": {"$arrayToObject": "$votes"}, "updated_at": {"$literal": started}}},
+        {"$merge": {"into": vote_ledger_collection.name, "whenMatched": "replace", "whenNotMatched": "insert"}}
+    ]
+    await peer_reviews_collection.aggregate(pipeline).to_list(length=None)
+    # Live writes during the rebuild stamp a later updated_at, so they are kept
+    await vote_ledger_collection.delete_many({"updated_at": {"$not": {"$gte": started}}})
 
 
 async def update_expert_scores_after_revote(answer_id: ObjectId) -> bool:
@@ -325,11 +756,11 @@ async def update_expert_scores_after_revote(answer_id: ObjectId) -> bool:
     """
     try:
         # Get the answer and question
-        answer = await answers_collection.find_one({"_id": answer_id})
+        answer = await answers_collection.find_one({"_id": answer_id}, {"question_id": 1, "expert_id": 1})
         if not answer:
             return False
 
-        question = await questions_collection.find_one({"_id": answer["question_id"]})
+        question = await questions_collection.find_one({"_id": answer["question_id"]}, {"assigned_experts": 1})
         if not question:
             return False
 
@@ -361,9 +792,10 @@ async def update_expert_scores_after_revote(answer_id: ObjectId) -> bool:
                 {"_id": ObjectId(expert_id)},
                 {"$set": {"score": performance_score}}
             )
+            invalidate_user(expert_id)
 
         return True
 
     except Exception as e:
-        print(f"Error updating expert scores: {e}")
+        log.error("Error updating expert scores", error=str(e))
         return False
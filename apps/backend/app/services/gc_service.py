@@ -0,0 +1,236 @@
+"""
+GC Service
+Removes the documents that hang off a deleted question: answers, their votes and peer
+reviews, notifications, the best answer vote ledger and the stored embedding.
+
+Deletes run in bounded batches: each batch selects at most GC_BATCH_SIZE ids, removes them
+with one delete_many on _id, then pauses GC_BATCH_PAUSE_MS so a large cascade never
+monopolises the primary. sweep_orphans() finds children whose parent no longer exists
+(left by deletes that predate the cascade, or interrupted cascades) and removes them the
+same way. Both report the documents and BSON bytes reclaimed per collection.
+
+There is no persisted work queue in this app (the AI pipeline runs as a request
+background task), so there are no queue entries to clean up.
+"""
+
+import asyncio
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from bson import ObjectId
+from pymongo import UpdateOne
+
+from app.config import settings
+from app.utils.log import get_logger
+from app.utils.db import (
+    answers_collection, votes_collection, peer_reviews_collection, notifications_collection,
+    notification_counters_collection, vote_ledger_collection, question_embeddings_collection, get_collection
+)
+
+log = get_logger(__name__)
+
+# Most recent orphan sweep report, served by /api/moderator/system/gc
+last_sweep: Optional[Dict[str, Any]] = None
+
+
+class ReclaimReport:
+    """
+    Documents and BSON bytes removed per collection.
+    """
+
+    def __init__(self):
+        self.documents: Dict[str, int] = defaultdict(int)
+        self.bytes: Dict[str, int] = defaultdict(int)
+        self.started_at = datetime.utcnow()
+
+    def add(self, collection_name: str, documents: int, size: int) -> None:
+        self.documents[collection_name] += documents
+        self.bytes[collection_name] += size
+
+    def dict(self) -> Dict[str, Any]:
+        return {
+            "started_at": self.started_at,
+            "finished_at": datetime.utcnow(),
+            "collections": {
+                name: {"documents": self.documents[name], "bytes": self.bytes[name]}
+                for name in self.documents
+            },
+            "documents": sum(self.documents.values()),
+            "bytes": sum(self.bytes.values())
+        }
+
+
+async def _throttle() -> None:
+    await asyncio.sleep(settings.GC_BATCH_PAUSE_MS / 1000)
+
+
+async def _delete_batch(collection, docs: List[Dict[str, Any]], report: ReclaimReport) -> int:
+    """
+    Delete one batch of {_id, size} documents and record what was reclaimed.
+    """
+    if not docs:
+        return 0
+    result = await collection.delete_many({"_id": {"$in": [doc["_id"] for doc in docs]}})
+    report.add(collection.name, result.deleted_count, sum(doc.get("size", 0) for doc in docs))
+    return result.deleted_count
+
+
+async def _sized_batch(collection, query: Dict[str, Any], extra: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """
+    Select up to GC_BATCH_SIZE documents matching query as {_id, size, **extra}.
+    """
+    pipeline = [
+        {"$match": query},
+        {"$limit": settings.GC_BATCH_SIZE},
+        {"$project": {"_id": 1, "size": {"$bsonSize": "$$ROOT"}, **(extra or {})}}
+    ]
+    return await collection.aggregate(pipeline).to_list(length=settings.GC_BATCH_SIZE)
+
+
+async def delete_in_batches(collection, query: Dict[str, Any], report: ReclaimReport) -> int:
+    """
+    Delete every document matching query, GC_BATCH_SIZE at a time with a pause in between.
+    Returns the number of documents deleted.
+    """
+    deleted = 0
+    while True:
+        batch = await _sized_batch(collection, query)
+        if not batch:
+            return deleted
+        deleted += await _delete_batch(collection, batch, report)
+        if len(batch) < settings.GC_BATCH_SIZE:
+            return deleted
+        await _throttle()
+
+
+async def _delete_notifications(docs: List[Dict[str, Any]], report: ReclaimReport) -> None:
+    """
+    Delete a batch of notifications and take their unread ones off the owners' counters.
+    """
+    await _delete_batch(notifications_collection, docs, report)
+    unread: Dict[ObjectId, int] = defaultdict(int)
+    for doc in docs:
+        if not doc.get("read"):
+            unread[doc["user_id"]] += 1
+    if unread:
+        await notification_counters_collection.bulk_write([
+            UpdateOne({"_id": user_id}, {"$inc": {"unread": -count}}) for user_id, count in unread.items()
+        ], ordered=False)
+
+
+async def _delete_notifications_in_batches(query: Dict[str, Any], report: ReclaimReport) -> None:
+    while True:
+        batch = await _sized_batch(notifications_collection, query, {"user_id": 1, "read": 1})
+        if not batch:
+            return
+        await _delete_notifications(batch, report)
+        if len(batch) < settings.GC_BATCH_SIZE:
+            return
+        await _throttle()
+
+
+async def cascade_delete_question(question_id: str) -> Dict[str, Any]:
+    """
+    Delete everything that belongs to an already deleted question. Answers are removed
+    last, after their votes and reviews, so an interrupted run leaves nothing unreachable
+    for the next sweep. Returns the reclaim report.
+    """
+    report = ReclaimReport()
+    question_oid = ObjectId(question_id)
+    try:
+        while True:
+            answers = await _sized_batch(answers_collection, {"question_id": question_oid})
+            if not answers:
+                break
+            answer_ids = [answer["_id"] for answer in answers]
+            await delete_in_batches(votes_collection, {"answer_id": {"$in": answer_ids}}, report)
+            await delete_in_batches(peer_reviews_collection, {"answer_id": {"$in": answer_ids}}, report)
+            await _delete_batch(answers_collection, answers, report)
+            await _throttle()
+
+        await delete_in_batches(peer_reviews_collection, {"question_id": question_oid}, report)
+        await _delete_notifications_in_batches({"question_id": question_oid}, report)
+        await delete_in_batches(vote_ledger_collection, {"_id": question_oid}, report)
+        await delete_in_batches(question_embeddings_collection, {"_id": question_oid}, report)
+    except Exception as e:
+        log.error("Cascade delete failed", question_id=question_id, error=str(e))
+
+    result = report.dict()
+    log.info("Cascade delete reclaimed space", question_id=question_id, documents=result["documents"], bytes=result["bytes"])
+    return result
+
+
+# (child collection, reference field, parent collections); a child is an orphan when no
+# parent collection holds its reference. Parents are swept before their children, and
+# archived questions still count as parents (see archive_service).
+QUESTION_PARENTS = ("questions", "questions_archive")
+ORPHAN_REFERENCES = [
+    ("answers", "question_id", QUESTION_PARENTS),
+    ("votes", "answer_id", ("answers",)),
+    ("peer_reviews", "answer_id", ("answers",)),
+    ("notifications", "question_id", QUESTION_PARENTS),
+    ("question_vote_ledger", "_id", QUESTION_PARENTS),
+    ("question_embeddings", "_id", QUESTION_PARENTS),
+]
+
+
+async def sweep_orphans() -> Dict[str, Any]:
+    """
+    Delete children whose parent document no longer exists, in throttled batches.
+    Stores and returns the reclaim report.
+    """
+    global last_sweep
+    report = ReclaimReport()
+    for child_name, field, parent_names in ORPHAN_REFERENCES:
+        child = get_collection(child_name)
+        extra = {"user_id": 1, "read": 1} if child_name == "notifications" else {}
+        pipeline: List[Dict[str, Any]] = [{"$match": {field: {"$ne": None}}}]
+        for parent_name in parent_names:
+            pipeline += [
+                {"$lookup": {"from": parent_name, "localField": field, "foreignField": "_id", "as": "_parent",
+                             "pipeline": [{"$project": {"_id": 1}}]}},
+                {"$match": {"_parent": {"$size": 0}}},
+            ]
+        # Only orphans are sized, once the lookup result is dropped again
+        pipeline += [
+            {"$unset": "_parent"},
+            {"$project": {"_id": 1, "size": {"$bsonSize": "$$ROOT"}, **extra}},
+        ]
+        try:
+            batch: List[Dict[str, Any]] = []
+            async for doc in child.aggregate(pipeline):
+                batch.append(doc)
+                if len(batch) >= settings.GC_BATCH_SIZE:
+                    await _delete_sweep_batch(child, batch, report)
+                    batch = []
+                    await _throttle()
+            await _delete_sweep_batch(child, batch, report)
+        except Exception as e:
+            log.error("Orphan sweep failed", collection=child_name, error=str(e))
+
+    last_sweep = report.dict()
+    return last_sweep
+
+
+async def _delete_sweep_batch(collection, batch: List[Dict[str, Any]], report: ReclaimReport) -> None:
+    if collection.name == "notifications":
+        await _delete_notifications(batch, report)
+    else:
+        await _delete_batch(collection, batch, report)
+
+
+async def orphan_sweep_loop(interval_seconds: int) -> None:
+    """
+    Run sweep_orphans() every interval_seconds.
+    """
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            report = await sweep_orphans()
+            if report["documents"]:
+                log.info("Orphan sweep reclaimed space", documents=report["documents"], bytes=report["bytes"])
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error("Orphan sweep failed", error=str(e))
@@ -0,0 +1,152 @@
+"""
+Notification Service
+Writes notifications with batched fan-out and serves them with keyset pagination.
+Each user's unread count is kept in notification_counters and moved with $inc, so
+the unread badge is a single _id lookup. New notifications are also pushed live on
+the user's realtime channel, using the notification id as the resumable event id.
+"""
+
+from datetime import datetime
+from typing import Optional, Dict, Any, List, Iterable
+from bson import ObjectId
+from pymongo import UpdateOne
+from app.utils.db import notifications_collection, notification_counters_collection, users_collection
+from app.utils.pagination import fetch_page, MAX_PAGE_SIZE
+from app.utils.log import get_logger
+from app.utils.serialization import doc_to_json
+from app.services.realtime_service import broker, user_channel
+
+log = get_logger(__name__)
+
+
+async def notify_users(
+    user_ids: Iterable[str],
+    type: str,
+    title: str,
+    message: str,
+    question_id: Optional[str] = None,
+    answer_id: Optional[str] = None
+) -> int:
+    """
+    Send one notification to each user with a single insert_many and bump their unread counters.
+    Failures are logged and never raised, so notifying cannot break the calling write path.
+    Returns the number of notifications written.
+    """
+    recipients = list(dict.fromkeys(u for u in user_ids if u and ObjectId.is_valid(u)))
+    if not recipients:
+        return 0
+
+    try:
+        now = datetime.utcnow()
+        docs = [{
+            "user_id": ObjectId(user_id),
+            "type": type,
+            "title": title,
+            "message": message,
+            "question_id": ObjectId(question_id) if question_id else None,
+            "answer_id": ObjectId(answer_id) if answer_id else None,
+            "read": False,
+            "created_at": now,
+            "updated_at": now
+        } for user_id in recipients]
+        await notifications_collection.insert_many(docs, ordered=False)
+
+        await notification_counters_collection.bulk_write([
+            UpdateOne({"_id": doc["user_id"]}, {"$inc": {"unread": 1}}, upsert=True) for doc in docs
+        ], ordered=False)
+
+        for doc in docs:
+            notification_id = str(doc["_id"])
+            broker.publish(
+                user_channel(str(doc["user_id"])), "notification",
+                doc_to_json(doc), event_id=notification_id
+            )
+        return len(docs)
+    except Exception as e:
+        log.error("Error sending notifications", type=type, error=str(e))
+        return 0
+
+
+async def notify_moderators(type: str, title: str, message: str, question_id: Optional[str] = None) -> int:
+    """
+    Send a notification to every moderator.
+    """
+    cursor = users_collection.find({"role": "moderator"}, {"_id": 1})
+    moderator_ids = [str(doc["_id"]) async for doc in cursor]
+    return await notify_users(moderator_ids, type, title, message, question_id=question_id)
+
+
+async def get_notifications(user_id: str, limit: int = 20, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Get a page of a user's notifications, newest first.
+    Raises ValueError for a malformed cursor.
+    """
+    docs, cursor_out = await fetch_page(notifications_collection, {"user_id": ObjectId(user_id)}, None, limit, cursor)
+    return {
+        "notifications": [doc_to_json(doc) for doc in docs],
+        "next_cursor": cursor_out
+    }
+
+
+async def replay_notifications(user_id: str, last_event_id: Optional[str]) -> List[Dict[str, Any]]:
+    """
+    Notification events written after last_event_id, oldest first, for a reconnecting stream.
+    At most one page is replayed; if more were missed a resync event tells the client to
+    reload the paginated list instead.
+    """
+    if not last_event_id or not ObjectId.is_valid(last_event_id):
+        return []
+
+    query = {"user_id": ObjectId(user_id), "_id": {"$gt": ObjectId(last_event_id)}}
+    docs = await notifications_collection.find(query).sort("_id", 1).limit(MAX_PAGE_SIZE + 1).to_list(length=MAX_PAGE_SIZE + 1)
+    channel = user_channel(user_id)
+    if len(docs) > MAX_PAGE_SIZE:
+        return [{"id": str(docs[-1]["_id"]), "channel": channel, "type": "resync", "data": {}}]
+    return [
+        {"id": str(doc["_id"]), "channel": channel, "type": "notification", "data": doc_to_json(doc)}
+        for doc in docs
+    ]
+
+
+async def get_unread_count(user_id: str) -> int:
+    counter = await notification_counters_collection.find_one({"_id": ObjectId(user_id)}, {"unread": 1})
+    return max(0, counter["unread"]) if counter else 0
+
+
+async def mark_read(user_id: str, notification_ids: Optional[List[str]] = None) -> int:
+    """
+    Mark the given notifications (or all of them) as read.
+    Returns the number of notifications that changed from unread to read.
+    """
+    query: Dict[str, Any] = {"user_id": ObjectId(user_id), "read": False}
+    if notification_ids is not None:
+        query["_id"] = {"$in": [ObjectId(n) for n in notification_ids]}
+
+    result = await notifications_collection.update_many(query, {"$set": {"read": True, "updated_at": datetime.utcnow()}})
+    if result.modified_count:
+        await notification_counters_collection.update_one(
+            {"_id": ObjectId(user_id)}, {"$inc": {"unread": -result.modified_count}}
+        )
+    return result.modified_count
+
+
+async def reconcile_unread_counters() -> int:
+    """
+    Recompute every unread counter from the notifications collection.
+    Returns the number of users with unread notifications.
+    """
+    pipeline = [
+        {"$match": {"read": False}},
+        {"$group": {"_id": "$user_id", "unread": {"$sum": 1}}}
+    ]
+    tallies = {doc["_id"]: doc["unread"] async for doc in notifications_collection.aggregate(pipeline)}
+
+    await notification_counters_collection.update_many(
+        {"_id": {"$nin": list(tallies)}}, {"$set": {"unread": 0}}
+    )
+    if tallies:
+        await notification_counters_collection.bulk_write([
+            UpdateOne({"_id": user_id}, {"$set": {"unread": unread}}, upsert=True)
+            for user_id, unread in tallies.items()
+        ], ordered=False)
+    return len(tallies)
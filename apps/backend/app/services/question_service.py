@@ -1,10 +1,14 @@
 # app/services/question_service.py
+import asyncio
 from typing import Optional, Dict
 from datetime import datetime
 from bson import ObjectId
-from app.utils.db import questions_collection
+from pymongo import ReturnDocument
+from app.utils.db import questions_collection, question_embeddings_collection
+from app.services.analytics_service import record_question_rollup, ROLLUP_FIELDS
+from app.services.archive_service import restore_question
 
-from app.models.question import QuestionOut
+from app.models.question import QuestionOut, QUESTION_DETAIL_PROJECTION
 
 async def create_question(user_id: Optional[str], text: str, metadata: Optional[Dict] = None) -> str:
     """
@@ -12,6 +16,7 @@ async def create_question(user_id: Optional[str], text: str, metadata: Optional[
     """
     if metadata is None:
         metadata = {}
+    now = datetime.utcnow()
 
     doc = {
         "user_id": user_id,
@@ -22,22 +27,32 @@ async def create_question(user_id: Optional[str], text: str, metadata: Optional[
         "assigned_experts": [],
         "duplicate_of": None,
         "metadata": metadata,
-        "created_at": datetime.utcnow()
+        "created_at": now,
+        "updated_at": now,
+        "version": 1
     }
 
     result = await questions_collection.insert_one(doc)
+    await record_question_rollup(None, doc)
     return str(result.inserted_id)
 
 
-async def get_question_by_id(question_id: str) -> Optional[QuestionOut]:
+async def get_question_by_id(question_id: str, projection: Optional[Dict] = None) -> Optional[QuestionOut]:
     """
-    Fetch question by ID and return as QuestionOut.
+    Fetch question by ID and return as QuestionOut. A narrower projection leaves the
+    fields it skips at their defaults.
     """
     from app.models.question import AIMetadata, AIPipelineStatus, QuestionStatus
 
-    doc = await questions_collection.find_one({"_id": ObjectId(question_id)})
+    projection = projection or QUESTION_DETAIL_PROJECTION
+    doc = await questions_collection.find_one({"_id": ObjectId(question_id)}, projection)
     if not doc:
-        return None
+        # Archived questions are restored on first access
+        if not await restore_question(question_id):
+            return None
+        doc = await questions_collection.find_one({"_id": ObjectId(question_id)}, projection)
+        if not doc:
+            return None
 
     return QuestionOut(
         id=str(doc["_id"]),
@@ -54,15 +69,56 @@ async def get_question_by_id(question_id: str) -> Optional[QuestionOut]:
     )
 
 
-async def update_question(question_id: str, updates: Dict) -> bool:
+async def set_question_fields(question_id: str, updates: Dict) -> Optional[Dict]:
     """
-    Update question fields. Returns True if modified.
+    $set fields on a question, bumping its version and updated_at and moving it between
+    analytics rollup buckets when its status or domain changes. Every question write
+    should go through here.
+    Returns the previous values of the updated fields (and of status, domain and created_at),
+    or None if the question does not exist.
     """
-    result = await questions_collection.update_one(
+    before = await questions_collection.find_one_and_update(
         {"_id": ObjectId(question_id)},
-        {"$set": updates}
+        {"$set": {**updates, "updated_at": datetime.utcnow()}, "$inc": {"version": 1}},
+        projection={**ROLLUP_FIELDS, **{field: 1 for field in updates}},
+        return_document=ReturnDocument.BEFORE
     )
-    return result.modified_count > 0
+    if before and ("status" in updates or "domain" in updates):
+        after = dict(before)
+        after.update({field: updates[field] for field in ("status", "domain") if field in updates})
+        # The embedding carries the domain and duplicate flag that duplicate detection filters
+        # on; it is only written when one of them actually changes
+        new = {field: getattr(value, "value", value) for field, value in updates.items()}
+        embedding_fields = {}
+        if "domain" in new and new["domain"] != before.get("domain"):
+            embedding_fields["domain"] = new["domain"]
+        if "status" in new and (new["status"] == "duplicate") != (before.get("status") == "duplicate"):
+            embedding_fields["is_duplicate"] = new["status"] == "duplicate"
+        writes = [record_question_rollup(before, after)]
+        if embedding_fields:
+            writes.append(question_embeddings_collection.update_one({"_id": before["_id"]}, {"$set": embedding_fields}))
+        await asyncio.gather(*writes)
+    return before
+
+
+async def update_question(question_id: str, updates: Dict) -> bool:
+    """
+    Update question fields. Returns True if modified.
+    """
+    before = await set_question_fields(question_id, updates)
+    if before is None:
+        return False
+    return any(before.get(field) != getattr(value, "value", value) for field, value in updates.items())
+
+
+async def touch_question_answers(question_ids) -> None:
+    """
+    Bump answers_version on questions whose answers changed, invalidating the ETags of
+    their answer lists.
+    """
+    ids = [ObjectId(qid) for qid in question_ids if qid]
+    if ids:
+        await questions_collection.update_many({"_id": {"$in": ids}}, {"$inc": {"answers_version": 1}})
 
 
 # # backend/app/models/question.py
@@ -0,0 +1,276 @@
+"""
+Realtime Service
+In-process pub/sub for pushing compact deltas to subscribed clients over SSE.
+Channels are plain strings such as "question:<id>" or "user:<id>".
+
+Cross-worker fan-out goes through a pluggable transport chosen by REALTIME_TRANSPORT:
+"memory" (none, single worker), "local" (in-process stand-in linking brokers, for
+benchmarks and tests) or "mongo" (a capped collection that every worker tails).
+"""
+
+import asyncio
+import os
+import time
+from collections import defaultdict, deque
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Deque, Dict, List, Optional, Set
+
+from bson import ObjectId
+from pymongo import CursorType
+
+from app.config import settings
+from app.utils.log import get_logger
+from app.utils.db import db
+from app.utils.serialization import dumps
+
+log = get_logger(__name__)
+
+# Seconds between keep-alive comments on idle streams
+HEARTBEAT_SECONDS = 15
+
+
+def question_channel(question_id: str) -> str:
+    return f"question:{question_id}"
+
+
+def user_channel(user_id: str) -> str:
+    return f"user:{user_id}"
+
+
+class Transport:
+    """
+    Cross-worker transport interface. send() ships an event published on this worker;
+    the transport hands events from other workers to broker.deliver().
+    """
+
+    async def start(self, broker: "EventBroker") -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+    async def send(self, event: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+
+class LocalTransport(Transport):
+    """
+    In-process stand-in for a cross-worker transport: every broker started on the
+    same instance receives the others' events, as separate workers would.
+    """
+
+    def __init__(self):
+        self._brokers: List["EventBroker"] = []
+
+    async def start(self, broker: "EventBroker") -> None:
+        self._brokers.append(broker)
+
+    async def stop(self) -> None:
+        self._brokers.clear()
+
+    async def send(self, event: Dict[str, Any]) -> None:
+        for broker in self._brokers:
+            if broker.worker_id != event["origin"]:
+                broker.deliver(event)
+
+
+class MongoCappedTransport(Transport):
+    """
+    Cross-worker fan-out through a tailable cursor on a capped collection.
+    """
+
+    def __init__(self, collection_name: str = "realtime_events", size_bytes: int = 16 * 1024 * 1024):
+        self.collection_name = collection_name
+        self.size_bytes = size_bytes
+        self._tail_task: Optional[asyncio.Task] = None
+
+    @property
+    def collection(self):
+        return db[self.collection_name]
+
+    async def start(self, broker: "EventBroker") -> None:
+        if self.collection_name not in await db.list_collection_names():
+            try:
+                await db.create_collection(self.collection_name, capped=True, size=self.size_bytes)
+            except Exception:
+                # Another worker created it first
+                pass
+        self._tail_task = asyncio.create_task(self._tail(broker))
+
+    async def stop(self) -> None:
+        if self._tail_task:
+            self._tail_task.cancel()
+            self._tail_task = None
+
+    async def send(self, event: Dict[str, Any]) -> None:
+        await self.collection.insert_one(dict(event, _id=ObjectId(event["id"])))
+
+    async def _tail(self, broker: "EventBroker") -> None:
+        # Start after the newest existing event; the capped collection keeps insertion order
+        last = await self.collection.find_one({}, {"_id": 1}, sort=[("$natural", -1)])
+        last_id = last["_id"] if last else ObjectId.from_datetime(datetime.utcnow())
+        while True:
+            try:
+                cursor = self.collection.find({"_id": {"$gt": last_id}}, cursor_type=CursorType.TAILABLE_AWAIT)
+                while cursor.alive:
+                    async for doc in cursor:
+                        last_id = doc.pop("_id")
+                        if doc.get("origin") != broker.worker_id:
+                            broker.deliver(doc)
+                    await asyncio.sleep(0.1)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                log.warning("Realtime transport tail error", error=str(e), rate_limit=1)
+            await asyncio.sleep(1)
+
+
+class EventBroker:
+    """
+    Per-channel fan-out to bounded subscriber queues, with connection and latency metrics.
+    A slow subscriber loses its oldest queued events rather than blocking publishers.
+    """
+
+    def __init__(self, queue_size: int = 100, transport: Optional[Transport] = None):
+        self.queue_size = queue_size
+        self.transport = transport
+        self.worker_id = f"{os.getpid()}-{ObjectId()}"
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = defaultdict(set)
+        self._pending: Set[asyncio.Task] = set()
+        self._latencies_ms: Deque[float] = deque(maxlen=1000)
+        self.connections = 0
+        self.peak_connections = 0
+        self.published = 0
+        self.delivered = 0
+        self.dropped = 0
+
+    async def start(self) -> None:
+        if self.transport:
+            await self.transport.start(self)
+
+    async def stop(self) -> None:
+        if self.transport:
+            await self.transport.stop()
+
+    def subscribe(self, channel: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        self._subscribers[channel].add(queue)
+        self.connections += 1
+        self.peak_connections = max(self.peak_connections, self.connections)
+        return queue
+
+    def unsubscribe(self, channel: str, queue: asyncio.Queue) -> None:
+        subscribers = self._subscribers.get(channel)
+        if subscribers and queue in subscribers:
+            subscribers.discard(queue)
+            self.connections -= 1
+            if not subscribers:
+                del self._subscribers[channel]
+
+    def publish(self, channel: str, event_type: str, data: Dict[str, Any], event_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Deliver an event to local subscribers and hand it to the transport without waiting.
+        event_id defaults to a fresh ObjectId; pass the stored document's id for resumable channels.
+        """
+        event = {
+            "id": event_id or str(ObjectId()),
+            "channel": channel,
+            "type": event_type,
+            "data": data,
+            "ts": time.time(),
+            "origin": self.worker_id
+        }
+        self.published += 1
+        self.deliver(event)
+        if self.transport:
+            task = asyncio.create_task(self._send(event))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+        return event
+
+    def deliver(self, event: Dict[str, Any]) -> None:
+        for queue in self._subscribers.get(event["channel"], ()):
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(event)
+
+    async def _send(self, event: Dict[str, Any]) -> None:
+        try:
+            await self.transport.send(event)
+        except Exception as e:
+            log.warning("Realtime transport send failed", channel=event["channel"], error=str(e), rate_limit=1)
+
+    def record_delivery(self, event: Dict[str, Any]) -> None:
+        self.delivered += 1
+        self._latencies_ms.append((time.time() - event["ts"]) * 1000)
+
+    def metrics(self) -> Dict[str, Any]:
+        latencies = sorted(self._latencies_ms)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 3)
+
+        return {
+            "transport": type(self.transport).__name__ if self.transport else "memory",
+            "connections": self.connections,
+            "peak_connections": self.peak_connections,
+            "channels": len(self._subscribers),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": self.dropped,
+            "fanout_latency_ms": {"p50": percentile(0.5), "p99": percentile(0.99), "samples": len(latencies)}
+        }
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    payload = dumps(event["data"]).decode("utf-8")
+    return f"id: {event['id']}\nevent: {event['type']}\ndata: {payload}\n\n"
+
+
+async def sse_stream(
+    channel: str,
+    request,
+    replay: Optional[Callable[[], Awaitable[List[Dict[str, Any]]]]] = None
+) -> AsyncIterator[str]:
+    """
+    Stream a channel as Server-Sent Events until the client disconnects.
+    replay, if given, returns events missed while disconnected; it runs after subscribing
+    so nothing published in between is lost, and live duplicates of replayed events are skipped.
+    """
+    queue = broker.subscribe(channel)
+    try:
+        yield ": connected\n\n"
+        replayed: Set[str] = set()
+        if replay:
+            for event in await replay():
+                replayed.add(event["id"])
+                yield format_sse(event)
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if await request.is_disconnected():
+                    break
+                yield ": ping\n\n"
+                continue
+            if event["id"] in replayed:
+                continue
+            broker.record_delivery(event)
+            yield format_sse(event)
+    finally:
+        broker.unsubscribe(channel, queue)
+
+
+TRANSPORTS: Dict[str, Callable[[], Optional[Transport]]] = {
+    "memory": lambda: None,
+    "local": LocalTransport,
+    "mongo": MongoCappedTransport,
+}
+
+broker = EventBroker(
+    queue_size=settings.REALTIME_QUEUE_SIZE,
+    transport=TRANSPORTS.get(settings.REALTIME_TRANSPORT, TRANSPORTS["memory"])()
+)
@@ -0,0 +1,157 @@
+"""
+Sync Service
+Delta sync for the expert workspace. A sync token records when the previous sync ran;
+GET /api/expert/sync?since=<token> returns only the assigned questions, their answers and
+peer reviews, and the expert's notifications whose updated_at is at or after it, plus
+tombstones for questions that left the live collections (deleted or archived). Dropping a
+tombstoned question also drops its answers, reviews and notifications on the client.
+
+Every write path stamps updated_at, and tokens overlap the previous sync by
+SYNC_OVERLAP_SECONDS so writes still in flight while it ran are picked up; clients upsert
+by id, so items seen twice are harmless. Without a token, or with one older than the
+tombstone retention, a full snapshot is returned with full=true and the client replaces
+its workspace.
+"""
+
+import base64
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from bson import ObjectId
+
+from app.config import settings
+from app.models.answer import AnswerSummaryOut
+from app.models.question import AssignedQuestionOut
+from app.utils.db import (
+    questions_collection, answers_collection, peer_reviews_collection,
+    notifications_collection, sync_tombstones_collection
+)
+from app.utils.log import get_logger
+from app.utils.projection import projection_for
+from app.utils.serialization import ObjectIdStr, doc_to_json
+
+log = get_logger(__name__)
+
+SYNC_QUESTION_PROJECTION = projection_for(AssignedQuestionOut, extra=("raw_text", "updated_at"))
+# AI drafts are left to the answers endpoint
+SYNC_ANSWER_PROJECTION = {**projection_for(AnswerSummaryOut, exclude=("id", "ai_draft")), "updated_at": 1}
+SYNC_REVIEW_PROJECTION = {
+    "answer_id": 1, "question_id": 1, "reviewer_expert_id": 1, "best_answer_vote": 1,
+    "comment_text": 1, "created_at": 1, "updated_at": 1
+}
+SYNC_NOTIFICATION_PROJECTION = {
+    "type": 1, "title": 1, "message": 1, "question_id": 1, "answer_id": 1,
+    "read": 1, "created_at": 1, "updated_at": 1
+}
+# Notifications sent in a full snapshot
+SNAPSHOT_NOTIFICATIONS = 50
+
+
+def encode_sync_token(at: datetime) -> str:
+    return base64.urlsafe_b64encode(f"sync|{at.isoformat()}".encode()).decode().rstrip("=")
+
+
+def decode_sync_token(token: str) -> datetime:
+    """
+    Decode a sync token. Raises ValueError if the token is malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        kind, at = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        if kind != "sync":
+            raise ValueError
+        return datetime.fromisoformat(at)
+    except Exception:
+        raise ValueError("Invalid sync token")
+
+
+async def record_question_tombstones(questions: Iterable[Dict[str, Any]], reason: str) -> int:
+    """
+    Record that questions left the live collections, for the experts they were assigned to.
+    Failures are logged and never raised, so the removal itself is never undone.
+    Returns the number of tombstones written.
+    """
+    now = datetime.utcnow()
+    docs = [{
+        "kind": "question",
+        "doc_id": question["_id"],
+        "user_ids": list(question.get("assigned_experts") or []),
+        "reason": reason,
+        "removed_at": now
+    } for question in questions if question.get("assigned_experts")]
+    if not docs:
+        return 0
+    try:
+        await sync_tombstones_collection.insert_many(docs, ordered=False)
+        return len(docs)
+    except Exception as e:
+        log.error("Error recording sync tombstones", reason=reason, error=str(e))
+        return 0
+
+
+def _changed(query: Dict[str, Any], since: Optional[datetime]) -> Dict[str, Any]:
+    return {**query, "updated_at": {"$gte": since}} if since else query
+
+
+async def _questions(expert_id: str, since: Optional[datetime]) -> List[Dict[str, Any]]:
+    docs = await questions_collection.find(_changed({"assigned_experts": expert_id}, since), SYNC_QUESTION_PROJECTION).to_list(length=None)
+    questions = []
+    for doc in map(doc_to_json, docs):
+        raw_text = doc.pop("raw_text", None)
+        doc["original_text"] = doc.get("original_text") or raw_text
+        questions.append(doc)
+    return questions
+
+
+async def _assigned_question_ids(expert_id: str) -> List[ObjectId]:
+    return [doc["_id"] async for doc in questions_collection.find({"assigned_experts": expert_id}, {"_id": 1})]
+
+
+async def get_expert_sync(expert_id: str, since_token: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Everything in the expert's workspace that changed since since_token (or all of it),
+    and the token for the next sync. Raises ValueError for a malformed token.
+    """
+    since = decode_sync_token(since_token) if since_token else None
+    started = datetime.utcnow()
+    if since and since < started - timedelta(days=settings.SYNC_TOMBSTONE_TTL_DAYS):
+        # Tombstones this old may have expired; start over
+        since = None
+
+    question_ids = await _assigned_question_ids(expert_id)
+    questions = await _questions(expert_id, since)
+    answers = await answers_collection.find(
+        _changed({"question_id": {"$in": question_ids}}, since), SYNC_ANSWER_PROJECTION
+    ).to_list(length=None)
+    reviews = await peer_reviews_collection.find(
+        _changed({"question_id": {"$in": question_ids}}, since), SYNC_REVIEW_PROJECTION
+    ).to_list(length=None)
+
+    expert_oid = ObjectId(expert_id)
+    if since:
+        notifications = await notifications_collection.find(
+            {"user_id": expert_oid, "updated_at": {"$gte": since}}, SYNC_NOTIFICATION_PROJECTION
+        ).to_list(length=None)
+        tombstones = [{
+            "kind": doc["kind"],
+            "id": ObjectIdStr(doc["doc_id"]),
+            "reason": doc.get("reason"),
+            "removed_at": doc["removed_at"]
+        } async for doc in sync_tombstones_collection.find(
+            {"user_ids": expert_id, "removed_at": {"$gte": since}}, {"kind": 1, "doc_id": 1, "reason": 1, "removed_at": 1}
+        )]
+    else:
+        notifications = await notifications_collection.find(
+            {"user_id": expert_oid}, SYNC_NOTIFICATION_PROJECTION
+        ).sort([("created_at", -1), ("_id", -1)]).limit(SNAPSHOT_NOTIFICATIONS).to_list(length=SNAPSHOT_NOTIFICATIONS)
+        tombstones = []
+
+    return {
+        "full": since is None,
+        "questions": questions,
+        "answers": [doc_to_json(doc) for doc in answers],
+        "reviews": [doc_to_json(doc) for doc in reviews],
+        "notifications": [doc_to_json(doc) for doc in notifications],
+        "tombstones": tombstones,
+        "next_token": encode_sync_token(started - timedelta(seconds=settings.SYNC_OVERLAP_SECONDS))
+    }
@@ -1,49 +1,249 @@
-# database.py
-# Sets up the MongoDB async client using Motor
+# app/utils/db.py
+# Sets up the MongoDB async client using Motor.
+#
+# The client is created by connect_to_mongo() in the app lifespan (with pool tuning,
+# compression and warm-up), or lazily on first use by scripts. Module-level collection
+# handles forward to the live client, so `from app.utils.db import questions_collection`
+# works everywhere regardless of when the client was created.
 
-# from motor.motor_asyncio import AsyncIOMotorClient
-# from app.config import settings
+import asyncio
+import threading
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
 
-# class Database:
-#     client: AsyncIOMotorClient = None
-#     db = None
+from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import monitoring, ReadPreference
+from app.config import settings
+from app.utils.profiling import command_profiler
+from app.utils.log import get_logger
 
-# db_instance = Database()
+log = get_logger(__name__)
 
 
-# async def connect_to_mongo():
-#     """
-#     Initialize the MongoDB client at startup.
-#     """
-#     db_instance.client = AsyncIOMotorClient(settings.MONGODB_URL)
-#     db_instance.db = db_instance.client[settings.DATABASE_NAME]
-#     print("🌿 MongoDB connection established.")
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    Connection pool listener recording how long operations wait to check out a connection.
+    """
 
+    def __init__(self):
+        self._local = threading.local()
+        self._waits_ms: Deque[float] = deque(maxlen=1000)
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.connections_created = 0
+        self.connections_closed = 0
 
-# async def close_mongo_connection():
-#     """
-#     Close the MongoDB client on app shutdown.
-#     """
-#     db_instance.client.close()
-#     print("🍂 MongoDB connection closed.")
+    def _record_wait(self, event) -> None:
+        duration = getattr(event, "duration", None)
+        if duration is not None:
+            self._waits_ms.append(duration * 1000)
+        elif getattr(self._local, "started", None) is not None:
+            self._waits_ms.append((time.perf_counter() - self._local.started) * 1000)
+        self._local.started = None
+
+    def connection_check_out_started(self, event):
+        self._local.started = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        self._record_wait(event)
+        self.checkouts += 1
+        self.in_use += 1
+        self.peak_in_use = max(self.peak_in_use, self.in_use)
+
+    def connection_check_out_failed(self, event):
+        self._record_wait(event)
+        self.checkout_failures += 1
+
+    def connection_checked_in(self, event):
+        self.in_use -= 1
+
+    def connection_created(self, event):
+        self.connections_created += 1
+
+    def connection_closed(self, event):
+        self.connections_closed += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_cleared(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def metrics(self) -> Dict[str, Any]:
+        waits = sorted(self._waits_ms)
+
+        def percentile(p: float) -> Optional[float]:
+            if not waits:
+                return None
+            return round(waits[min(len(waits) - 1, int(p * len(waits)))], 3)
+
+        return {
+            "max_pool_size": settings.MONGO_MAX_POOL_SIZE,
+            "checkouts": self.checkouts,
+            "checkout_failures": self.checkout_failures,
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "connections_created": self.connections_created,
+            "connections_closed": self.connections_closed,
+            "wait_ms": {"p50": percentile(0.5), "p99": percentile(0.99), "max": round(waits[-1], 3) if waits else None}
+        }
+
+
+class Database:
+    client: Optional[AsyncIOMotorClient] = None
+    db = None
+    ready: bool = False
+    collections: Dict[str, Any] = {}
+
+
+db_instance = Database()
+pool_metrics = PoolMetrics()
+
+READ_PREFERENCES = {
+    "primary": ReadPreference.PRIMARY,
+    "primaryPreferred": ReadPreference.PRIMARY_PREFERRED,
+    "secondary": ReadPreference.SECONDARY,
+    "secondaryPreferred": ReadPreference.SECONDARY_PREFERRED,
+    "nearest": ReadPreference.NEAREST,
+}
+
+# Named read routes; writes and read-your-writes paths stay on "primary"
+READ_ROUTES = {
+    "primary": "primary",
+    "analytics": settings.MONGO_READ_ANALYTICS,
+    "listing": settings.MONGO_READ_LISTING,
+}
+
+
+def _create_client() -> AsyncIOMotorClient:
+    options: Dict[str, Any] = {
+        "maxPoolSize": settings.MONGO_MAX_POOL_SIZE,
+        "minPoolSize": settings.MONGO_MIN_POOL_SIZE,
+        "maxIdleTimeMS": settings.MONGO_MAX_IDLE_TIME_MS,
+        "connectTimeoutMS": settings.MONGO_CONNECT_TIMEOUT_MS,
+        "serverSelectionTimeoutMS": settings.MONGO_SERVER_SELECTION_TIMEOUT_MS,
+        "waitQueueTimeoutMS": settings.MONGO_WAIT_QUEUE_TIMEOUT_MS,
+        "appname": "agrivote-backend",
+        "event_listeners": [pool_metrics, command_profiler],
+    }
+    if settings.MONGO_SOCKET_TIMEOUT_MS:
+        options["socketTimeoutMS"] = settings.MONGO_SOCKET_TIMEOUT_MS
+    if settings.MONGO_COMPRESSORS:
+        options["compressors"] = settings.MONGO_COMPRESSORS
+    return AsyncIOMotorClient(settings.MONGODB_URL, **options)
+
+
+def get_client() -> AsyncIOMotorClient:
+    if db_instance.client is None:
+        db_instance.client = _create_client()
+        db_instance.db = db_instance.client[settings.DATABASE_NAME]
+        db_instance.collections = {}
+    return db_instance.client
+
+
+def get_database():
+    get_client()
+    return db_instance.db
+
+
+def get_collection(name: str, route: str = "primary"):
+    """
+    Collection handle for the named read route (see READ_ROUTES).
+    """
+    key = f"{name}:{route}"
+    collection = db_instance.collections.get(key)
+    if collection is None:
+        database = get_database()
+        if route == "primary":
+            collection = database[name]
+        else:
+            collection = database.get_collection(name, read_preference=READ_PREFERENCES[READ_ROUTES[route]])
+        db_instance.collections[key] = collection
+    return collection
+
+
+async def connect_to_mongo():
+    """
+    Initialize the MongoDB client at startup and warm the pool before serving requests.
+    """
+    get_client()
+    # Concurrent pings open up to MONGO_MIN_POOL_SIZE connections up front
+    warm = max(1, settings.MONGO_MIN_POOL_SIZE)
+    await asyncio.gather(*(db_instance.client.admin.command("ping") for _ in range(warm)))
+    db_instance.ready = True
+    log.info("MongoDB connection established")
+
+
+async def close_mongo_connection():
+    """
+    Close the MongoDB client on app shutdown.
+    """
+    db_instance.ready = False
+    if db_instance.client is not None:
+        db_instance.client.close()
+        db_instance.client = None
+        db_instance.db = None
+        db_instance.collections = {}
+    log.info("MongoDB connection closed")
+
+
+class _LazyCollection:
+    """Module-level collection handle that forwards to the live client's collection."""
+
+    def __init__(self, name: str):
+        self._name = name
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    def __getattr__(self, attr):
+        return getattr(get_collection(self._name), attr)
+
+
+class _LazyDatabase:
+    """Module-level database handle that forwards to the live client's database."""
+
+    def __getattr__(self, attr):
+        return getattr(get_database(), attr)
+
+    def __getitem__(self, name: str):
+        return get_collection(name)
 
-# # app/utils/db.py
-from motor.motor_asyncio import AsyncIOMotorClient
-from motor.motor_asyncio import AsyncIOMotorClient
-from app.config import settings
 
-client = AsyncIOMotorClient(settings.MONGODB_URL)
-db = client[settings.DATABASE_NAME]
+db = _LazyDatabase()
 
-# Collections (create names once; indexes can be added later)
-users_collection = db["users"]
-questions_collection = db["questions"]
-answers_collection = db["answers"]
-votes_collection = db["votes"]
-workflows_collection = db["workflows"]
-notifications_collection = db["notifications"]
-peer_reviews_collection = db["peer_reviews"]
+# Collections (indexes are declared in app/utils/indexes.py)
+users_collection = _LazyCollection("users")
+questions_collection = _LazyCollection("questions")
+answers_collection = _LazyCollection("answers")
+votes_collection = _LazyCollection("votes")
+workflows_collection = _LazyCollection("workflows")
+notifications_collection = _LazyCollection("notifications")
+# user_id -> unread notification count, maintained by notification_service
+notification_counters_collection = _LazyCollection("notification_counters")
+peer_reviews_collection = _LazyCollection("peer_reviews")
+# question_id -> {reviewer_expert_id -> best answer vote}, maintained by submit_peer_review
+vote_ledger_collection = _LazyCollection("question_vote_ledger")
+# question_id -> packed embedding + domain, kept out of question documents
+question_embeddings_collection = _LazyCollection("question_embeddings")
+# (created day | all-time) x status x domain question counts, maintained by analytics_service
+question_rollups_collection = _LazyCollection("question_rollups")
+# Questions removed from experts' workspaces, read by delta sync; expire after SYNC_TOMBSTONE_TTL_DAYS
+sync_tombstones_collection = _LazyCollection("sync_tombstones")
 
 
 def get_question_collection():
-    return db["questions"]
+    return get_collection("questions")
@@ -0,0 +1,67 @@
+# app/utils/etag.py
+"""
+ETag helpers for conditional GETs.
+
+Documents carry a version counter that every write path increments: questions.version,
+answers.version and peer_reviews.version for the documents themselves, plus
+questions.answers_version (any answer of the question changed) and answers.reviews_version
+(any review of the answer changed) for the lists served under them. An ETag is derived from
+the relevant counter and the request's query parameters, so checking If-None-Match costs a
+single projected _id lookup.
+
+Read the version before reading the data: a write landing in between then yields a
+response tagged with the older version, which the next poll simply refreshes.
+"""
+
+import hashlib
+from typing import Any, Optional
+
+from bson import ObjectId
+from fastapi import Response
+
+
+def make_etag(*parts: Any) -> str:
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()[:20]
+    return f'W/"{digest}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Weak comparison of an If-None-Match header against etag.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    bare = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == bare:
+            return True
+    return False
+
+
+async def version_etag(collection, doc_id: str, field: str = "version", *extra: Any) -> Optional[str]:
+    """
+    ETag for a document's version counter (a missing counter counts as 0), or None if the
+    document does not exist.
+    """
+    if not ObjectId.is_valid(doc_id):
+        return None
+    doc = await collection.find_one({"_id": ObjectId(doc_id)}, {field: 1})
+    if not doc:
+        return None
+    return make_etag(collection.name, doc_id, field, doc.get(field, 0), *extra)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
+
+def with_etag(response: Response, etag: Optional[str]) -> Response:
+    if etag:
+        response.headers["ETag"] = etag
+        response.headers["Cache-Control"] = "no-cache"
+    return response
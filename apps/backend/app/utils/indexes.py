@@ -0,0 +1,118 @@
+# app/utils/indexes.py
+"""
+Declared MongoDB indexes. Every hot service query should be served by one of these;
+tests/test_query_plans.py fails if any of them falls back to a COLLSCAN.
+
+apply_indexes() is idempotent: indexes that already exist with the same definition
+are left alone. It runs at startup and from manage_indexes.py.
+"""
+
+from typing import Dict, List
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from app.config import settings
+from app.utils.db import db
+from app.utils.log import get_logger
+
+log = get_logger(__name__)
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("email", ASCENDING)], unique=True, name="email_unique"),
+        # Expert allocation by domain, moderator fan-out by role
+        IndexModel([("role", ASCENDING), ("domain", ASCENDING)], name="role_domain"),
+    ],
+    "questions": [
+        # Keyset-paginated expert dashboards: questions assigned to an expert, newest first
+        IndexModel([("assigned_experts", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="assigned_created_id"),
+        # Keyset-paginated moderator review lists filtered by status, newest first
+        IndexModel([("status", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="status_created_id"),
+        # Unfiltered review lists and recent-activity counts
+        IndexModel([("created_at", DESCENDING), ("_id", DESCENDING)], name="created_id"),
+        # Duplicate detection candidates within a domain
+        IndexModel([("domain", ASCENDING), ("status", ASCENDING)], name="domain_status"),
+        # Delta sync: an expert's assigned questions changed since a token
+        IndexModel([("assigned_experts", ASCENDING), ("updated_at", ASCENDING)], name="assigned_updated"),
+    ],
+    "answers": [
+        IndexModel([("question_id", ASCENDING), ("expert_id", ASCENDING)], name="question_expert"),
+        # Keyset-paginated answers of a question, oldest first
+        IndexModel([("question_id", ASCENDING), ("created_at", ASCENDING), ("_id", ASCENDING)], name="question_created_id"),
+        # Delta sync: answers of the assigned questions changed since a token
+        IndexModel([("question_id", ASCENDING), ("updated_at", ASCENDING)], name="question_updated"),
+    ],
+    "votes": [
+        # One vote per expert per answer; vote_on_answer upserts on this key
+        IndexModel([("answer_id", ASCENDING), ("expert_id", ASCENDING)], unique=True, name="answer_expert_unique"),
+    ],
+    "peer_reviews": [
+        # One review per expert per answer; submit_peer_review upserts on this key
+        IndexModel([("answer_id", ASCENDING), ("reviewer_expert_id", ASCENDING)], unique=True, name="answer_reviewer_unique"),
+        # Keyset-paginated reviews of an answer, newest first
+        IndexModel([("answer_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="answer_created_id"),
+        # A reviewer's reviews within one question, read when moving the best answer vote
+        IndexModel([("question_id", ASCENDING), ("reviewer_expert_id", ASCENDING)], name="question_reviewer"),
+        # Delta sync: reviews in the assigned questions changed since a token
+        IndexModel([("question_id", ASCENDING), ("updated_at", ASCENDING)], name="question_updated"),
+    ],
+    "question_embeddings": [
+        # Duplicate detection candidates within a domain
+        IndexModel([("domain", ASCENDING), ("is_duplicate", ASCENDING)], name="domain_duplicate"),
+    ],
+    "question_rollups": [
+        # Dashboard reads: all-time buckets (day = None) and recent daily buckets
+        IndexModel([("day", ASCENDING)], name="day"),
+    ],
+    # Archives: restore_question() reads a question's family back by these keys
+    "answers_archive": [
+        IndexModel([("question_id", ASCENDING)], name="question_id"),
+    ],
+    "votes_archive": [
+        IndexModel([("answer_id", ASCENDING)], name="answer_id"),
+    ],
+    "peer_reviews_archive": [
+        IndexModel([("question_id", ASCENDING)], name="question_id"),
+        IndexModel([("answer_id", ASCENDING)], name="answer_id"),
+    ],
+    "notifications": [
+        # Keyset-paginated notification reads, newest first
+        IndexModel([("user_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)], name="user_created_at"),
+        # Cascade deletes and orphan sweeps by question
+        IndexModel([("question_id", ASCENDING)], name="question_id"),
+        # Delta sync: a user's notifications created or read since a token
+        IndexModel([("user_id", ASCENDING), ("updated_at", ASCENDING)], name="user_updated"),
+    ],
+    "sync_tombstones": [
+        IndexModel([("user_ids", ASCENDING), ("removed_at", ASCENDING)], name="user_removed"),
+        IndexModel([("removed_at", ASCENDING)], expireAfterSeconds=settings.SYNC_TOMBSTONE_TTL_DAYS * 86400, name="removed_at_ttl"),
+    ],
+}
+
+
+async def apply_indexes() -> Dict[str, List[str]]:
+    """
+    Create every declared index. A failure on one collection (e.g. duplicates blocking a
+    unique index) is reported and does not stop the others.
+    Returns the index names created or confirmed per collection.
+    """
+    applied: Dict[str, List[str]] = {}
+    for collection_name, models in INDEXES.items():
+        try:
+            applied[collection_name] = await db[collection_name].create_indexes(models)
+        except Exception as e:
+            log.error("Index creation failed", collection=collection_name, error=str(e))
+            applied[collection_name] = []
+    return applied
+
+
+async def undeclared_indexes() -> Dict[str, List[str]]:
+    """
+    Indexes present in the database but not declared here (other than _id).
+    """
+    extra: Dict[str, List[str]] = {}
+    for collection_name, models in INDEXES.items():
+        declared = {model.document["name"] for model in models} | {"_id_"}
+        existing = await db[collection_name].index_information()
+        names = [name for name in existing if name not in declared]
+        if names:
+            extra[collection_name] = names
+    return extra
@@ -1,15 +1,28 @@
 # app/utils/jwt.py
+#
+# Token issuing and the authenticated-principal lookup shared by every route dependency.
+# Verified token claims and user documents are cached per worker (AUTH_CACHE_TTL_SECONDS),
+# so an authenticated request normally costs neither a signature check nor a users query.
+# Call invalidate_user() after changing a user's role or profile.
+
+import time
 from datetime import datetime, timedelta
-from typing import Optional
+from typing import Any, Dict, Optional
 from jose import jwt, JWTError
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from app.config import settings
+from app.utils.cache import TTLCache
 from app.utils.db import users_collection
 from bson import ObjectId
+from app.models.user import USER_PRIVATE_PROJECTION
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
+# token -> verified claims, and user_id -> user document (without private fields)
+token_cache = TTLCache(ttl=settings.AUTH_CACHE_TTL_SECONDS, maxsize=settings.AUTH_CACHE_SIZE)
+user_cache = TTLCache(ttl=settings.AUTH_CACHE_TTL_SECONDS, maxsize=settings.AUTH_CACHE_SIZE)
+
 def create_access_token(data: dict, expires_minutes: Optional[int] = None) -> str:
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=(expires_minutes or settings.ACCESS_TOKEN_EXPIRE_MINUTES))
@@ -24,16 +37,77 @@ async def decode_token(token: str) -> Optional[dict]:
     except JWTError:
         return None
 
+async def verify_token(token: str) -> Optional[dict]:
+    """
+    Decode a token, reusing the claims of a recently verified identical token.
+    Claims are never cached past the token's expiry.
+    """
+    claims = token_cache.get(token)
+    if claims is None:
+        claims = await decode_token(token)
+        if not claims:
+            return None
+        ttl = settings.AUTH_CACHE_TTL_SECONDS
+        if claims.get("exp"):
+            ttl = min(ttl, claims["exp"] - time.time())
+        if ttl > 0:
+            token_cache.set(token, claims, ttl)
+    return dict(claims)
+
+async def get_user(user_id: str) -> Optional[Dict[str, Any]]:
+    """
+    User document without private fields, from the cache or the users collection.
+    """
+    user = user_cache.get(user_id)
+    if user is None:
+        if not ObjectId.is_valid(user_id):
+            return None
+        user = await users_collection.find_one({"_id": ObjectId(user_id)}, USER_PRIVATE_PROJECTION)
+        if not user:
+            return None
+        # Convert _id to string for convenience
+        user["id"] = str(user["_id"])
+        user_cache.set(user_id, user)
+    return dict(user)
+
+def invalidate_user(user_id: str) -> None:
+    """
+    Drop a cached user after a role or profile change. Other workers pick the change
+    up when their entry expires.
+    """
+    user_cache.invalidate(str(user_id))
+
+def bearer_token(authorization: Optional[str]) -> Optional[str]:
+    if not authorization:
+        return None
+    parts = authorization.split()
+    if len(parts) != 2 or parts[0].lower() != "bearer":
+        return None
+    return parts[1]
+
+async def get_principal(token: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Resolve a token to {"user_id", "role", "claims", "user"}, or None if the token is
+    invalid or its user no longer exists. The role comes from the user document, so
+    role changes apply without waiting for the token to expire.
+    """
+    if not token:
+        return None
+    claims = await verify_token(token)
+    if not claims or not claims.get("user_id"):
+        return None
+    user = await get_user(claims["user_id"])
+    if not user:
+        return None
+    return {
+        "user_id": claims["user_id"],
+        "role": user.get("role") or claims.get("role"),
+        "claims": claims,
+        "user": user
+    }
+
 async def get_current_user(token: str = Depends(oauth2_scheme)):
-    payload = await decode_token(token)
-    if not payload:
+    principal = await get_principal(token)
+    if not principal:
         raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid authentication credentials")
-    user_id = payload.get("user_id")
-    if not user_id:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid token payload")
-    user = await users_collection.find_one({"_id": ObjectId(user_id)})
-    if not user:
-        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="User not found")
-    # Convert _id to string for convenience
-    user["id"] = str(user["_id"])
-    return user
\ No newline at end of file
+    return principal["user"]
\ No newline at end of file
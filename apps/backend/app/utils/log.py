@@ -0,0 +1,187 @@
+# app/utils/log.py
+"""
+Structured, non-blocking logging.
+
+get_logger(__name__) returns a logger whose calls take structured fields as keyword
+arguments:
+
+    log.info("Answer submitted", answer_id=answer_id, expert_id=expert_id)
+
+Records are put on a bounded queue by the calling thread and written to stdout by a
+background listener thread, so the event loop never waits on a stdout write; when the
+queue is full, records are dropped and counted rather than blocking. The level comes from
+settings.LOG_LEVEL and the output format from settings.LOG_FORMAT ("json" lines or
+"text"). Debug calls below the level cost a level check and nothing else.
+
+High-volume events pass rate_limit=N to emit at most N records per second per message;
+the next emitted record reports how many were suppressed.
+"""
+
+import atexit
+import logging
+import queue
+import sys
+import threading
+import time
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional, Tuple
+
+from app.config import settings
+
+_RESERVED = {"exc_info", "stack_info", "stacklevel"}
+
+_listener: Optional[QueueListener] = None
+_setup_lock = threading.Lock()
+
+
+class JSONFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        from app.utils.serialization import dumps
+
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname.lower(),
+            "logger": record.name,
+            "msg": record.getMessage()
+        }
+        entry.update(getattr(record, "fields", None) or {})
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return dumps(entry).decode("utf-8")
+
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s: %(message)s")
+
+    def formatMessage(self, record: logging.LogRecord) -> str:
+        line = super().formatMessage(record)
+        fields = getattr(record, "fields", None)
+        if fields:
+            line += " " + " ".join(f"{key}={value}" for key, value in fields.items())
+        return line
+
+
+class DroppingQueueHandler(QueueHandler):
+    """
+    QueueHandler that drops records instead of blocking or raising when the queue is full.
+    """
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve the message now and drop references the listener thread must not touch
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def setup_logging() -> None:
+    """
+    Route the "app" logger through the queue to stdout. Idempotent; called by get_logger().
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            return
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(JSONFormatter() if settings.LOG_FORMAT == "json" else TextFormatter())
+        handler = DroppingQueueHandler(queue.Queue(maxsize=settings.LOG_QUEUE_SIZE))
+
+        root = logging.getLogger("app")
+        root.setLevel(settings.LOG_LEVEL.upper())
+        root.addHandler(handler)
+        root.propagate = False
+
+        _listener = QueueListener(handler.queue, stream, respect_handler_level=False)
+        _listener.start()
+        atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """
+    Flush queued records and stop the listener thread.
+    """
+    global _listener
+    with _setup_lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def dropped_records() -> int:
+    return sum(getattr(h, "dropped", 0) for h in logging.getLogger("app").handlers)
+
+
+class StructuredLogger(logging.LoggerAdapter):
+    """
+    Logger adapter taking structured fields as keyword arguments, with optional per-message
+    rate limiting (rate_limit=records per second).
+    """
+
+    def __init__(self, logger: logging.Logger):
+        super().__init__(logger, {})
+        # message -> (window start, emitted in window, suppressed since last emit)
+        self._windows: Dict[str, Tuple[float, int, int]] = {}
+
+    def _allow(self, msg: str, rate_limit: float) -> Optional[int]:
+        """
+        Returns None to suppress the record, otherwise how many were suppressed before it.
+        """
+        now = time.monotonic()
+        start, emitted, suppressed = self._windows.get(msg, (now, 0, 0))
+        if now - start >= 1.0:
+            start, emitted = now, 0
+        if emitted >= rate_limit:
+            self._windows[msg] = (start, emitted, suppressed + 1)
+            return None
+        self._windows[msg] = (start, emitted + 1, 0)
+        return suppressed
+
+    def log(self, level: int, msg: Any, *args: Any, **kwargs: Any) -> None:
+        if not self.isEnabledFor(level):
+            return
+        rate_limit = kwargs.pop("rate_limit", None)
+        extra = kwargs.pop("extra", None) or {}
+        fields = {key: kwargs.pop(key) for key in list(kwargs) if key not in _RESERVED}
+        if rate_limit is not None:
+            suppressed = self._allow(str(msg), rate_limit)
+            if suppressed is None:
+                return
+            if suppressed:
+                fields["suppressed"] = suppressed
+        self.logger.log(level, msg, *args, extra={**extra, "fields": fields}, **kwargs)
+
+    def debug(self, msg: Any, *args: Any, **kwargs: Any) -> None:
+        self.log(logging.DEBUG, msg, *args, **kwargs)
+
+    def info(self, msg: Any, *args: Any, **kwargs: Any) -> None:
+        self.log(logging.INFO, msg, *args, **kwargs)
+
+    def warning(self, msg: Any, *args: Any, **kwargs: Any) -> None:
+        self.log(logging.WARNING, msg, *args, **kwargs)
+
+    def error(self, msg: Any, *args: Any, **kwargs: Any) -> None:
+        self.log(logging.ERROR, msg, *args, **kwargs)
+
+    def exception(self, msg: Any, *args: Any, exc_info: Any = True, **kwargs: Any) -> None:
+        self.log(logging.ERROR, msg, *args, exc_info=exc_info, **kwargs)
+
+
+def get_logger(name: str) -> StructuredLogger:
+    setup_logging()
+    return StructuredLogger(logging.getLogger(name if name.startswith("app") else f"app.{name}"))
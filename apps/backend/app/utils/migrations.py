@@ -0,0 +1,59 @@
+# app/utils/migrations.py
+"""
+Data migrations run once per database at startup, before /ready reports the app ready.
+
+Each migration is recorded in the migrations collection when it finishes, so later starts
+skip it. Migrations must be safe to repeat: two workers starting together may both run one.
+"""
+
+from datetime import datetime
+from typing import Awaitable, Callable, Dict, List, Tuple
+
+from app.utils.db import db
+from app.utils.log import get_logger
+from app.utils.pagination import backfill_created_at
+
+log = get_logger(__name__)
+
+MIGRATIONS_COLLECTION = "migrations"
+
+
+async def _peer_review_question_ids() -> int:
+    from app.services.expert_service import backfill_peer_review_question_ids
+    return await backfill_peer_review_question_ids()
+
+
+async def _created_at() -> int:
+    changed = 0
+    for name in ("questions", "answers", "peer_reviews", "notifications"):
+        changed += await backfill_created_at(db[name])
+    return changed
+
+
+# (name, migration returning the number of documents changed), in the order they run
+MIGRATIONS: List[Tuple[str, Callable[[], Awaitable[int]]]] = [
+    ("peer_review_question_ids", _peer_review_question_ids),
+    ("created_at", _created_at),
+]
+
+
+async def run_migrations() -> Dict[str, int]:
+    """
+    Run the migrations not yet recorded as applied. Failures are raised, so startup retries.
+    Returns the number of documents changed per migration run.
+    """
+    collection = db[MIGRATIONS_COLLECTION]
+    applied = {doc["_id"] async for doc in collection.find({}, {"_id": 1})}
+    results: Dict[str, int] = {}
+    for name, migration in MIGRATIONS:
+        if name in applied:
+            continue
+        changed = await migration()
+        await collection.update_one(
+            {"_id": name},
+            {"$set": {"applied_at": datetime.utcnow(), "changed": changed}},
+            upsert=True
+        )
+        log.info("Migration applied", migration=name, changed=changed)
+        results[name] = changed
+    return results
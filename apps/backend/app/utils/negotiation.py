@@ -0,0 +1,113 @@
+# app/utils/negotiation.py
+"""
+MessagePack content negotiation for the farmer and expert routers.
+
+Routers built with route_class=NegotiatedRoute accept request bodies sent as
+application/msgpack and, when the client's Accept header asks for it, re-encode their
+JSON responses as MessagePack (see serialization.packb: ObjectIds as 12 raw bytes,
+datetimes as msgpack timestamps). Everything else, including error bodies and SSE
+streams, stays JSON.
+"""
+
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Request, Response
+from fastapi.routing import APIRoute
+
+from app.utils.profiling import profile_span
+from app.utils.response import FastJSONResponse
+from app.utils.serialization import dumps, msgpack, packb, unpackb
+
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+MSGPACK_MEDIA_TYPES = {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+
+
+def _media_type(content_type: Optional[str]) -> str:
+    return (content_type or "").split(";")[0].strip().lower()
+
+
+def is_msgpack(content_type: Optional[str]) -> bool:
+    return _media_type(content_type) in MSGPACK_MEDIA_TYPES
+
+
+def wants_msgpack(accept: Optional[str]) -> bool:
+    """
+    Whether an Accept header prefers MessagePack over JSON.
+    """
+    if msgpack is None or not accept:
+        return False
+    msgpack_q = json_q = 0.0
+    for part in accept.split(","):
+        media_type, _, params = part.strip().partition(";")
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        media_type = media_type.strip().lower()
+        if media_type in MSGPACK_MEDIA_TYPES:
+            msgpack_q = max(msgpack_q, q)
+        elif media_type == "application/json":
+            json_q = max(json_q, q)
+    return msgpack_q > 0 and msgpack_q >= json_q
+
+
+class MsgPackResponse(Response):
+    media_type = MSGPACK_MEDIA_TYPE
+
+    def render(self, content) -> bytes:
+        with profile_span("serialization"):
+            return packb(content)
+
+
+async def _as_json_request(request: Request) -> Request:
+    """
+    Re-present a MessagePack request as the equivalent JSON request, so FastAPI's body
+    parsing and validation run unchanged.
+    """
+    if msgpack is None:
+        raise HTTPException(status_code=415, detail="MessagePack is not supported by this server")
+    packed = await request.body()
+    if not packed:
+        return request
+    try:
+        body = dumps(unpackb(packed))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    headers = [
+        (key, value) for key, value in request.scope["headers"]
+        if key not in (b"content-type", b"content-length")
+    ]
+    headers += [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    json_request = Request({**request.scope, "headers": headers}, request.receive)
+    json_request._body = body
+    return json_request
+
+
+def _as_msgpack_response(response: FastJSONResponse) -> MsgPackResponse:
+    out = MsgPackResponse(response.payload, status_code=response.status_code, background=response.background)
+    out.raw_headers.extend(
+        (key, value) for key, value in response.raw_headers
+        if key not in (b"content-type", b"content-length")
+    )
+    return out
+
+
+class NegotiatedRoute(APIRoute):
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def negotiated_handler(request: Request) -> Response:
+            if is_msgpack(request.headers.get("content-type")):
+                request = await _as_json_request(request)
+            response = await handler(request)
+            if isinstance(response, FastJSONResponse):
+                if wants_msgpack(request.headers.get("accept")):
+                    response = _as_msgpack_response(response)
+                response.headers.add_vary_header("Accept")
+            return response
+
+        return negotiated_handler
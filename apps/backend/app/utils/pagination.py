@@ -0,0 +1,135 @@
+# app/utils/pagination.py
+"""
+Keyset pagination helpers. A cursor is an opaque token encoding the (created_at, _id)
+of the last item on a page; the next page starts strictly after it, so deep pages
+cost the same as the first.
+
+List totals are optional and approximate: approximate_count() serves them from a
+short-lived in-process cache instead of counting the collection on every page.
+"""
+
+import base64
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from bson import ObjectId, json_util
+
+MAX_PAGE_SIZE = 100
+
+# Seconds a cached list total is reused before it is counted again
+COUNT_CACHE_TTL = 60
+
+_count_cache: Dict[str, Tuple[float, int]] = {}
+
+
+def encode_cursor(created_at: datetime, oid: ObjectId) -> str:
+    raw = f"{created_at.isoformat()}|{oid}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Tuple[datetime, ObjectId]:
+    """
+    Decode a cursor token. Raises ValueError if the token is malformed.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        created_at, oid = base64.urlsafe_b64decode(padded.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), ObjectId(oid)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def keyset_filter(cursor: Optional[str], descending: bool = True) -> Dict[str, Any]:
+    """
+    Query filter selecting the items after the cursor in (created_at, _id) order.
+    """
+    if not cursor:
+        return {}
+    created_at, oid = decode_cursor(cursor)
+    op = "$lt" if descending else "$gt"
+    return {"$or": [
+        {"created_at": {op: created_at}},
+        {"created_at": created_at, "_id": {op: oid}}
+    ]}
+
+
+def keyset_sort(descending: bool = True) -> List[Tuple[str, int]]:
+    direction = -1 if descending else 1
+    return [("created_at", direction), ("_id", direction)]
+
+
+def clamp_limit(limit: int) -> int:
+    return max(1, min(limit, MAX_PAGE_SIZE))
+
+
+def next_cursor(docs: List[Dict[str, Any]], limit: int) -> Optional[str]:
+    """
+    Given up to limit + 1 raw documents, trim the lookahead item and return the next cursor.
+    """
+    if len(docs) <= limit:
+        return None
+    del docs[limit:]
+    last = docs[-1]
+    # Documents written before created_at was stamped everywhere sort by their ObjectId time
+    created_at = last.get("created_at") or last["_id"].generation_time.replace(tzinfo=None)
+    return encode_cursor(created_at, last["_id"])
+
+
+async def fetch_page(
+    collection,
+    query: Dict[str, Any],
+    projection: Optional[Dict[str, Any]] = None,
+    limit: Optional[int] = 20,
+    cursor: Optional[str] = None,
+    descending: bool = True
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Fetch one keyset page of raw documents and the cursor for the page after it.
+    A limit of None returns every document after the cursor, with no next cursor, for
+    the list routes whose existing clients do not follow next_cursor yet.
+    The projection must keep created_at. Raises ValueError for a malformed cursor.
+    """
+    after = keyset_filter(cursor, descending)
+    if after and "$or" in query:
+        page_query = {"$and": [query, after]}
+    else:
+        page_query = {**query, **after}
+    docs_cursor = collection.find(page_query, projection).sort(keyset_sort(descending))
+    if limit is None:
+        return await docs_cursor.to_list(length=None), None
+    limit = clamp_limit(limit)
+    docs = await docs_cursor.limit(limit + 1).to_list(length=limit + 1)
+    return docs, next_cursor(docs, limit)
+
+
+async def approximate_count(collection, query: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Count documents matching query, reusing a cached value for COUNT_CACHE_TTL seconds.
+    An empty query uses the collection metadata count.
+    """
+    key = f"{collection.name}:{json_util.dumps(query or {}, sort_keys=True)}"
+    cached = _count_cache.get(key)
+    now = time.monotonic()
+    if cached and now - cached[0] < COUNT_CACHE_TTL:
+        return cached[1]
+    if query:
+        total = await collection.count_documents(query)
+    else:
+        total = await collection.estimated_document_count()
+    if len(_count_cache) >= 1024:
+        for stale in [k for k, (at, _) in _count_cache.items() if now - at >= COUNT_CACHE_TTL]:
+            del _count_cache[stale]
+    _count_cache[key] = (now, total)
+    return total
+
+
+async def backfill_created_at(collection) -> int:
+    """
+    Stamp created_at from the ObjectId timestamp on documents written without one or
+    with it null, so keyset pages never skip them. Returns the number of documents updated.
+    """
+    result = await collection.update_many(
+        {"created_at": None},
+        [{"$set": {"created_at": {"$toDate": "$_id"}}}]
+    )
+    return result.modified_count
@@ -1,9 +1,75 @@
-from passlib.context import CryptContext
+# app/utils/password.py
+#
+# bcrypt hashing for signup and login. Each hash costs 100-250 ms of CPU, so the async
+# helpers run it on a small dedicated thread pool (bcrypt releases the GIL) instead of the
+# event loop. At most PASSWORD_HASH_MAX_PENDING hashes may be queued or running; beyond
+# that PasswordHasherBusy is raised so a login storm sheds load instead of queueing forever.
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict
+
+import bcrypt
+
+from app.config import settings
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full."""
+
+
+_executor = ThreadPoolExecutor(max_workers=settings.PASSWORD_HASH_WORKERS, thread_name_prefix="bcrypt")
+_pending = 0
+_rejected = 0
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 def hash_password(password: str) -> str:
-    return pwd_context.hash(password)
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(rounds=settings.BCRYPT_ROUNDS)).decode("utf-8")
+
 
 def verify_password(password: str, hashed: str) -> bool:
-    return pwd_context.verify(password, hashed)
\ No newline at end of file
+    try:
+        return bcrypt.checkpw(password.encode("utf-8"), (hashed or "").encode("utf-8"))
+    except ValueError:
+        # Malformed or missing hash
+        return False
+
+
+def needs_rehash(hashed: str) -> bool:
+    """
+    True if hashed was made with a different cost than BCRYPT_ROUNDS.
+    """
+    try:
+        return int(hashed.split("$")[2]) != settings.BCRYPT_ROUNDS
+    except (AttributeError, IndexError, ValueError):
+        return True
+
+
+async def _run(fn, *args):
+    global _pending, _rejected
+    if _pending >= settings.PASSWORD_HASH_MAX_PENDING:
+        _rejected += 1
+        raise PasswordHasherBusy()
+    _pending += 1
+    try:
+        return await asyncio.get_running_loop().run_in_executor(_executor, fn, *args)
+    finally:
+        _pending -= 1
+
+
+async def hash_password_async(password: str) -> str:
+    return await _run(hash_password, password)
+
+
+async def verify_password_async(password: str, hashed: str) -> bool:
+    return await _run(verify_password, password, hashed)
+
+
+def hasher_metrics() -> Dict[str, Any]:
+    return {
+        "workers": settings.PASSWORD_HASH_WORKERS,
+        "rounds": settings.BCRYPT_ROUNDS,
+        "pending": _pending,
+        "max_pending": settings.PASSWORD_HASH_MAX_PENDING,
+        "rejected": _rejected
+    }
@@ -0,0 +1,292 @@
+# app/utils/profiling.py
+"""
+Request profiling and the slow-request log.
+
+ProfilingMiddleware profiles a request when it carries the admin header
+(X-Profile: <PROFILE_ADMIN_TOKEN>) or is picked at PROFILE_SAMPLE_RATE. A profiled request
+gets a RequestProfile in a context variable, which collects:
+  - Mongo command count and time, from a pymongo CommandListener (Motor copies the
+    context into its executor threads, so commands are attributed to their request);
+  - OpenAI call count and time and serialisation time, from profile_span() blocks;
+  - a statistical stack profile: a sampler thread records the event loop thread's stack
+    every PROFILE_INTERVAL_MS while profiled requests are in flight. Requests served
+    concurrently on the same loop share those samples.
+
+Requests slower than SLOW_REQUEST_MS, and every admin-requested profile, are written to
+the capped slow_requests collection (or as JSON lines to SLOW_REQUEST_LOG_FILE) with the
+profile attached. Server-sent event streams are left out of both. Unprofiled requests cost two clock reads; with sampling, the admin
+token and the slow log all off, the middleware is not installed at all.
+"""
+
+import asyncio
+import hmac
+import os
+import random
+import sys
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from pymongo import monitoring
+from starlette.datastructures import Headers, MutableHeaders
+
+from app.config import settings
+from app.utils.log import get_logger
+
+log = get_logger(__name__)
+
+SLOW_REQUESTS_COLLECTION = "slow_requests"
+SLOW_REQUESTS_SIZE_BYTES = 64 * 1024 * 1024
+# Stacks kept per logged profile, most sampled first
+PROFILE_TOP_STACKS = 30
+MAX_STACK_DEPTH = 64
+
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+
+
+class RequestProfile:
+    """
+    Counters and stack samples for one request.
+    """
+
+    def __init__(self, requested: bool):
+        self.requested = requested
+        self.counters: Dict[str, float] = {
+            "mongo_calls": 0, "mongo_ms": 0.0,
+            "openai_calls": 0, "openai_ms": 0.0,
+            "serialization_calls": 0, "serialization_ms": 0.0
+        }
+        self.stacks: Dict[str, int] = {}
+        self.samples = 0
+
+    def record(self, kind: str, ms: float) -> None:
+        self.counters[f"{kind}_calls"] = self.counters.get(f"{kind}_calls", 0) + 1
+        self.counters[f"{kind}_ms"] = self.counters.get(f"{kind}_ms", 0.0) + ms
+
+    def add_sample(self, stack: str) -> None:
+        self.samples += 1
+        self.stacks[stack] = self.stacks.get(stack, 0) + 1
+
+    def server_timing(self) -> str:
+        return ", ".join(
+            f"{kind};dur={self.counters[f'{kind}_ms']:.1f}" for kind in ("mongo", "openai", "serialization")
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        top = sorted(self.stacks.items(), key=lambda item: item[1], reverse=True)[:PROFILE_TOP_STACKS]
+        return {
+            "counters": {key: round(value, 3) for key, value in self.counters.items()},
+            "samples": self.samples,
+            "interval_ms": settings.PROFILE_INTERVAL_MS,
+            "stacks": [{"stack": stack, "samples": count} for stack, count in top]
+        }
+
+
+def current_profile() -> Optional[RequestProfile]:
+    return _current.get()
+
+
+@contextmanager
+def profile_span(kind: str):
+    """
+    Time the enclosed block into the current request's profile as kind ("openai",
+    "serialization", ...). A no-op outside a profiled request.
+    """
+    profile = _current.get()
+    if profile is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        profile.record(kind, (time.perf_counter() - start) * 1000)
+
+
+class CommandProfiler(monitoring.CommandListener):
+    """
+    Command listener adding each Mongo command's duration to the current request's profile.
+    """
+
+    def started(self, event):
+        pass
+
+    def succeeded(self, event):
+        profile = _current.get()
+        if profile is not None:
+            profile.record("mongo", event.duration_micros / 1000)
+
+    def failed(self, event):
+        profile = _current.get()
+        if profile is not None:
+            profile.record("mongo", event.duration_micros / 1000)
+
+
+command_profiler = CommandProfiler()
+
+
+def _fold(frame) -> str:
+    """
+    Collapse a frame's stack into "file:function;..." from the outermost frame in.
+    """
+    names: List[str] = []
+    while frame is not None and len(names) < MAX_STACK_DEPTH:
+        code = frame.f_code
+        names.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class StackSampler:
+    """
+    Samples the event loop thread's stack into every attached profile. The sampling thread
+    only runs while at least one profile is attached.
+    """
+
+    def __init__(self, interval_ms: int):
+        self.interval = interval_ms / 1000
+        self._profiles: List[RequestProfile] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._target: Optional[int] = None
+
+    def attach(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.append(profile)
+            self._target = threading.get_ident()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+                self._thread.start()
+
+    def detach(self, profile: RequestProfile) -> None:
+        with self._lock:
+            self._profiles.remove(profile)
+
+    def _run(self) -> None:
+        while True:
+            time.sleep(self.interval)
+            with self._lock:
+                if not self._profiles:
+                    self._thread = None
+                    return
+                profiles = list(self._profiles)
+                target = self._target
+            frame = sys._current_frames().get(target)
+            if frame is None:
+                continue
+            stack = _fold(frame)
+            for profile in profiles:
+                profile.add_sample(stack)
+
+
+sampler = StackSampler(settings.PROFILE_INTERVAL_MS)
+
+
+async def ensure_slow_request_log() -> None:
+    """
+    Create the capped slow_requests collection if the slow log writes to Mongo.
+    """
+    if settings.SLOW_REQUEST_LOG_FILE:
+        return
+    from pymongo.errors import CollectionInvalid
+    from app.utils.db import db
+    try:
+        await db.create_collection(SLOW_REQUESTS_COLLECTION, capped=True, size=SLOW_REQUESTS_SIZE_BYTES)
+    except CollectionInvalid:
+        pass
+
+
+def _append_line(path: str, line: bytes) -> None:
+    with open(path, "ab") as f:
+        f.write(line + b"\n")
+
+
+async def write_slow_request(entry: Dict[str, Any]) -> None:
+    """
+    Append an entry to the slow-request log. Failures are logged and never raised.
+    """
+    try:
+        if settings.SLOW_REQUEST_LOG_FILE:
+            from app.utils.serialization import dumps
+            await asyncio.to_thread(_append_line, settings.SLOW_REQUEST_LOG_FILE, dumps(entry))
+        else:
+            from app.utils.db import db
+            await db[SLOW_REQUESTS_COLLECTION].insert_one(entry)
+    except Exception as e:
+        log.error("Error writing slow request log", error=str(e))
+
+
+class ProfilingMiddleware:
+    """
+    ASGI middleware timing every request, profiling sampled or admin-requested ones and
+    logging the slow ones.
+    """
+
+    def __init__(self, app, sample_rate: float = 0.0, slow_ms: int = 0, admin_token: str = ""):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.slow_ms = slow_ms
+        self.admin_token = admin_token.encode()
+        self._pending = set()
+
+    def _requested(self, scope) -> bool:
+        if not self.admin_token:
+            return False
+        value = Headers(scope=scope).get("x-profile")
+        return bool(value) and hmac.compare_digest(value.encode(), self.admin_token)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        requested = self._requested(scope)
+        profile = None
+        if requested or (self.sample_rate and random.random() < self.sample_rate):
+            profile = RequestProfile(requested)
+            token = _current.set(profile)
+            sampler.attach(profile)
+        state = {"code": 500, "stream": False, "attached": profile is not None}
+
+        async def send_with_timing(message):
+            if message["type"] == "http.response.start":
+                state["code"] = message["status"]
+                headers = MutableHeaders(scope=message)
+                if headers.get("content-type", "").startswith("text/event-stream"):
+                    # Event streams stay open for as long as the client listens: they are
+                    # neither slow requests nor worth sampling for their whole life
+                    state["stream"] = True
+                    if state["attached"]:
+                        sampler.detach(profile)
+                        state["attached"] = False
+                elif profile is not None:
+                    headers.append("Server-Timing", profile.server_timing())
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            duration_ms = (time.perf_counter() - start) * 1000
+            if profile is not None:
+                if state["attached"]:
+                    sampler.detach(profile)
+                _current.reset(token)
+            slow = bool(self.slow_ms) and duration_ms >= self.slow_ms
+            if not state["stream"] and (slow or (profile is not None and profile.requested)):
+                entry = {
+                    "method": scope["method"],
+                    # The query string is left out: it may carry tokens
+                    "path": scope["path"],
+                    "status": state["code"],
+                    "duration_ms": round(duration_ms, 1),
+                    "slow": slow,
+                    "profile": profile.to_dict() if profile is not None else None,
+                    "at": datetime.utcnow()
+                }
+                task = asyncio.create_task(write_slow_request(entry))
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
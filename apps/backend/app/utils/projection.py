@@ -0,0 +1,75 @@
+# app/utils/projection.py
+"""
+Helpers for lean reads: build Mongo projections from the response models, so a
+query only ships the fields its endpoint actually returns. Endpoints that accept
+fields= narrow that projection further to just the fields the client asked for.
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Type
+from pydantic import BaseModel
+
+
+def projection_for(model: Type[BaseModel], extra: Iterable[str] = (), exclude: Iterable[str] = ("id",)) -> Dict[str, int]:
+    """
+    Inclusion projection for a response model's fields (plus any extra source fields).
+    """
+    skip = set(exclude)
+    fields = [name for name in model.model_fields if name not in skip]
+    return {name: 1 for name in [*fields, *extra]}
+
+
+# ---------------------------------------------------
+# Sparse fieldsets (?fields=a,b,c)
+# ---------------------------------------------------
+def field_sources(model: Type[BaseModel], renames: Optional[Dict[str, Tuple[str, ...]]] = None, exclude: Iterable[str] = ("id",)) -> Dict[str, Tuple[str, ...]]:
+    """
+    Map each response field of a model to the document fields it is built from
+    (the field itself unless renames says otherwise).
+    """
+    renames = renames or {}
+    skip = set(exclude)
+    return {name: renames.get(name, (name,)) for name in model.model_fields if name not in skip}
+
+
+def parse_fields(fields: Optional[str], sources: Dict[str, Tuple[str, ...]]) -> Optional[List[str]]:
+    """
+    Parse a comma-separated fields= parameter against the fields an endpoint serves.
+    Returns None (every field) when fields is empty. Raises ValueError for unknown fields.
+    """
+    if not fields:
+        return None
+    selected = [name.strip() for name in fields.split(",") if name.strip() and name.strip() != "id"]
+    unknown = [name for name in selected if name not in sources]
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(unknown)}")
+    return selected
+
+
+def sparse_projection(sources: Dict[str, Tuple[str, ...]], selected: Optional[List[str]], base: Optional[Dict[str, int]] = None, always: Iterable[str] = ("created_at",)) -> Optional[Dict[str, int]]:
+    """
+    Inclusion projection for the selected response fields, plus the always fields
+    (created_at by default, which keyset pagination needs). Returns base when nothing
+    was selected.
+    """
+    if selected is None:
+        return base
+    projection = {source: 1 for name in selected for source in sources[name]}
+    projection.update({name: 1 for name in always})
+    return projection
+
+
+def pick(out: Dict[str, Any], selected: Optional[List[str]], model: Optional[Type[BaseModel]] = None) -> Dict[str, Any]:
+    """
+    Trim a response dict to its id and the selected fields. Selected fields missing
+    from out take their default from model, if it has one.
+    """
+    if selected is None:
+        return out
+    defaults = model.model_fields if model else {}
+    trimmed = {"id": out["id"]} if "id" in out else {}
+    for name in selected:
+        if name in out:
+            trimmed[name] = out[name]
+        elif name in defaults and not defaults[name].is_required():
+            trimmed[name] = defaults[name].get_default(call_default_factory=True)
+    return trimmed
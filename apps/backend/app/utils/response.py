@@ -1,9 +1,28 @@
-# app/utils/response.py
 from fastapi import status
+from fastapi.responses import JSONResponse
 from typing import Any, Dict
+from app.utils.serialization import dumps
+from app.utils.profiling import profile_span
 
-def success(data: Any = None, message: str = "Success") -> Dict:
-    return {"status": "success", "message": message, "data": data}
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response encoded with app.utils.serialization.dumps (orjson, ObjectId-aware).
+    The unencoded content is kept on .payload.
+    """
+
+    def __init__(self, content: Any = None, *args, **kwargs):
+        self.payload = content
+        super().__init__(content, *args, **kwargs)
+
+    def render(self, content: Any) -> bytes:
+        with profile_span("serialization"):
+            return dumps(content)
+
+
+def success(data: Any = None, message: str = "Success") -> FastJSONResponse:
+    # Returning a Response skips FastAPI's jsonable_encoder pass over the envelope
+    return FastJSONResponse({"status": "success", "message": message, "data": data})
 
 def error(message: str = "Error", code: int = status.HTTP_400_BAD_REQUEST) -> Dict:
-    return {"status": "error", "message": message}
\ No newline at end of file
+    return {"status": "error", "message": message}
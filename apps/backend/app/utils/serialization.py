@@ -0,0 +1,168 @@
+# app/utils/serialization.py
+"""
+JSON serialisation shared by every route.
+
+doc_to_json() turns a Mongo document into a JSON-ready dict (the _id becomes "id" and every
+ObjectId, nested or not, a string), replacing the per-service conversion loops. dumps()
+encodes with orjson, which handles datetimes, enums and numpy scalars natively; the stdlib
+json module is used if orjson is not installed.
+
+packb()/unpackb() are the MessagePack equivalents for clients that negotiate
+application/msgpack: ObjectIds travel as their 12 raw bytes and datetimes as msgpack
+timestamps. They need the optional msgpack package. doc_to_json() and the response models'
+ObjectIdString fields mark ObjectId strings as ObjectIdStr, which JSON encodes as a plain
+string and packb() as the raw bytes, so no second pass over the payload is needed.
+"""
+
+import json
+from datetime import date, datetime, timezone
+from enum import Enum
+from typing import Annotated, Any, Dict
+
+from bson import ObjectId
+from pydantic import AfterValidator, BaseModel
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class ObjectIdStr(str):
+    """
+    The string form of an ObjectId: a plain string in JSON, 12 raw bytes in MessagePack.
+    """
+    __slots__ = ()
+
+
+def mark_object_id(value: Any) -> Any:
+    """
+    ObjectIdStr for a valid ObjectId string (or each one in a list); anything else unchanged.
+    """
+    if type(value) is str and len(value) == 24 and ObjectId.is_valid(value):
+        return ObjectIdStr(value)
+    if isinstance(value, list):
+        return [mark_object_id(item) for item in value]
+    return value
+
+
+# Response model field type for ObjectId strings, so model output keeps the marking
+ObjectIdString = Annotated[str, AfterValidator(mark_object_id)]
+
+# Keys whose string values are ObjectId references, besides "id" and "*_id"/"*_ids"
+ID_KEYS = {"assigned_experts", "duplicate_of", "is_duplicate_of", "created_by"}
+
+
+def _is_id_key(key: Any) -> bool:
+    return isinstance(key, str) and (key.endswith("_id") or key.endswith("_ids") or key in ID_KEYS)
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return ObjectIdStr(value)
+    if isinstance(value, dict):
+        return {key: _jsonable(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_jsonable(item) for item in value]
+    return value
+
+
+def doc_to_json(doc: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Copy of a Mongo document with _id renamed to id and ObjectIds converted to strings.
+    ObjectIds, and ObjectId strings stored under id keys, come out as ObjectIdStr.
+    """
+    out: Dict[str, Any] = {"id": ObjectIdStr(doc["_id"])} if "_id" in doc else {}
+    for key, value in doc.items():
+        if key == "_id":
+            continue
+        value = _jsonable(value)
+        out[key] = mark_object_id(value) if _is_id_key(key) else value
+    return out
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, BaseModel):
+        return value.dict()
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if hasattr(value, "item"):
+        # numpy scalars
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def _msgpack_default(value: Any) -> Any:
+    if isinstance(value, ObjectIdStr):
+        return bytes.fromhex(value)
+    if isinstance(value, ObjectId):
+        return value.binary
+    if isinstance(value, datetime):
+        # Stored datetimes are naive UTC
+        return msgpack.Timestamp.from_datetime(value if value.tzinfo else value.replace(tzinfo=timezone.utc))
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Enum):
+        return value.value
+    # With strict_types, subclasses of the builtin types arrive here too
+    if isinstance(value, str):
+        return str(value)
+    if isinstance(value, int):
+        return int(value)
+    if isinstance(value, float):
+        return float(value)
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    return _default(value)
+
+
+def packb(content: Any) -> bytes:
+    """
+    Encode content as MessagePack. Raises RuntimeError if msgpack is not installed.
+    """
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    # strict_types hands ObjectIdStr to the default hook instead of packing it as a string
+    return msgpack.packb(content, default=_msgpack_default, use_bin_type=True, strict_types=True)
+
+
+def _from_msgpack(value: Any) -> Any:
+    if isinstance(value, bytes) and len(value) == 12:
+        return str(ObjectId(value))
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if isinstance(value, dict):
+        return {key: _from_msgpack(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_from_msgpack(item) for item in value]
+    return value
+
+
+def unpackb(data: bytes) -> Any:
+    """
+    Decode a MessagePack request body into JSON-ready values: 12-byte binaries become
+    ObjectId strings and timestamps ISO datetimes. Raises ValueError for malformed input.
+    """
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    try:
+        return _from_msgpack(msgpack.unpackb(data, raw=False, timestamp=3, strict_map_key=False))
+    except (msgpack.ExtraData, msgpack.FormatError, msgpack.StackError, ValueError) as e:
+        raise ValueError(f"Invalid MessagePack body: {e}")
@@ -0,0 +1,33 @@
+#!/usr/bin/env python3
+"""
+Script to archive completed and duplicate questions older than N days, with their answers,
+votes and peer reviews, into the compressed *_archive collections. The API runs the same
+job every ARCHIVE_INTERVAL_SECONDS.
+
+Usage:
+  python archive_questions.py                  # Archive questions older than ARCHIVE_AFTER_DAYS
+  python archive_questions.py 30               # Archive questions older than 30 days
+  python archive_questions.py restore <id> ... # Move archived questions back
+"""
+
+import asyncio
+import sys
+from app.services.archive_service import ensure_archive_collections, archive_questions, restore_question
+
+
+async def main():
+    if len(sys.argv) > 1 and sys.argv[1] == "restore":
+        for question_id in sys.argv[2:]:
+            restored = await restore_question(question_id)
+            print(f"{'✅ Restored' if restored else '⚠️  Not archived:'} {question_id}")
+        return
+
+    await ensure_archive_collections()
+    days = int(sys.argv[1]) if len(sys.argv) > 1 else None
+    archived = await archive_questions(days)
+    for name, count in archived.items():
+        print(f"✅ {name}: {count} archived")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
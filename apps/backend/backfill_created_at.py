@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Script to stamp created_at on documents written before every list endpoint used keyset
+pagination (answers and peer reviews were stored without it). The timestamp is taken
+from the document's ObjectId. The app runs the same backfill once at startup; this
+script repeats it on demand. Safe to run repeatedly.
+
+Usage:
+  python backfill_created_at.py
+"""
+
+import asyncio
+from app.utils.db import questions_collection, answers_collection, peer_reviews_collection, notifications_collection
+from app.utils.pagination import backfill_created_at
+
+
+async def main():
+    for collection in (questions_collection, answers_collection, peer_reviews_collection, notifications_collection):
+        updated = await backfill_created_at(collection)
+        print(f"✅ {collection.name}: stamped created_at on {updated} documents")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
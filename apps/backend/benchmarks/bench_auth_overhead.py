@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-request authentication overhead under concurrent load, decoding the JWT
+and reading the user on every request (the old dependencies) versus the cached
+principal lookup (app.utils.jwt.get_principal).
+
+Uses a scratch database (dropped afterwards).
+
+Usage:
+  MONGODB_URL=mongodb://localhost:27017 python benchmarks/bench_auth_overhead.py [users] [requests] [concurrency]
+"""
+
+import asyncio
+import os
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ["DATABASE_NAME"] = "agri_vote_bench_auth"
+
+from bson import ObjectId
+from app.utils.db import get_client, db, users_collection
+from app.utils.jwt import create_access_token, decode_token, get_principal, token_cache, user_cache
+from app.models.user import USER_PRIVATE_PROJECTION
+
+
+async def uncached_auth(token: str):
+    payload = await decode_token(token)
+    return await users_collection.find_one({"_id": ObjectId(payload["user_id"])}, USER_PRIVATE_PROJECTION)
+
+
+async def run(label: str, auth, tokens, requests: int, concurrency: int):
+    latencies = []
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            start = time.perf_counter()
+            assert await auth(random.choice(tokens))
+            latencies.append((time.perf_counter() - start) * 1000)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    p50 = latencies[len(latencies) // 2]
+    p99 = latencies[min(len(latencies) - 1, int(0.99 * len(latencies)))]
+    print(f"{label:<22} {requests / elapsed:9.0f} auth/s  p50 {p50:7.3f} ms  p99 {p99:7.3f} ms")
+
+
+async def main():
+    user_count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    requests = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    concurrency = int(sys.argv[3]) if len(sys.argv) > 3 else 100
+
+    users = [{
+        "name": f"Expert {i}",
+        "email": f"expert{i}@example.com",
+        "role": "expert",
+        "hashed_password": "x" * 60,
+        "specialisation_embedding": [random.random() for _ in range(1536)]
+    } for i in range(user_count)]
+    result = await users_collection.insert_many(users)
+    tokens = [create_access_token({"user_id": str(oid), "role": "expert"}) for oid in result.inserted_ids]
+
+    try:
+        print(f"Users: {user_count}  requests: {requests}  concurrency: {concurrency}")
+        await run("decode + find_one", uncached_auth, tokens, requests, concurrency)
+        token_cache.clear()
+        user_cache.clear()
+        await run("cached principal", get_principal, tokens, requests, concurrency)
+        print(f"Token cache hits {token_cache.hits}, misses {token_cache.misses}; "
+              f"user cache hits {user_cache.hits}, misses {user_cache.misses}")
+    finally:
+        await get_client().drop_database(db.name)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: MongoDB round-trips to render a page of the expert dashboard, the per-card
+fan-out (assigned questions, then answers, reviews of each answer and best answer vote
+per question) versus get_expert_dashboard. Commands issued while another is still in
+flight (e.g. under asyncio.gather) share a round-trip. Fails if the dashboard's
+round-trips grow with the number of questions.
+
+Runs against MONGODB_URL / DATABASE_NAME and removes the documents it creates.
+
+Usage:
+  python benchmarks/bench_dashboard_roundtrips.py
+"""
+
+import asyncio
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pymongo import monitoring
+
+MAX_ROUND_TRIPS = 2
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.round_trips = 0
+        self.in_flight = 0
+
+    def reset(self):
+        self.round_trips = 0
+
+    def started(self, event):
+        if self.in_flight == 0:
+            self.round_trips += 1
+        self.in_flight += 1
+
+    def succeeded(self, event):
+        self.in_flight -= 1
+
+    def failed(self, event):
+        self.in_flight -= 1
+
+
+# Listeners must be registered before the Motor client is created in app.utils.db
+counter = CommandCounter()
+monitoring.register(counter)
+
+from bson import ObjectId
+from app.utils.db import questions_collection, answers_collection, peer_reviews_collection
+from app.utils.indexes import apply_indexes
+from app.services.expert_service import (
+    get_assigned_questions, get_answers_for_question, get_peer_reviews_for_answer,
+    get_expert_vote_for_question, get_expert_dashboard
+)
+
+
+async def seed(expert_id, others, count):
+    now = datetime.utcnow()
+    question_ids = (await questions_collection.insert_many([{
+        "raw_text": f"dashboard benchmark question {i}", "assigned_experts": [expert_id, *others],
+        "status": "answered", "created_at": now - timedelta(seconds=i)
+    } for i in range(count)])).inserted_ids
+    answers = [{
+        "answer_text": f"answer by {author}", "question_id": q, "expert_id": ObjectId(author),
+        "upvotes": 0, "downvotes": 0, "peer_votes": 0, "created_at": now
+    } for q in question_ids for author in (expert_id, others[0])]
+    answer_ids = (await answers_collection.insert_many(answers)).inserted_ids
+    await peer_reviews_collection.insert_many([{
+        "answer_id": answer_id, "question_id": answer["question_id"], "reviewer_expert_id": ObjectId(others[1]),
+        "best_answer_vote": False, "comment_text": "ok", "created_at": now
+    } for answer_id, answer in zip(answer_ids, answers)])
+    return question_ids
+
+
+async def fan_out(expert_id, limit):
+    page = await get_assigned_questions(expert_id, limit)
+    for card in page["questions"]:
+        answers = await get_answers_for_question(card["id"], include_draft=False)
+        for answer in answers["answers"]:
+            await get_peer_reviews_for_answer(answer["id"])
+        await get_expert_vote_for_question(card["id"], expert_id)
+
+
+async def main():
+    await apply_indexes()
+    expert_id = str(ObjectId())
+    others = [str(ObjectId()), str(ObjectId())]
+    question_ids = await seed(expert_id, others, 50)
+
+    failed = False
+    try:
+        dashboard_trips = []
+        for limit in (5, 20, 50):
+            counter.reset()
+            await fan_out(expert_id, limit)
+            fan_out_trips = counter.round_trips
+
+            counter.reset()
+            page = await get_expert_dashboard(expert_id, limit)
+            dashboard_trips.append(counter.round_trips)
+            ok = counter.round_trips <= MAX_ROUND_TRIPS and len(page["questions"]) == limit
+            failed = failed or not ok
+            print(f"{'✅' if ok else '❌'} {limit:3d} questions: fan-out {fan_out_trips:4d} round-trips, dashboard {counter.round_trips}")
+
+        failed = failed or len(set(dashboard_trips)) != 1
+    finally:
+        await peer_reviews_collection.delete_many({"question_id": {"$in": question_ids}})
+        await answers_collection.delete_many({"question_id": {"$in": question_ids}})
+        await questions_collection.delete_many({"_id": {"$in": question_ids}})
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Benchmark: serialising a 200-question expert dashboard response.
+
+"before" is the old path: per-field str() loops in the service, then FastAPI's
+jsonable_encoder and json.dumps. "after" is doc_to_json() plus FastJSONResponse
+(orjson when installed). Needs no database.
+
+Usage:
+  python benchmarks/bench_dashboard_serialization.py [questions] [repeats]
+"""
+
+import json
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from app.utils.response import FastJSONResponse
+from app.utils.serialization import doc_to_json, orjson
+
+
+def make_docs(count):
+    now = datetime.utcnow()
+    return [{
+        "_id": ObjectId(),
+        "user_id": str(ObjectId()),
+        "original_text": f"My tomato leaves are curling and turning yellow near the base, what should I do? ({i})",
+        "cleaned_text": f"Tomato leaves curling and yellowing near the base: cause and treatment? ({i})",
+        "domain": random.choice(["crop", "soil", "pest", "irrigation"]),
+        "status": "assigned",
+        "assigned_experts": [str(ObjectId()) for _ in range(5)],
+        "duplicate_of": None,
+        "is_duplicate_of": None,
+        "moderator_requested": False,
+        "created_at": now - timedelta(minutes=i)
+    } for i in range(count)]
+
+
+def before(docs):
+    questions = []
+    for doc in docs:
+        doc = dict(doc)
+        doc["id"] = str(doc.pop("_id"))
+        questions.append(doc)
+    envelope = {"status": "success", "message": "Success", "data": {"questions": questions, "next_cursor": None}}
+    return json.dumps(jsonable_encoder(envelope), ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def after(docs):
+    envelope = {"status": "success", "message": "Success", "data": {"questions": [doc_to_json(doc) for doc in docs], "next_cursor": None}}
+    return FastJSONResponse(envelope).body
+
+
+def timed(fn, docs, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        body = fn(docs)
+    return (time.perf_counter() - start) * 1000 / repeats, len(body)
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    docs = make_docs(count)
+
+    before_ms, before_bytes = timed(before, docs, repeats)
+    after_ms, after_bytes = timed(after, docs, repeats)
+    print(f"Questions: {count}  encoder: {'orjson' if orjson else 'json (orjson not installed)'}")
+    print(f"jsonable_encoder + json: {before_ms:7.3f} ms  {before_bytes / 1024:6.1f} KiB")
+    print(f"doc_to_json + FastJSON:  {after_ms:7.3f} ms  {after_bytes / 1024:6.1f} KiB")
+    print(f"Speedup: {before_ms / after_ms:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
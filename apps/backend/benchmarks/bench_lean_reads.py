@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Benchmark: expert dashboard payload for an expert with many assigned questions,
+full documents versus the lean projected shape served by get_assigned_questions.
+
+Uses a scratch database (dropped afterwards).
+
+Usage:
+  MONGODB_URL=mongodb://localhost:27017 python benchmarks/bench_lean_reads.py [questions] [repeats]
+"""
+
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ.setdefault("MONGODB_URL", "mongodb://localhost:27017")
+os.environ["DATABASE_NAME"] = "agri_vote_bench_lean"
+
+from bson import ObjectId
+from app.utils.db import get_client, db, questions_collection
+from app.utils.indexes import apply_indexes
+from app.services.expert_service import get_assigned_questions
+
+
+def full_documents_payload(docs):
+    for doc in docs:
+        doc["id"] = str(doc.pop("_id"))
+    return json.dumps({"questions": docs}, default=str).encode()
+
+
+async def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    expert_id = str(ObjectId())
+
+    await apply_indexes()
+    await questions_collection.insert_many([{
+        "user_id": str(ObjectId()),
+        "original_text": f"How do I manage pests on my crop, question {i}?",
+        "cleaned_text": f"How should pests be managed on this crop (question {i})?",
+        "domain": "pest",
+        "status": "assigned",
+        "assigned_experts": [expert_id, str(ObjectId()), str(ObjectId())],
+        "embedding": [random.random() for _ in range(1536)],
+        "ai_metadata": {"embedding_generated": True, "embedding_model": "text-embedding-3-small", "generated_at": datetime.utcnow()},
+        "ai_pipeline": {"status": "done"},
+        "created_at": datetime.utcnow()
+    } for i in range(count)])
+
+    try:
+        start = time.perf_counter()
+        for _ in range(repeats):
+            docs = await questions_collection.find({"assigned_experts": expert_id}).to_list(length=None)
+            full_bytes = len(full_documents_payload(docs))
+        full_ms = (time.perf_counter() - start) * 1000 / repeats
+
+        start = time.perf_counter()
+        for _ in range(repeats):
+            # Walk every keyset page so both sides return all the questions
+            lean_bytes, cursor = 0, None
+            while True:
+                page = await get_assigned_questions(expert_id, cursor=cursor)
+                lean_bytes += len(json.dumps(page, default=str).encode())
+                cursor = page["next_cursor"]
+                if not cursor:
+                    break
+        lean_ms = (time.perf_counter() - start) * 1000 / repeats
+
+        print(f"Assigned questions: {count}")
+        print(f"Full documents:     {full_bytes / 1024:8.1f} KiB  {full_ms:7.1f} ms")
+        print(f"Lean projection:    {lean_bytes / 1024:8.1f} KiB  {lean_ms:7.1f} ms")
+        print(f"Reduction:          {100 * (1 - lean_bytes / full_bytes):.1f}% bytes, {full_ms / lean_ms:.1f}x faster")
+    finally:
+        await get_client().drop_database(db.name)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
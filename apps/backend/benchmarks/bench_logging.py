@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Benchmark: event loop stalls caused by request-path logging, with debug logs on.
+Concurrent simulated requests each emit what the question pipeline and the submit route
+used to print (the full embedding, the answer body, every allocated expert) versus the
+structured log calls that replaced them, while a probe task measures how late the loop
+wakes it. Output goes to a line-buffered file, as stdout does when a log collector reads
+it unbuffered. Needs no database.
+
+Usage:
+  python benchmarks/bench_logging.py [requests] [concurrency]
+"""
+
+import asyncio
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+os.environ["LOG_LEVEL"] = "DEBUG"
+os.environ.setdefault("LOG_FORMAT", "json")
+real_stdout = sys.stdout
+sink = tempfile.TemporaryFile("w", buffering=1)
+# The log handler binds sys.stdout when the first logger is created
+sys.stdout = sink
+
+from app.utils.log import get_logger, shutdown_logging, dropped_records
+
+log = get_logger("bench")
+
+EMBEDDING = [random.uniform(-1, 1) for _ in range(1536)]
+ANSWER = {"answer_text": "Spray neem oil every 7 days and remove the affected leaves. " * 20, "sources": []}
+EXPERTS = [{"_id": f"{i:024x}", "name": f"Expert {i}", "specialisation": "crop protection", "similarity": random.random()}
+           for i in range(5)]
+PROBE_INTERVAL = 0.001
+
+
+def print_request(i):
+    print(f"Attempting to submit answer for question {i} by expert {i}")
+    print(f"Answer data: {ANSWER}")
+    print(EMBEDDING)
+    print(f"Allocated {len(EXPERTS)} experts for domain 'crop':")
+    for n, expert in enumerate(EXPERTS, 1):
+        print(f"  {n}. {expert['name']} - {expert['specialisation']} (similarity: {expert['similarity']:.4f})")
+
+
+def log_request(i):
+    log.debug("Submitting answer", question_id=i, expert_id=i, answer_chars=len(ANSWER["answer_text"]))
+    log.debug("Embedding generated", question_id=i, dims=len(EMBEDDING))
+    log.debug(
+        "Experts allocated",
+        domain="crop",
+        experts=[(expert["_id"], round(expert["similarity"], 4)) for expert in EXPERTS],
+        rate_limit=10
+    )
+
+
+async def run(emit, requests, concurrency):
+    lags = []
+    done = asyncio.Event()
+
+    async def probe():
+        while not done.is_set():
+            start = time.perf_counter()
+            await asyncio.sleep(PROBE_INTERVAL)
+            lags.append((time.perf_counter() - start - PROBE_INTERVAL) * 1000)
+
+    async def worker(ids):
+        for i in ids:
+            emit(i)
+            await asyncio.sleep(0)
+
+    probe_task = asyncio.create_task(probe())
+    start = time.perf_counter()
+    await asyncio.gather(*(worker(range(w, requests, concurrency)) for w in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    done.set()
+    await probe_task
+    lags.sort()
+    return elapsed, lags
+
+
+def report(label, elapsed, lags, requests):
+    p99 = lags[int(len(lags) * 0.99)] if lags else 0.0
+    median = statistics.median(lags) if lags else 0.0
+    real_stdout.write(
+        f"{label:8s} {requests / elapsed:8.0f} req/s  loop lag p50={median:.3f} ms  "
+        f"p99={p99:.3f} ms  max={lags[-1] if lags else 0.0:.3f} ms\n"
+    )
+
+
+async def main():
+    requests = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    concurrency = int(sys.argv[2]) if len(sys.argv) > 2 else 50
+
+    elapsed, lags = await run(print_request, requests, concurrency)
+    report("print", elapsed, lags, requests)
+    elapsed, lags = await run(log_request, requests, concurrency)
+    report("logger", elapsed, lags, requests)
+
+    shutdown_logging()
+    real_stdout.write(f"Log records dropped: {dropped_records()}\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: a login storm of concurrent bcrypt verifications, hashing inline on the event
+loop (the old auth_routes code) versus the bounded hashing pool in app.utils.password.
+
+Alongside the storm a probe runs a trivial request every 10 ms, standing in for unrelated
+endpoints; its p99 latency shows how long the event loop is blocked. Needs no database.
+
+Usage:
+  python benchmarks/bench_login_storm.py [logins] [bcrypt_rounds]
+"""
+
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+if len(sys.argv) > 2:
+    os.environ["BCRYPT_ROUNDS"] = sys.argv[2]
+
+import bcrypt
+from app.utils.password import hash_password, verify_password, verify_password_async, hasher_metrics, PasswordHasherBusy
+
+
+def percentile(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p * len(values)))] if values else 0.0
+
+
+async def probe(stop: asyncio.Event, latencies):
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(0.01)
+        # Anything beyond the 10 ms sleep is time the loop was busy elsewhere
+        latencies.append((time.perf_counter() - start) * 1000 - 10)
+
+
+async def storm(label: str, verify, logins: int, hashed: str):
+    probe_latencies = []
+    stop = asyncio.Event()
+    probe_task = asyncio.create_task(probe(stop, probe_latencies))
+    rejected = 0
+
+    async def login():
+        nonlocal rejected
+        try:
+            assert await verify("correct horse", hashed)
+        except PasswordHasherBusy:
+            rejected += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(logins)))
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await probe_task
+
+    print(f"{label:<16} {(logins - rejected) / elapsed:7.1f} logins/s  rejected {rejected:4d}  "
+          f"unrelated request p50 {percentile(probe_latencies, 0.5):8.1f} ms  p99 {percentile(probe_latencies, 0.99):8.1f} ms")
+
+
+async def inline_verify(password: str, hashed: str) -> bool:
+    return bcrypt.checkpw(password.encode("utf-8"), hashed.encode("utf-8"))
+
+
+async def main():
+    logins = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    hashed = hash_password("correct horse")
+    assert verify_password("correct horse", hashed)
+
+    print(f"Logins: {logins}  pool: {hasher_metrics()}")
+    await storm("inline bcrypt", inline_verify, logins, hashed)
+    await storm("bounded pool", verify_password_async, logins, hashed)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
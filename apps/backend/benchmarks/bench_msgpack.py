@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Benchmark: encode time and size of the farmer question detail and the expert
+assigned-questions list as JSON (FastJSONResponse) versus MessagePack (MsgPackResponse,
+ObjectIds as raw bytes, datetimes as timestamps), each also gzip compressed.
+Needs no database.
+
+Usage:
+  python benchmarks/bench_msgpack.py [questions] [repeats]
+"""
+
+import gzip
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bson import ObjectId
+from app.models.question import AssignedQuestionOut
+from app.utils.negotiation import MsgPackResponse
+from app.utils.response import FastJSONResponse
+from app.utils.serialization import doc_to_json, msgpack, unpackb
+
+
+def question_detail():
+    now = datetime.utcnow()
+    return {"question": doc_to_json({
+        "_id": ObjectId(),
+        "original_text": "My tomato leaves are curling and turning yellow near the base, what should I do?",
+        "cleaned_text": "Tomato leaves curling and yellowing near the base: cause and treatment?",
+        "domain": "crop",
+        "status": "answered",
+        "assigned_experts": [str(ObjectId()) for _ in range(5)],
+        "is_duplicate_of": None,
+        "created_by": str(ObjectId()),
+        "created_at": now,
+        "ai_metadata": {"embedding_generated": True, "embedding_model": "text-embedding-3-small", "generated_at": now},
+        "ai_pipeline": {"status": "done"}
+    })}
+
+
+def assigned_questions(count):
+    # Built as get_assigned_questions builds its cards
+    now = datetime.utcnow()
+    return {"questions": [AssignedQuestionOut(**doc_to_json({
+        "_id": ObjectId(),
+        "user_id": str(ObjectId()),
+        "original_text": f"My tomato leaves are curling and turning yellow near the base, what should I do? ({i})",
+        "cleaned_text": f"Tomato leaves curling and yellowing near the base: cause and treatment? ({i})",
+        "domain": random.choice(["crop", "soil", "pest", "irrigation"]),
+        "status": "assigned",
+        "assigned_experts": [str(ObjectId()) for _ in range(5)],
+        "duplicate_of": None,
+        "is_duplicate_of": None,
+        "moderator_requested": False,
+        "created_at": now - timedelta(minutes=i)
+    })).dict() for i in range(count)], "next_cursor": None}
+
+
+def timed(response_class, data, repeats):
+    envelope = {"status": "success", "message": "Success", "data": data}
+    start = time.perf_counter()
+    for _ in range(repeats):
+        body = response_class(envelope).body
+    return (time.perf_counter() - start) * 1000 / repeats, body
+
+
+def compare(label, data, repeats):
+    json_ms, json_body = timed(FastJSONResponse, data, repeats)
+    msgpack_ms, msgpack_body = timed(MsgPackResponse, data, repeats)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        unpackb(msgpack_body)
+    decode_ms = (time.perf_counter() - start) * 1000 / repeats
+
+    print(label)
+    print(f"  JSON:        {json_ms:7.3f} ms  {len(json_body):7d} B  gzip {len(gzip.compress(json_body)):7d} B")
+    print(f"  MessagePack: {msgpack_ms:7.3f} ms  {len(msgpack_body):7d} B  gzip {len(gzip.compress(msgpack_body)):7d} B"
+          f"  (decode {decode_ms:.3f} ms)")
+    print(f"  MessagePack is {100 * (1 - len(msgpack_body) / len(json_body)):.0f}% smaller")
+
+
+def main():
+    if msgpack is None:
+        print("msgpack is not installed")
+        return
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    compare("Question detail", question_detail(), repeats)
+    compare(f"Assigned questions ({count})", assigned_questions(count), repeats)
+
+
+if __name__ == "__main__":
+    main()
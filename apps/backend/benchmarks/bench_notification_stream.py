@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Benchmark: notification push vs polling GET /api/expert/notifications.
+Simulates experts spread over two workers linked by the local stand-in transport,
+publishes notifications for a while, and reports deliveries, latency and the poll
+requests the stream replaces.
+
+Usage:
+  python benchmarks/bench_notification_stream.py [experts] [seconds] [poll_interval_seconds] [notifications_per_second]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bson import ObjectId
+from app.services.realtime_service import EventBroker, LocalTransport, user_channel
+
+
+async def main():
+    experts = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 10
+    poll_interval = float(sys.argv[3]) if len(sys.argv) > 3 else 15
+    rate = float(sys.argv[4]) if len(sys.argv) > 4 else 50
+
+    transport = LocalTransport()
+    workers = [EventBroker(transport=transport), EventBroker(transport=transport)]
+    for worker in workers:
+        await worker.start()
+
+    expert_ids = [str(ObjectId()) for _ in range(experts)]
+    subscriptions = [(workers[i % 2], workers[i % 2].subscribe(user_channel(e))) for i, e in enumerate(expert_ids)]
+
+    async def consume(worker, queue):
+        while True:
+            worker.record_delivery(await queue.get())
+
+    consumers = [asyncio.create_task(consume(w, q)) for w, q in subscriptions]
+
+    published = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < duration:
+        publisher = random.choice(workers)
+        publisher.publish(user_channel(random.choice(expert_ids)), "notification", {"type": "question_assigned"})
+        published += 1
+        await asyncio.sleep(1 / rate)
+    await asyncio.sleep(0.1)
+    for task in consumers:
+        task.cancel()
+
+    delivered = sum(w.metrics()["delivered"] for w in workers)
+    p99 = max(w.metrics()["fanout_latency_ms"]["p99"] or 0 for w in workers)
+    polls = int(experts * duration / poll_interval)
+    print(f"Experts connected:        {experts} across {len(workers)} workers")
+    print(f"Notifications published:  {published} over {duration:.0f}s")
+    print(f"Notifications delivered:  {delivered} (p99 latency {p99} ms)")
+    print(f"Poll requests replaced:   {polls} (one per expert every {poll_interval:.0f}s)")
+    print(f"Stream requests instead:  {experts} (one long-lived connection per expert)")
+    print(f"Empty polls avoided:      {max(0, polls - delivered)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
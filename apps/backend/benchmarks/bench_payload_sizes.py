@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+"""
+Benchmark: response sizes of the main farmer and expert screens, full responses versus
+the fields= sparse fieldsets each screen needs, each raw and gzip/brotli compressed.
+Needs no database.
+
+Usage:
+  python benchmarks/bench_payload_sizes.py [questions] [answers]
+"""
+
+import random
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bson import ObjectId
+from app.models.answer import AnswerSummaryOut
+from app.models.peer_review import PeerReview
+from app.utils.compression import compress, brotli
+from app.utils.projection import pick
+from app.utils.serialization import doc_to_json, dumps
+
+LOREM = (
+    "Yellowing starts on the lower leaves and moves upwards; check for nitrogen deficiency, "
+    "early blight spots with concentric rings, and waterlogging around the roots. "
+)
+
+
+def envelope(data):
+    return dumps({"status": "success", "message": "Success", "data": data})
+
+
+def question_detail():
+    now = datetime.utcnow()
+    return {
+        "id": str(ObjectId()),
+        "original_text": "My tomato leaves are curling and turning yellow near the base, what should I do?",
+        "cleaned_text": "Tomato leaves curling and yellowing near the base: cause and treatment?",
+        "domain": "crop",
+        "status": "answered",
+        "assigned_experts": [str(ObjectId()) for _ in range(5)],
+        "is_duplicate_of": None,
+        "created_by": str(ObjectId()),
+        "created_at": now,
+        "ai_metadata": {
+            "embedding_generated": True,
+            "embedding_model": "text-embedding-3-small",
+            "generated_at": now,
+            "duplicate_found": False,
+            "similarity_scores": [round(random.random(), 4) for _ in range(10)]
+        },
+        "ai_pipeline": {"status": "done", "started_at": now, "finished_at": now, "steps": ["classify", "dedupe", "clean", "assign"]}
+    }
+
+
+def assigned_cards(count):
+    now = datetime.utcnow()
+    return [{
+        "id": str(ObjectId()),
+        "user_id": str(ObjectId()),
+        "original_text": f"My tomato leaves are curling and turning yellow near the base, what should I do? ({i})",
+        "cleaned_text": f"Tomato leaves curling and yellowing near the base: cause and treatment? ({i})",
+        "domain": random.choice(["crop", "soil", "pest", "irrigation"]),
+        "status": "assigned",
+        "assigned_experts": [str(ObjectId()) for _ in range(5)],
+        "duplicate_of": None,
+        "is_duplicate_of": None,
+        "moderator_requested": False,
+        "created_at": now - timedelta(minutes=i)
+    } for i in range(count)]
+
+
+def answers(count):
+    now = datetime.utcnow()
+    return [doc_to_json({
+        "_id": ObjectId(),
+        "question_id": ObjectId(),
+        "expert_id": ObjectId(),
+        "answer_text": LOREM * 3,
+        "images": [],
+        "status": "submitted",
+        "ai_draft": LOREM * 10,
+        "upvotes": random.randint(0, 20),
+        "downvotes": random.randint(0, 5),
+        "peer_votes": random.randint(0, 3),
+        "created_at": now
+    }) for _ in range(count)]
+
+
+def reviews(count):
+    now = datetime.utcnow()
+    return [doc_to_json({
+        "_id": ObjectId(),
+        "answer_id": ObjectId(),
+        "reviewer_expert_id": ObjectId(),
+        "question_id": ObjectId(),
+        "best_answer_vote": random.random() < 0.3,
+        "comment_text": LOREM,
+        "version": 1,
+        "created_at": now,
+        "updated_at": now
+    }) for _ in range(count)]
+
+
+def sizes(body):
+    out = [len(body), len(compress(body, "gzip"))]
+    if brotli is not None:
+        out.append(len(compress(body, "br")))
+    return out
+
+
+def report(screen, fields, full, sparse):
+    columns = "  ".join(f"{label} {size / 1024:7.1f} KiB" for label, size in zip(("raw", "gzip", "br"), sizes(full)))
+    print(f"{screen:<22} full    {columns}")
+    columns = "  ".join(f"{label} {size / 1024:7.1f} KiB" for label, size in zip(("raw", "gzip", "br"), sizes(sparse)))
+    print(f"{'':<22} sparse  {columns}   fields={','.join(fields)}")
+
+
+def main():
+    questions = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    answer_count = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    print(f"brotli: {'installed' if brotli is not None else 'not installed (gzip only)'}")
+
+    fields = ["status", "cleaned_text", "domain", "created_at"]
+    detail = question_detail()
+    report("farmer question", fields, envelope({"question": detail}), envelope({"question": pick(detail, fields)}))
+
+    fields = ["cleaned_text", "domain", "status", "created_at"]
+    cards = assigned_cards(questions)
+    report(f"expert dashboard ({questions})", fields,
+           envelope({"questions": cards, "next_cursor": None}),
+           envelope({"questions": [pick(card, fields) for card in cards], "next_cursor": None}))
+
+    fields = ["expert_id", "answer_text", "upvotes", "downvotes", "peer_votes"]
+    docs = answers(answer_count)
+    report(f"answers ({answer_count})", fields,
+           envelope({"answers": [AnswerSummaryOut(**doc).dict() for doc in docs], "next_cursor": None}),
+           envelope({"answers": [pick(doc, fields, AnswerSummaryOut) for doc in docs], "next_cursor": None}))
+
+    fields = ["best_answer_vote", "comment_text"]
+    docs = reviews(answer_count)
+    report(f"peer reviews ({answer_count})", fields,
+           envelope({"reviews": docs, "next_cursor": None}),
+           envelope({"reviews": [pick(doc, fields, PeerReview) for doc in docs], "next_cursor": None}))
+
+
+if __name__ == "__main__":
+    main()
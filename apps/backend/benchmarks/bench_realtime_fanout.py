@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark: fan-out latency of the in-process realtime broker.
+N subscribers listen on one question channel while events are published to it.
+
+Usage:
+  python benchmarks/bench_realtime_fanout.py [subscribers] [events]
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.services.realtime_service import EventBroker, question_channel
+
+
+async def main():
+    subscribers = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    events = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    broker = EventBroker(queue_size=events)
+    channel = question_channel("bench")
+    queues = [broker.subscribe(channel) for _ in range(subscribers)]
+
+    async def consume(queue):
+        for _ in range(events):
+            broker.record_delivery(await queue.get())
+
+    consumers = [asyncio.create_task(consume(q)) for q in queues]
+    start = time.perf_counter()
+    for i in range(events):
+        broker.publish(channel, "answer_voted", {"answer_id": "bench", "upvotes": i, "downvotes": 0})
+        await asyncio.sleep(0)
+    await asyncio.gather(*consumers)
+    elapsed = time.perf_counter() - start
+
+    metrics = broker.metrics()
+    print(f"Subscribers:        {subscribers}")
+    print(f"Events published:   {metrics['published']}")
+    print(f"Deliveries:         {metrics['delivered']} ({metrics['delivered'] / elapsed:.0f}/s)")
+    print(f"Dropped:            {metrics['dropped']}")
+    print(f"Fan-out latency ms: p50={metrics['fanout_latency_ms']['p50']} p99={metrics['fanout_latency_ms']['p99']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
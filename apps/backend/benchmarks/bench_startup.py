@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark: cold import time of the app (`import main` in a fresh interpreter), which every
+autoscaled instance pays before it can answer /health. Reports the median over several
+runs and the slowest imports main makes (from -X importtime), and fails if the median is
+over budget or if SDKs that are meant to load lazily (openai) are imported at startup.
+Needs no database.
+
+Usage:
+  python benchmarks/bench_startup.py [budget_ms] [runs]
+"""
+
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND = Path(__file__).resolve().parent.parent
+LAZY_MODULES = ["openai"]
+
+PROBE = f"""
+import sys, time
+start = time.perf_counter()
+import main
+elapsed = (time.perf_counter() - start) * 1000
+print("startup", elapsed, ",".join(m for m in {LAZY_MODULES!r} if m in sys.modules))
+"""
+
+
+def run_once(importtime=False):
+    cmd = [sys.executable] + (["-X", "importtime"] if importtime else []) + ["-c", PROBE]
+    result = subprocess.run(cmd, cwd=BACKEND, capture_output=True, text=True)
+    if result.returncode != 0:
+        print(result.stderr)
+        sys.exit(1)
+    line = next(line for line in reversed(result.stdout.splitlines()) if line.startswith("startup "))
+    _, elapsed, *loaded = line.split()
+    return float(elapsed), [m for m in ",".join(loaded).split(",") if m], result.stderr
+
+
+def slowest_imports(importtime_output, count=10):
+    # Lines look like "import time:  self [us] | cumulative | imported package", with the
+    # package indented two spaces per level; keep the modules main imports directly
+    rows = []
+    for line in importtime_output.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if name.startswith("   ") and not name.startswith("     "):
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:count]
+
+
+def main():
+    budget_ms = float(sys.argv[1]) if len(sys.argv) > 1 else 3000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    # First run warms the bytecode cache
+    run_once()
+    times = []
+    loaded = []
+    for _ in range(runs):
+        elapsed, loaded, _ = run_once()
+        times.append(elapsed)
+    median = statistics.median(times)
+
+    _, _, importtime_output = run_once(importtime=True)
+    print("Slowest imports made by main (cumulative):")
+    for cumulative, name in slowest_imports(importtime_output):
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    ok = median <= budget_ms
+    print(f"{'✅' if ok else '❌'} import main: median {median:.0f} ms over {runs} runs (budget {budget_ms:.0f} ms)")
+    lazy_ok = not loaded
+    print(f"{'✅' if lazy_ok else '❌'} lazy SDKs not imported at startup" + (f" (loaded: {', '.join(loaded)})" if loaded else ""))
+
+    if not (ok and lazy_ok):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
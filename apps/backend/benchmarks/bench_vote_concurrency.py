@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Benchmark: many experts voting (and flipping votes) on a single answer concurrently.
+Checks that the materialised upvotes/downvotes counters match the votes collection.
+
+Runs against MONGODB_URL / DATABASE_NAME and removes the documents it creates.
+
+Usage:
+  python benchmarks/bench_vote_concurrency.py [num_experts] [flips_per_expert]
+"""
+
+import asyncio
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bson import ObjectId
+from app.utils.db import answers_collection, votes_collection
+from app.utils.indexes import apply_indexes
+from app.services.expert_service import vote_on_answer, reconcile_vote_counters
+
+
+async def main():
+    num_experts = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    flips = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+
+    await apply_indexes()
+    answer_id = (await answers_collection.insert_one({
+        "answer_text": "benchmark answer",
+        "question_id": ObjectId(),
+        "expert_id": ObjectId(),
+        "upvotes": 0,
+        "downvotes": 0
+    })).inserted_id
+    expert_ids = [str(ObjectId()) for _ in range(num_experts)]
+
+    async def expert_votes(expert_id: str):
+        for _ in range(flips):
+            await vote_on_answer(str(answer_id), expert_id, random.choice(["upvote", "downvote"]))
+
+    try:
+        start = time.perf_counter()
+        await asyncio.gather(*(expert_votes(e) for e in expert_ids))
+        elapsed = time.perf_counter() - start
+
+        answer = await answers_collection.find_one({"_id": answer_id}, {"upvotes": 1, "downvotes": 1})
+        upvotes = await votes_collection.count_documents({"answer_id": answer_id, "vote_type": "upvote"})
+        downvotes = await votes_collection.count_documents({"answer_id": answer_id, "vote_type": "downvote"})
+        drifted = await reconcile_vote_counters([str(answer_id)])
+
+        total_votes = num_experts * flips
+        print(f"Votes cast:        {total_votes} by {num_experts} experts")
+        print(f"Elapsed:           {elapsed:.2f}s ({total_votes / elapsed:.0f} votes/s)")
+        print(f"Counters:          up={answer['upvotes']} down={answer['downvotes']}")
+        print(f"Votes collection:  up={upvotes} down={downvotes}")
+        print(f"Reconciled:        {drifted} answers corrected")
+        if (answer["upvotes"], answer["downvotes"]) != (upvotes, downvotes):
+            print("❌ Counter drift detected")
+            sys.exit(1)
+        print("✅ Counters consistent")
+    finally:
+        await votes_collection.delete_many({"answer_id": answer_id})
+        await answers_collection.delete_one({"_id": answer_id})
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -1,16 +1,79 @@
 # backend/main.py
 import os
+import asyncio
 import uvicorn
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.config import settings
+from app.utils.db import connect_to_mongo, close_mongo_connection, db_instance
+from app.utils.response import FastJSONResponse
+from app.utils.compression import CompressionMiddleware
+from app.utils.profiling import ProfilingMiddleware, ensure_slow_request_log
+from app.utils.log import get_logger, shutdown_logging
+from app.ai.clients import warm_ai_clients, close_ai_clients, ai_clients_ready
+from app.utils.indexes import apply_indexes
+from app.utils.migrations import run_migrations
+from app.services.realtime_service import broker
+from app.services.analytics_service import rollup_repair_loop
+from app.services.gc_service import orphan_sweep_loop
+from app.services.archive_service import ensure_archive_collections, archive_loop
 from app.routes import auth_routes
 from app.routes import farmer_routes
 from app.routes import moderator_routes
 from app.routes import expert_routes
 
+STARTUP_RETRY_SECONDS = 5
+log = get_logger("main")
+
+async def startup(background: list):
+    """
+    Connect to Mongo, prepare collections and indexes, run pending data migrations and start
+    the broker and background loops. Runs after the server is accepting requests, so
+    /health answers straight away; /ready reports when this has finished. Retried until it
+    succeeds.
+    """
+    while True:
+        try:
+            await connect_to_mongo()
+            await ensure_archive_collections()
+            await apply_indexes()
+            await run_migrations()
+            await ensure_slow_request_log()
+            await broker.start()
+            break
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            log.error("Startup failed, retrying", retry_in_seconds=STARTUP_RETRY_SECONDS, error=str(e))
+            await asyncio.sleep(STARTUP_RETRY_SECONDS)
+    if settings.ROLLUP_REPAIR_INTERVAL_SECONDS > 0:
+        background.append(asyncio.create_task(rollup_repair_loop(settings.ROLLUP_REPAIR_INTERVAL_SECONDS)))
+    if settings.GC_SWEEP_INTERVAL_SECONDS > 0:
+        background.append(asyncio.create_task(orphan_sweep_loop(settings.GC_SWEEP_INTERVAL_SECONDS)))
+    if settings.ARCHIVE_INTERVAL_SECONDS > 0:
+        background.append(asyncio.create_task(archive_loop(settings.ARCHIVE_INTERVAL_SECONDS)))
+    log.info("Startup complete")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    background = [asyncio.create_task(warm_ai_clients())]
+    app.state.startup = asyncio.create_task(startup(background))
+    yield
+    app.state.startup.cancel()
+    for task in background:
+        task.cancel()
+    await broker.stop()
+    await close_ai_clients()
+    await close_mongo_connection()
+    shutdown_logging()
+
+def is_ready(app: FastAPI) -> bool:
+    task = getattr(app.state, "startup", None)
+    return task is not None and task.done() and not task.cancelled() and task.exception() is None
+
 def create_app() -> FastAPI:
-    app = FastAPI(title="AgriVote Nexus API", version="0.1.0")
+    app = FastAPI(title="AgriVote Nexus API", version="0.1.0", lifespan=lifespan, default_response_class=FastJSONResponse)
 
     app.add_middleware(
         CORSMiddleware,
@@ -19,6 +82,21 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    if settings.COMPRESSION_MIN_SIZE > 0:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.COMPRESSION_MIN_SIZE,
+            gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+            brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+        )
+    if settings.PROFILE_SAMPLE_RATE > 0 or settings.PROFILE_ADMIN_TOKEN or settings.SLOW_REQUEST_MS > 0:
+        # Outermost, so the timing covers compression and CORS too
+        app.add_middleware(
+            ProfilingMiddleware,
+            sample_rate=settings.PROFILE_SAMPLE_RATE,
+            slow_ms=settings.SLOW_REQUEST_MS,
+            admin_token=settings.PROFILE_ADMIN_TOKEN,
+        )
 
     app.include_router(auth_routes)
     app.include_router(farmer_routes)
@@ -27,8 +105,17 @@ def create_app() -> FastAPI:
 
     @app.get("/health")
     async def health():
+        # Liveness: the process is serving requests; dependencies are not checked
         return {"status": "ok"}
 
+    @app.get("/ready")
+    async def ready():
+        # Readiness: startup (Mongo, collections, indexes, broker) has finished; the AI
+        # client is created on first use if it is not warm yet
+        ok = is_ready(app)
+        body = {"status": "ok" if ok else "starting", "mongo": db_instance.ready, "ai": ai_clients_ready()}
+        return FastJSONResponse(body, status_code=200 if ok else 503)
+
     return app
 
 app = create_app()
@@ -0,0 +1,30 @@
+#!/usr/bin/env python3
+"""
+Script to apply the declared MongoDB indexes (app/utils/indexes.py).
+Safe to run repeatedly; the API also applies them at startup.
+
+Usage:
+  python manage_indexes.py          # Create any missing declared indexes
+  python manage_indexes.py check    # Also list indexes that exist but are not declared
+"""
+
+import asyncio
+import sys
+from app.utils.indexes import apply_indexes, undeclared_indexes
+
+
+async def main():
+    applied = await apply_indexes()
+    for collection_name, names in applied.items():
+        print(f"✅ {collection_name}: {', '.join(names) or 'none applied'}")
+
+    if len(sys.argv) > 1 and sys.argv[1] == "check":
+        extra = await undeclared_indexes()
+        for collection_name, names in extra.items():
+            print(f"⚠️  {collection_name}: undeclared indexes {', '.join(names)}")
+        if not extra:
+            print("No undeclared indexes")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
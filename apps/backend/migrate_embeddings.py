@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Script to move question embeddings out of question documents into the
+question_embeddings collection (packed float32 vectors keyed by question id).
+
+Safe to re-run: each batch is upserted into question_embeddings before the
+embedding field is removed from the questions in that batch.
+
+Usage:
+  python migrate_embeddings.py           # Migrate and strip embeddings from questions
+  python migrate_embeddings.py --keep    # Migrate but leave the old field in place
+"""
+
+import asyncio
+import sys
+from datetime import datetime
+from pymongo import UpdateOne
+from app.utils.db import questions_collection, question_embeddings_collection
+from app.utils.indexes import apply_indexes
+from app.utils.vector import pack_vector
+from app.services.embedding_service import EMBEDDING_MODEL
+
+BATCH_SIZE = 500
+
+
+async def main():
+    keep = "--keep" in sys.argv
+    await apply_indexes()
+
+    query = {"embedding": {"$exists": True, "$ne": None}}
+    projection = {"embedding": 1, "domain": 1, "status": 1, "ai_metadata.embedding_model": 1}
+    migrated = 0
+    last_id = None
+
+    while True:
+        batch_query = dict(query, **({"_id": {"$gt": last_id}} if last_id else {}))
+        batch = await questions_collection.find(batch_query, projection).sort("_id", 1).limit(BATCH_SIZE).to_list(length=BATCH_SIZE)
+        if not batch:
+            break
+
+        now = datetime.utcnow()
+        ops = [
+            UpdateOne({"_id": doc["_id"]}, {"$set": {
+                "domain": doc.get("domain"),
+                "vector": pack_vector(doc["embedding"]),
+                "dims": len(doc["embedding"]),
+                "model": (doc.get("ai_metadata") or {}).get("embedding_model") or EMBEDDING_MODEL,
+                "is_duplicate": doc.get("status") == "duplicate",
+                "updated_at": now
+            }}, upsert=True)
+            for doc in batch if doc["embedding"]
+        ]
+        if ops:
+            await question_embeddings_collection.bulk_write(ops, ordered=False)
+
+        ids = [doc["_id"] for doc in batch]
+        if not keep:
+            await questions_collection.update_many({"_id": {"$in": ids}}, {"$unset": {"embedding": ""}})
+
+        migrated += len(batch)
+        last_id = ids[-1]
+        print(f"Migrated {migrated} embeddings...")
+
+    print(f"✅ Migrated {migrated} question embeddings{' (originals kept)' if keep else ''}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Script to recompute answer vote counters (upvotes, downvotes, peer_votes) from the
+votes and peer_reviews collections. The write paths keep the counters current with
+$inc; run this periodically (or after a manual data fix) to repair any drift.
+
+Also stamps question_id onto peer reviews written before reviews carried it and,
+on a full run, rebuilds the per-question best answer vote ledger.
+
+Usage:
+  python reconcile_votes.py                 # Reconcile every answer
+  python reconcile_votes.py <answer_id> ... # Reconcile specific answers
+"""
+
+import asyncio
+import sys
+from app.services.expert_service import reconcile_vote_counters, backfill_peer_review_question_ids, rebuild_vote_ledger
+
+
+async def main():
+    answer_ids = sys.argv[1:] or None
+    backfilled = await backfill_peer_review_question_ids()
+    print(f"✅ Backfilled question_id on {backfilled} peer reviews")
+    corrected = await reconcile_vote_counters(answer_ids)
+    print(f"✅ Reconciled vote counters, {corrected} answers corrected")
+    if answer_ids is None:
+        await rebuild_vote_ledger()
+        print("✅ Rebuilt per-question vote ledger")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,21 @@
+#!/usr/bin/env python3
+"""
+Script to rebuild the moderator dashboard question rollups from the questions collection.
+The API keeps them current incrementally and repairs them every ROLLUP_REPAIR_INTERVAL_SECONDS;
+run this after bulk data changes made outside the API.
+
+Usage:
+  python repair_rollups.py
+"""
+
+import asyncio
+from app.services.analytics_service import repair_question_rollups
+
+
+async def main():
+    corrected = await repair_question_rollups()
+    print(f"✅ Repaired question rollups, {corrected} buckets corrected")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
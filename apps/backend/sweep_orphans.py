@@ -0,0 +1,24 @@
+#!/usr/bin/env python3
+"""
+Script to delete answers, votes, peer reviews, notifications, vote ledger entries and
+embeddings whose parent question or answer no longer exists. The API runs the same sweep
+every GC_SWEEP_INTERVAL_SECONDS; run this once to clean up data left by deletes made
+before cascading deletes existed.
+
+Usage:
+  python sweep_orphans.py
+"""
+
+import asyncio
+from app.services.gc_service import sweep_orphans
+
+
+async def main():
+    report = await sweep_orphans()
+    for name, reclaimed in report["collections"].items():
+        print(f"✅ {name}: {reclaimed['documents']} documents, {reclaimed['bytes'] / 1024:.1f} KiB")
+    print(f"✅ Reclaimed {report['documents']} documents, {report['bytes'] / 1024:.1f} KiB")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
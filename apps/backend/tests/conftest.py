@@ -0,0 +1,86 @@
+"""
+Shared fixtures.
+
+Tests marked with the mongo fixture run against MONGODB_TEST_URL (default: a local mongod)
+in a scratch database that is dropped after each test, and are skipped when no server
+answers. Everything else needs no database.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+# Settings are read at import, so point the app at the scratch database first
+os.environ["MONGODB_URL"] = os.getenv("MONGODB_TEST_URL", "mongodb://localhost:27017")
+os.environ["DATABASE_NAME"] = "agri_vote_test"
+os.environ["MONGO_SERVER_SELECTION_TIMEOUT_MS"] = "1000"
+os.environ["MONGO_MIN_POOL_SIZE"] = "1"
+
+import pytest
+from pymongo import monitoring
+
+
+class CommandRecorder(monitoring.CommandListener):
+    """
+    Records the names of the commands sent to the test database while recording is on.
+    """
+
+    def __init__(self):
+        self.recording = False
+        self.commands = []
+
+    def start(self):
+        self.commands = []
+        self.recording = True
+
+    def stop(self):
+        self.recording = False
+        return list(self.commands)
+
+    def started(self, event):
+        if self.recording and event.database_name == os.environ["DATABASE_NAME"]:
+            self.commands.append((event.command_name, event.command))
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+# Listeners must be registered before the Motor client is created in app.utils.db
+recorder = CommandRecorder()
+monitoring.register(recorder)
+
+
+@pytest.fixture
+async def mongo():
+    """
+    A connected client on an empty scratch database with every index applied.
+    """
+    from app.utils.db import connect_to_mongo, close_mongo_connection, get_client, db
+    from app.utils.indexes import apply_indexes
+
+    try:
+        await connect_to_mongo()
+    except Exception as e:
+        await close_mongo_connection()
+        pytest.skip(f"MongoDB not available: {e}")
+    await get_client().drop_database(db.name)
+    await apply_indexes()
+    try:
+        yield db
+    finally:
+        await get_client().drop_database(db.name)
+        await close_mongo_connection()
+
+
+@pytest.fixture
+def commands():
+    """
+    The command recorder, stopped again after the test.
+    """
+    yield recorder
+    recorder.stop()
@@ -0,0 +1,81 @@
+import gzip
+
+import brotli
+import pytest
+
+from app.utils.compression import CompressionMiddleware, choose_encoding
+
+BODY = b'{"answer_text": "Spray neem oil every 7 days."}' * 100
+
+
+def asgi_app(body, content_type=b"application/json", extra_headers=(), more_body=False):
+    """
+    An app sending body in one message, or followed by an empty one with more_body.
+    """
+    async def app(scope, receive, send):
+        await send({
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [(b"content-type", content_type), (b"content-length", str(len(body)).encode()), *extra_headers]
+        })
+        await send({"type": "http.response.body", "body": body, "more_body": more_body})
+        if more_body:
+            await send({"type": "http.response.body", "body": b""})
+    return app
+
+
+async def call(app, accept_encoding=None, minimum_size=1024):
+    headers = [(b"accept-encoding", accept_encoding.encode())] if accept_encoding else []
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    await CompressionMiddleware(app, minimum_size=minimum_size)({"type": "http", "headers": headers}, receive, send)
+    start, *bodies = messages
+    return {k.decode(): v.decode() for k, v in start["headers"]}, b"".join(m.get("body", b"") for m in bodies)
+
+
+@pytest.mark.parametrize("accept_encoding, expected", [
+    (None, None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip, br", "br"),
+    ("br;q=0.5, gzip", "gzip"),
+    ("*", "br"),
+    ("gzip;q=0, br;q=0", None),
+    ("br;q=bad, gzip", "gzip"),
+])
+def test_choose_encoding(accept_encoding, expected):
+    assert choose_encoding(accept_encoding) == expected
+
+
+async def test_gzip():
+    headers, body = await call(asgi_app(BODY), "gzip")
+    assert headers["content-encoding"] == "gzip"
+    assert headers["content-length"] == str(len(body))
+    assert "Accept-Encoding" in headers["vary"]
+    assert gzip.decompress(body) == BODY
+
+
+async def test_brotli_preferred():
+    headers, body = await call(asgi_app(BODY), "gzip, deflate, br")
+    assert headers["content-encoding"] == "br"
+    assert brotli.decompress(body) == BODY
+
+
+@pytest.mark.parametrize("body, accept_encoding, response_headers", [
+    (BODY, None, {}),
+    (BODY[:100], "gzip", {}),
+    (BODY, "gzip", {"content_type": b"text/event-stream"}),
+    (BODY, "gzip", {"extra_headers": [(b"content-encoding", b"br")]}),
+    (BODY, "gzip", {"more_body": True}),
+], ids=["not accepted", "below minimum size", "event stream", "already encoded", "streamed"])
+async def test_passthrough(body, accept_encoding, response_headers):
+    headers, sent = await call(asgi_app(body, **response_headers), accept_encoding)
+    assert sent == body
+    assert headers.get("content-encoding") == ("br" if "extra_headers" in response_headers else None)
+    assert "vary" not in headers
@@ -0,0 +1,25 @@
+import pytest
+
+from app.utils.etag import make_etag, etag_matches
+
+
+def test_make_etag_is_weak_and_stable():
+    etag = make_etag("answers", "65f0c0ffee", "version", 3)
+    assert etag.startswith('W/"') and etag.endswith('"')
+    assert etag == make_etag("answers", "65f0c0ffee", "version", 3)
+    assert etag != make_etag("answers", "65f0c0ffee", "version", 4)
+
+
+@pytest.mark.parametrize("header, matches", [
+    (None, False),
+    ("", False),
+    ("*", True),
+    ('W/"abc"', True),
+    ('"abc"', True),
+    ('"xyz", W/"abc"', True),
+    ('  W/"abc"  ', True),
+    ('W/"abd"', False),
+    ('"abc-gzip"', False),
+])
+def test_etag_matches(header, matches):
+    assert etag_matches(header, 'W/"abc"') is matches
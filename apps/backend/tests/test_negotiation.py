@@ -0,0 +1,29 @@
+import pytest
+
+from app.utils.negotiation import is_msgpack, wants_msgpack
+
+
+@pytest.mark.parametrize("content_type, expected", [
+    ("application/msgpack", True),
+    ("application/x-msgpack; charset=binary", True),
+    ("Application/Vnd.Msgpack", True),
+    ("application/json", False),
+    (None, False),
+])
+def test_is_msgpack(content_type, expected):
+    assert is_msgpack(content_type) is expected
+
+
+@pytest.mark.parametrize("accept, expected", [
+    (None, False),
+    ("*/*", False),
+    ("application/json", False),
+    ("application/msgpack", True),
+    ("application/msgpack, application/json", True),
+    ("application/json, application/msgpack;q=0.5", False),
+    ("application/json;q=0.5, application/x-msgpack", True),
+    ("application/msgpack;q=0", False),
+    ("application/msgpack;q=oops", False),
+])
+def test_wants_msgpack(accept, expected):
+    assert wants_msgpack(accept) is expected
@@ -0,0 +1,57 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.utils.pagination import (
+    MAX_PAGE_SIZE, encode_cursor, decode_cursor, keyset_filter, keyset_sort, clamp_limit, next_cursor
+)
+
+
+def test_cursor_round_trip():
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    oid = ObjectId()
+    token = encode_cursor(created_at, oid)
+    assert "=" not in token
+    assert decode_cursor(token) == (created_at, oid)
+
+
+@pytest.mark.parametrize("token", ["", "not a cursor", "bm8tc2VwYXJhdG9y", encode_cursor(datetime(2024, 1, 1), ObjectId())[:-4]])
+def test_malformed_cursor_is_rejected(token):
+    with pytest.raises(ValueError):
+        decode_cursor(token)
+
+
+def test_keyset_filter():
+    created_at, oid = datetime(2024, 5, 1), ObjectId()
+    token = encode_cursor(created_at, oid)
+    assert keyset_filter(None) == {}
+    assert keyset_filter(token) == {"$or": [
+        {"created_at": {"$lt": created_at}},
+        {"created_at": created_at, "_id": {"$lt": oid}}
+    ]}
+    assert keyset_filter(token, descending=False)["$or"][1] == {"created_at": created_at, "_id": {"$gt": oid}}
+    assert keyset_sort(False) == [("created_at", 1), ("_id", 1)]
+
+
+def test_clamp_limit():
+    assert clamp_limit(0) == 1
+    assert clamp_limit(20) == 20
+    assert clamp_limit(MAX_PAGE_SIZE + 1) == MAX_PAGE_SIZE
+
+
+def test_next_cursor_trims_the_lookahead_item():
+    docs = [{"_id": ObjectId(), "created_at": datetime(2024, 5, day)} for day in (3, 2, 1)]
+    assert next_cursor(list(docs), 3) is None
+
+    page = list(docs)
+    token = next_cursor(page, 2)
+    assert page == docs[:2]
+    assert decode_cursor(token) == (docs[1]["created_at"], docs[1]["_id"])
+
+
+@pytest.mark.parametrize("created_at", [{}, {"created_at": None}])
+def test_next_cursor_falls_back_to_the_object_id_time(created_at):
+    oid = ObjectId()
+    docs = [{"_id": oid, **created_at}, {"_id": ObjectId()}]
+    assert decode_cursor(next_cursor(docs, 1)) == (oid.generation_time.replace(tzinfo=None), oid)
@@ -0,0 +1,31 @@
+import pytest
+
+from app.config import settings
+from app.utils.password import hash_password, needs_rehash, verify_password
+
+
+def bcrypt_hash(rounds):
+    return f"$2b${rounds:02d}$" + "a" * 53
+
+
+def test_needs_rehash():
+    assert needs_rehash(bcrypt_hash(settings.BCRYPT_ROUNDS)) is False
+    assert needs_rehash(bcrypt_hash(settings.BCRYPT_ROUNDS - 1)) is True
+    assert needs_rehash(bcrypt_hash(settings.BCRYPT_ROUNDS + 1)) is True
+
+
+@pytest.mark.parametrize("hashed", [None, "", "plaintext", "$2b$"])
+def test_malformed_hash_needs_rehash(hashed):
+    assert needs_rehash(hashed) is True
+
+
+def test_hash_round_trip():
+    hashed = hash_password("s3cret")
+    assert verify_password("s3cret", hashed)
+    assert not verify_password("wrong", hashed)
+    assert not needs_rehash(hashed)
+
+
+@pytest.mark.parametrize("hashed", [None, "", "plaintext"])
+def test_malformed_hash_never_verifies(hashed):
+    assert verify_password("s3cret", hashed) is False
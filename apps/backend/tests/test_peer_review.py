@@ -0,0 +1,73 @@
+import asyncio
+from collections import Counter
+
+from bson import ObjectId
+
+from app.models.peer_review import PeerReviewCreate
+from app.services.expert_service import submit_peer_review, get_expert_vote_for_question
+from app.utils.db import questions_collection, answers_collection, peer_reviews_collection
+
+
+async def seed_question():
+    """
+    A question with three assigned experts, two of whom have answered. Returns the
+    question id, the two answer ids and the id of the expert who has not answered.
+    """
+    experts = [str(ObjectId()) for _ in range(3)]
+    question_id = (await questions_collection.insert_one({
+        "raw_text": "Why are my tomato leaves curling?", "assigned_experts": experts, "status": "answered"
+    })).inserted_id
+    answer_ids = (await answers_collection.insert_many([
+        {"answer_text": f"answer by {e}", "question_id": question_id, "expert_id": ObjectId(e), "peer_votes": 0}
+        for e in experts[:2]
+    ])).inserted_ids
+    return question_id, answer_ids, experts[2]
+
+
+async def peer_votes(answer_ids):
+    return [(await answers_collection.find_one({"_id": a}, {"peer_votes": 1}))["peer_votes"] for a in answer_ids]
+
+
+async def test_peer_review_command_counts(mongo, commands):
+    question_id, answer_ids, reviewer = await seed_question()
+    steps = [
+        ("first review, best vote", answer_ids[0], True,
+         {"aggregate": 1, "findAndModify": 2, "update": 2}),
+        ("move best vote", answer_ids[1], True,
+         {"aggregate": 1, "findAndModify": 3, "update": 2}),
+        ("edit comment", answer_ids[1], True,
+         {"aggregate": 1, "findAndModify": 2, "update": 1}),
+        ("withdraw best vote", answer_ids[1], False,
+         {"aggregate": 1, "findAndModify": 1, "update": 3}),
+    ]
+    for label, answer_id, best, expected in steps:
+        commands.start()
+        result = await submit_peer_review(reviewer, str(answer_id), PeerReviewCreate(best_answer_vote=best, comment_text=label))
+        issued = Counter(name for name, _ in commands.stop())
+        assert result is not None, label
+        assert issued == Counter(expected), label
+
+    assert await peer_votes(answer_ids) == [0, 0]
+    assert (await get_expert_vote_for_question(str(question_id), reviewer))["has_voted"] is False
+
+
+async def test_concurrent_best_votes_leave_one(mongo):
+    question_id, answer_ids, reviewer = await seed_question()
+    for round in range(10):
+        first, second = answer_ids if round % 2 else answer_ids[::-1]
+        results = await asyncio.gather(
+            submit_peer_review(reviewer, str(first), PeerReviewCreate(best_answer_vote=True, comment_text="first")),
+            submit_peer_review(reviewer, str(second), PeerReviewCreate(best_answer_vote=True, comment_text="second"))
+        )
+        assert all(results)
+
+        best = await peer_reviews_collection.find(
+            {"question_id": question_id, "reviewer_expert_id": ObjectId(reviewer), "best_answer_vote": True},
+            {"answer_id": 1}
+        ).to_list(length=None)
+        assert len(best) == 1
+        best_answer = best[0]["answer_id"]
+        assert await peer_votes(answer_ids) == [int(a == best_answer) for a in answer_ids]
+
+        vote = await get_expert_vote_for_question(str(question_id), reviewer)
+        assert vote["has_voted"] and vote["answer_id"] == str(best_answer)
@@ -0,0 +1,139 @@
+"""
+Query-plan check: runs the services' hot read and write paths, records every query they
+send with a CommandListener, and explains each one. Fails if any winning plan contains a
+COLLSCAN stage. The checked queries are the ones the service code issues, so they cannot
+drift from it; a new hot path only needs adding to HOT_PATHS.
+"""
+
+from datetime import datetime
+
+from bson import ObjectId
+
+from app.models.peer_review import PeerReviewCreate
+from app.routes.moderator_routes import get_questions_for_review
+from app.services.ai_pipeline import allocate_experts_domain_vector
+from app.services.analytics_service import get_question_analytics
+from app.services.embedding_service import load_domain_embeddings
+from app.services.expert_service import (
+    get_expert_by_email, get_assigned_questions, get_answers_for_question, vote_on_answer,
+    modify_answer, request_moderator, submit_peer_review, get_peer_reviews_for_answer,
+    get_expert_vote_for_question, get_expert_dashboard
+)
+from app.services.notification_service import get_notifications, replay_notifications, get_unread_count, mark_read
+from app.services.question_service import get_question_by_id
+from app.services.sync_service import get_expert_sync, encode_sync_token
+from app.utils.db import users_collection, questions_collection, answers_collection
+from app.utils.pagination import encode_cursor
+
+# Commands that read or write by a query; inserts, cursors and index builds have no plan
+QUERY_COMMANDS = {"find", "aggregate", "count", "distinct", "findAndModify", "update", "delete"}
+# Per-statement commands, which explain accepts one statement at a time
+STATEMENT_LISTS = {"update": "updates", "delete": "deletes"}
+
+
+async def seed():
+    experts = [ObjectId() for _ in range(3)]
+    await users_collection.insert_many([
+        {"_id": e, "email": f"{e}@example.com", "role": "expert", "domain": "crop", "name": str(e)} for e in experts
+    ])
+    now = datetime.utcnow()
+    question_id = (await questions_collection.insert_one({
+        "raw_text": "Why are my tomato leaves curling?", "assigned_experts": [str(e) for e in experts],
+        "status": "answered", "domain": "crop", "created_at": now, "updated_at": now
+    })).inserted_id
+    answer_ids = (await answers_collection.insert_many([
+        {"answer_text": f"answer by {e}", "question_id": question_id, "expert_id": e, "peer_votes": 0,
+         "created_at": now, "updated_at": now}
+        for e in experts[:2]
+    ])).inserted_ids
+    return [str(e) for e in experts], str(question_id), [str(a) for a in answer_ids]
+
+
+def hot_paths(experts, question_id, answer_ids):
+    author, _, reviewer = experts
+    cursor = encode_cursor(datetime.utcnow(), ObjectId())
+    since = encode_sync_token(datetime.utcnow())
+    review = PeerReviewCreate(best_answer_vote=True, comment_text="Matches the symptoms")
+    return [
+        ("expert by email", lambda: get_expert_by_email(f"{author}@example.com")),
+        ("expert allocation", lambda: allocate_experts_domain_vector("crop", [0.1, 0.2])),
+        ("question detail", lambda: get_question_by_id(question_id)),
+        ("assigned questions", lambda: get_assigned_questions(reviewer, 20)),
+        ("assigned questions page 2", lambda: get_assigned_questions(reviewer, 20, cursor)),
+        ("review list", lambda: get_questions_for_review(None, 20, None, False, "")),
+        ("review list by status", lambda: get_questions_for_review("answered", 20, cursor, True, "")),
+        ("duplicate candidates", lambda: load_domain_embeddings("crop", question_id)),
+        ("answers for question", lambda: get_answers_for_question(question_id, True, 20, cursor)),
+        ("vote", lambda: vote_on_answer(answer_ids[0], reviewer, "upvote")),
+        ("modify answer", lambda: modify_answer(answer_ids[0], author, "Remove the affected leaves")),
+        ("request moderator", lambda: request_moderator(question_id, author)),
+        ("peer review", lambda: submit_peer_review(reviewer, answer_ids[0], review)),
+        ("move best vote", lambda: submit_peer_review(reviewer, answer_ids[1], review)),
+        ("reviews for answer", lambda: get_peer_reviews_for_answer(answer_ids[1], 20, cursor)),
+        ("best answer vote", lambda: get_expert_vote_for_question(question_id, reviewer)),
+        ("dashboard", lambda: get_expert_dashboard(reviewer, 20)),
+        ("full sync", lambda: get_expert_sync(reviewer)),
+        ("delta sync", lambda: get_expert_sync(reviewer, since)),
+        ("notifications page", lambda: get_notifications(author, 20, cursor)),
+        ("notification replay", lambda: replay_notifications(author, str(ObjectId()))),
+        ("unread counter", lambda: get_unread_count(author)),
+        ("mark read", lambda: mark_read(author)),
+        ("question analytics", lambda: get_question_analytics()),
+    ]
+
+
+def explainable(command_name, command):
+    """
+    Yield the recorded command as explain-ready commands, without driver-added fields.
+    """
+    body = {key: value for key, value in command.items() if not key.startswith("$") and key not in ("lsid", "txnNumber")}
+    statements = STATEMENT_LISTS.get(command_name)
+    if not statements:
+        yield body
+        return
+    for statement in body[statements]:
+        yield {**body, statements: [statement]}
+
+
+def winning_stages(explain):
+    """
+    Every stage name in the winning plans of an explain result, aggregate stages included.
+    """
+    if isinstance(explain, dict):
+        for key, value in explain.items():
+            if key == "winningPlan":
+                yield from plan_stages(value)
+            else:
+                yield from winning_stages(value)
+    elif isinstance(explain, list):
+        for item in explain:
+            yield from winning_stages(item)
+
+
+def plan_stages(plan):
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from plan_stages(item)
+
+
+async def test_hot_queries_use_indexes(mongo, commands):
+    experts, question_id, answer_ids = await seed()
+    recorded = []
+    for label, call in hot_paths(experts, question_id, answer_ids):
+        commands.start()
+        await call()
+        recorded += [(label, name, command) for name, command in commands.stop() if name in QUERY_COMMANDS]
+    assert recorded
+
+    scans = []
+    for label, name, command in recorded:
+        for body in explainable(name, command):
+            explain = await mongo.command({"explain": body, "verbosity": "queryPlanner"})
+            if "COLLSCAN" in winning_stages(explain):
+                scans.append(f"{label}: {name} on {body[name]}: {body}")
+    assert not scans, "Queries not served by an index:\n" + "\n".join(scans)
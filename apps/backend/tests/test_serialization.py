@@ -0,0 +1,76 @@
+from datetime import datetime, timezone
+
+import msgpack
+import orjson
+import pytest
+from bson import ObjectId
+
+from app.models.question import AssignedQuestionOut
+from app.utils.serialization import ObjectIdStr, doc_to_json, dumps, packb, unpackb
+
+
+def test_doc_to_json_renames_id_and_converts_object_ids():
+    oid, question_oid, expert_oid = ObjectId(), ObjectId(), ObjectId()
+    out = doc_to_json({
+        "_id": oid,
+        "question_id": question_oid,
+        "votes": {"best": {"answer_id": expert_oid}},
+        "history": [expert_oid],
+        "text": "plain"
+    })
+    assert "_id" not in out
+    assert out == {
+        "id": str(oid),
+        "question_id": str(question_oid),
+        "votes": {"best": {"answer_id": str(expert_oid)}},
+        "history": [str(expert_oid)],
+        "text": "plain"
+    }
+    assert type(out["id"]) is ObjectIdStr
+    assert type(out["votes"]["best"]["answer_id"]) is ObjectIdStr
+
+
+def test_doc_to_json_marks_object_id_strings_under_id_keys_only():
+    expert_id = str(ObjectId())
+    out = doc_to_json({"assigned_experts": [expert_id], "expert_id": expert_id, "comment_text": expert_id})
+    assert type(out["assigned_experts"][0]) is ObjectIdStr
+    assert type(out["expert_id"]) is ObjectIdStr
+    assert type(out["comment_text"]) is str
+
+
+def test_doc_to_json_leaves_source_document_alone():
+    doc = {"_id": ObjectId(), "answer_id": ObjectId()}
+    doc_to_json(doc)
+    assert isinstance(doc["answer_id"], ObjectId)
+
+
+def test_dumps():
+    oid = ObjectId()
+    created_at = datetime(2024, 5, 1, 12, 30)
+    body = dumps({"id": ObjectIdStr(oid), "raw": oid, "created_at": created_at, "tags": {"crop"}})
+    assert orjson.loads(body) == {"id": str(oid), "raw": str(oid), "created_at": "2024-05-01T12:30:00", "tags": ["crop"]}
+
+
+def test_packb_sends_object_ids_as_raw_bytes():
+    oid = ObjectId()
+    created_at = datetime(2024, 5, 1, 12, 30)
+    packed = packb(doc_to_json({"_id": oid, "comment_text": str(oid), "created_at": created_at}))
+    # Naive datetimes are stored UTC and travel as msgpack timestamps
+    utc = created_at.replace(tzinfo=timezone.utc)
+    assert msgpack.unpackb(packed, timestamp=3) == {"id": oid.binary, "comment_text": str(oid), "created_at": utc}
+    assert unpackb(packed) == {"id": str(oid), "comment_text": str(oid), "created_at": utc.isoformat()}
+
+
+def test_packb_keeps_model_object_id_fields_binary():
+    oid, expert_id = ObjectId(), str(ObjectId())
+    card = AssignedQuestionOut(id=str(oid), assigned_experts=[expert_id], cleaned_text=expert_id).dict()
+    raw = msgpack.unpackb(packb(card))
+    assert raw["id"] == oid.binary
+    assert raw["assigned_experts"] == [ObjectId(expert_id).binary]
+    assert raw["cleaned_text"] == expert_id
+
+
+@pytest.mark.parametrize("data", [b"\xc1", packb({"a": 1})[:-1], packb(1) + b"\x01"])
+def test_unpackb_rejects_malformed_bodies(data):
+    with pytest.raises(ValueError):
+        unpackb(data)
@@ -0,0 +1,21 @@
+from datetime import datetime
+
+import pytest
+from bson import ObjectId
+
+from app.services.sync_service import encode_sync_token, decode_sync_token
+from app.utils.pagination import encode_cursor
+
+
+def test_sync_token_round_trip():
+    at = datetime(2024, 5, 1, 12, 30, 15, 123456)
+    token = encode_sync_token(at)
+    assert "=" not in token
+    assert decode_sync_token(token) == at
+
+
+@pytest.mark.parametrize("token", ["", "not a token", encode_cursor(datetime(2024, 5, 1), ObjectId())])
+def test_malformed_sync_token_is_rejected(token):
+    # A list cursor has the same shape but is not a sync token
+    with pytest.raises(ValueError):
+        decode_sync_token(token)